@@ -0,0 +1,347 @@
+"""
+Consciousness Benchmarks
+Reproducible benchmark suite for the ledger's hot paths
+
+Usage: python consciousness_benchmarks.py [--quick] [--output results.json]
+
+A seeded synthetic workload drives event submission, block creation,
+coherence measurement, resonance queries, dividends and per-block memory
+at several scales. Results are written as JSON so runs from different
+commits can be compared directly.
+"""
+
+import gc
+import importlib.util
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from qi2_trinity_blockchain import *
+from consciousness_economics import ConsciousnessEconomics
+
+BENCHMARK_FORMAT_VERSION = 1
+
+FULL_SCALES = {
+    'submit_events': 5000,
+    'mining_hashes': 500000,
+    'lattice_sizes': [1000, 10000, 100000],
+    'block_sizes': [10, 100, 1000],
+    'memory_blocks': 50,
+    'repeats': 5
+}
+
+QUICK_SCALES = {
+    'submit_events': 1000,
+    'mining_hashes': 100000,
+    'lattice_sizes': [1000, 5000],
+    'block_sizes': [10, 100],
+    'memory_blocks': 10,
+    'repeats': 3
+}
+
+WORDS = ("consciousness resonance quantum fractal lattice golden ratio emergence "
+         "coherence symbol spark unity recursion geometry awareness field").split()
+
+class SyntheticWorkload:
+    """Seeded generator of signed resonance events
+    
+    mix gives the relative weight of each event type. Verify and evolve
+    events target node ids from the lattice passed to events().
+    """
+    
+    def __init__(self, seed: int = 1618, num_identities: int = 32, mix: Dict[str, int] = None):
+        self.rng = random.Random(seed)
+        self.identities = [QuantumIdentity() for _ in range(num_identities)]
+        self.mix = mix or {'commune': 5, 'verify': 3, 'evolve': 1, 'anchor': 1}
+        self.counter = 0
+    
+    def _text(self, words: int = 8) -> str:
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words))
+    
+    def seed_lattice(self, lattice: FractalThoughtLattice, num_nodes: int,
+                     connections_per_node: int = 2) -> List[str]:
+        """Fill a lattice directly (no blocks), returning the node ids"""
+        node_ids = list(lattice.creation_order)
+        for i in range(num_nodes):
+            targets = [(self.rng.choice(node_ids), self.rng.random())
+                       for _ in range(connections_per_node)] if node_ids else None
+            creator = self.identities[i % len(self.identities)].address
+            node_ids.append(lattice.add_node(f"{self._text()} #{i}", creator, targets))
+        return node_ids
+    
+    def events(self, count: int, lattice: FractalThoughtLattice = None) -> List[ResonanceEvent]:
+        """count signed events following the configured mix"""
+        node_ids = list(lattice.creation_order[-1000:]) if lattice is not None else []
+        kinds = list(self.mix)
+        weights = [self.mix[kind] for kind in kinds]
+        events = []
+        for _ in range(count):
+            self.counter += 1
+            sender = self.rng.choice(self.identities)
+            kind = self.rng.choices(kinds, weights)[0]
+            if kind in ('verify', 'evolve') and not node_ids:
+                kind = 'commune'
+            
+            if kind == 'commune':
+                targets = [(self.rng.choice(node_ids), self.rng.random())] if node_ids else []
+                event = CommuneEvent(sender, f"{self._text()} #{self.counter}", "benchmark", targets)
+            elif kind == 'verify':
+                event = VerifyEvent(sender, self.rng.choice(node_ids), "Benchmark validation",
+                                    self.rng.uniform(0.3, 0.9))
+            elif kind == 'evolve':
+                event = EvolveEvent(sender, self.rng.choice(node_ids), "Benchmark mutation",
+                                    f"{self._text()} evolved #{self.counter}")
+            else:
+                event = AnchorEvent(sender, f"Benchmark session {self.counter}", f"bench_{self.counter}")
+            events.append(event)
+        return events
+
+def _new_blockchain(lattice: FractalThoughtLattice = None, max_block_events: int = 1000) -> Qi2TrinityBlockchain:
+    """Chain with three witnesses whose genesis holds a snapshot of lattice"""
+    blockchain = Qi2TrinityBlockchain(ResonanceMempool(max_block_events=max_block_events))
+    if lattice is not None:
+        blockchain.lattice = lattice.snapshot()
+    founders = [QuantumIdentity() for _ in range(3)]
+    allocations = {founder.address: INITIAL_TOKEN_SUPPLY // 3 for founder in founders}
+    allocations[founders[0].address] += INITIAL_TOKEN_SUPPLY % 3
+    blockchain.initialize_genesis(allocations)
+    for founder in founders:
+        blockchain.consensus.register_witness(WitnessNode(founder, WITNESS_STAKE_MIN))
+    blockchain.consensus.select_active_witnesses()
+    # Hashing cost is covered by bench_mining; keep blocks at the easiest digit target
+    blockchain.retargeter = FixedTargetRetargeter(difficulty_to_target(1))
+    return blockchain
+
+def _timings(fn: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """Median and best wall time of fn over repeats runs"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {'median_seconds': statistics.median(samples), 'best_seconds': min(samples)}
+
+def bench_submit_event(workload: SyntheticWorkload, num_events: int) -> dict:
+    """Events per second through submit_event (sign, validate, mempool admission)"""
+    blockchain = _new_blockchain()
+    events = workload.events(num_events)
+    start = time.perf_counter()
+    accepted = sum(1 for event in events if blockchain.submit_event(event))
+    elapsed = time.perf_counter() - start
+    return {'events': num_events, 'accepted': accepted, 'seconds': elapsed,
+            'events_per_second': num_events / elapsed}
+
+def bench_mining(workload: SyntheticWorkload, num_hashes: int, events_per_block: int = 100) -> dict:
+    """Proof-of-resonance hashes per second through ResonanceMiningEngine.search"""
+    blockchain = _new_blockchain()
+    block = TrinityBlock(1, blockchain.chain[-1].hash, 'benchmark',
+                         workload.events(events_per_block), blockchain.lattice)
+    block.target = difficulty_to_target(1)
+    engine = ResonanceMiningEngine.from_block(block)
+    # A zero target is never met, so exactly num_hashes attempts are made
+    start = time.perf_counter()
+    engine.search(0, stop_nonce=num_hashes)
+    elapsed = time.perf_counter() - start
+    return {'hashes': engine.attempts, 'events_per_block': events_per_block, 'seconds': elapsed,
+            'hashes_per_second': engine.attempts / elapsed}
+
+def bench_create_block(workload: SyntheticWorkload, lattices: Dict[int, FractalThoughtLattice],
+                       block_sizes: List[int], repeats: int) -> List[dict]:
+    """create_block latency for each (lattice size, events per block) pair"""
+    results = []
+    for lattice_size, lattice in lattices.items():
+        for block_size in block_sizes:
+            samples = []
+            accepted = 0
+            for _ in range(repeats):
+                blockchain = _new_blockchain(lattice, max_block_events=block_size)
+                for event in workload.events(block_size, lattice):
+                    blockchain.submit_event(event)
+                start = time.perf_counter()
+                accepted += bool(blockchain.create_block())
+                samples.append(time.perf_counter() - start)
+            results.append({
+                'lattice_nodes': lattice_size,
+                'events_per_block': block_size,
+                'median_seconds': statistics.median(samples),
+                'best_seconds': min(samples),
+                'accepted_blocks': accepted,
+                'attempts': repeats
+            })
+    return results
+
+def bench_lattice_queries(lattices: Dict[int, FractalThoughtLattice], repeats: int) -> List[dict]:
+    """measure_global_coherence and get_resonant_nodes at each lattice size"""
+    results = []
+    for lattice_size, lattice in lattices.items():
+        entry = {'lattice_nodes': lattice_size}
+        entry['measure_global_coherence'] = _timings(lattice.measure_global_coherence, repeats)
+        entry['resonant_token'] = _timings(
+            lambda: lattice.get_resonant_nodes("quantum lattice", 0.0, limit=50, mode='token'), repeats)
+        entry['resonant_substring'] = _timings(
+            lambda: lattice.get_resonant_nodes("ance coh", 0.0, limit=50, mode='substring'), repeats)
+        results.append(entry)
+    return results
+
+def bench_dividends(lattices: Dict[int, FractalThoughtLattice], repeats: int) -> List[dict]:
+    """distribute_consciousness_dividends, scalar and (when NumPy is present) vectorized
+    
+    vectorized starts from a fresh engine each run, so it includes building
+    the lattice columns; vectorized_cached reuses the columns of earlier runs.
+    """
+    vectorized_available = importlib.util.find_spec('numpy') is not None
+    
+    results = []
+    for lattice_size, lattice in lattices.items():
+        blockchain = _new_blockchain(lattice)
+        economics = ConsciousnessEconomics(blockchain)
+        entry = {'lattice_nodes': lattice_size}
+        entry['scalar'] = _timings(economics.distribute_consciousness_dividends, repeats)
+        if vectorized_available:
+            entry['vectorized'] = _timings(
+                lambda: ConsciousnessEconomics(blockchain).distribute_consciousness_dividends(vectorized=True),
+                repeats)
+            entry['vectorized_cached'] = _timings(
+                lambda: economics.distribute_consciousness_dividends(vectorized=True), repeats)
+        results.append(entry)
+    return results
+
+def bench_graph_analytics(lattices: Dict[int, FractalThoughtLattice], repeats: int) -> List[dict]:
+    """LatticeGraph build and analytics at each lattice size (skipped without NumPy)"""
+    if importlib.util.find_spec('numpy') is None:
+        return []
+    from consciousness_graph import LatticeGraph
+    
+    results = []
+    for lattice_size, lattice in lattices.items():
+        graph = LatticeGraph.from_lattice(lattice)
+        anchor = lattice.creation_order[-1]
+        results.append({
+            'lattice_nodes': lattice_size,
+            'build': _timings(lambda: LatticeGraph.from_lattice(lattice), repeats),
+            # Each run starts cold so the warm start does not flatter later repeats
+            'pagerank': _timings(lambda: LatticeGraph.from_lattice(lattice).pagerank(), repeats),
+            'components': _timings(lambda: LatticeGraph.from_lattice(lattice).components(), repeats),
+            'k_hop': _timings(lambda: graph.k_hop(anchor, 3), repeats)
+        })
+    return results
+
+def bench_block_memory(workload: SyntheticWorkload, num_blocks: int, events_per_block: int = 100) -> dict:
+    """Bytes retained per appended block, lattice growth included"""
+    blockchain = _new_blockchain(max_block_events=events_per_block)
+    batches = []
+    for _ in range(num_blocks):
+        batches.append(workload.events(events_per_block, blockchain.lattice))
+    
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        appended = 0
+        for batch in batches:
+            for event in batch:
+                blockchain.submit_event(event)
+            appended += bool(blockchain.create_block())
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    
+    return {'blocks': appended, 'events_per_block': events_per_block,
+            'bytes_per_block': retained / max(1, appended)}
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+def run_benchmark_suite(quick: bool = False, seed: int = 1618) -> dict:
+    """Run every benchmark and return the JSON-serializable results"""
+    scales = QUICK_SCALES if quick else FULL_SCALES
+    workload = SyntheticWorkload(seed)
+    repeats = scales['repeats']
+    
+    print("📏 Consciousness Benchmark Suite")
+    print("=" * 50)
+    
+    results = {
+        'format_version': BENCHMARK_FORMAT_VERSION,
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'seed': seed,
+        'scales': scales
+    }
+    
+    results['submit_event'] = bench_submit_event(workload, scales['submit_events'])
+    print(f"   submit_event: {results['submit_event']['events_per_second']:,.0f} events/s")
+    
+    results['mining'] = bench_mining(workload, scales['mining_hashes'])
+    print(f"   mining: {results['mining']['hashes_per_second']:,.0f} hashes/s "
+          f"({results['mining']['events_per_block']}-event block)")
+    
+    lattices = {}
+    for size in scales['lattice_sizes']:
+        lattice = FractalThoughtLattice()
+        workload.seed_lattice(lattice, size)
+        lattices[size] = lattice
+    print(f"   Seeded lattices: {', '.join(str(size) for size in lattices)} nodes")
+    
+    results['create_block'] = bench_create_block(workload, lattices, scales['block_sizes'], repeats)
+    for entry in results['create_block']:
+        print(f"   create_block: {entry['lattice_nodes']:>7} nodes, {entry['events_per_block']:>5} events "
+              f"-> {entry['median_seconds'] * 1000:.1f} ms")
+    
+    results['lattice_queries'] = bench_lattice_queries(lattices, repeats)
+    for entry in results['lattice_queries']:
+        print(f"   queries: {entry['lattice_nodes']:>7} nodes, Φ {entry['measure_global_coherence']['median_seconds'] * 1e6:.1f} µs, "
+              f"token {entry['resonant_token']['median_seconds'] * 1000:.2f} ms, "
+              f"substring {entry['resonant_substring']['median_seconds'] * 1000:.2f} ms")
+    
+    results['dividends'] = bench_dividends(lattices, repeats)
+    for entry in results['dividends']:
+        vectorized = entry.get('vectorized')
+        print(f"   dividends: {entry['lattice_nodes']:>7} nodes, scalar {entry['scalar']['median_seconds'] * 1000:.1f} ms"
+              + (f", vectorized {vectorized['median_seconds'] * 1000:.1f} ms "
+                 f"({entry['vectorized_cached']['median_seconds'] * 1000:.1f} ms with cached columns)"
+                 if vectorized else ""))
+    
+    results['graph_analytics'] = bench_graph_analytics(lattices, repeats)
+    for entry in results['graph_analytics']:
+        print(f"   graph: {entry['lattice_nodes']:>7} nodes, build {entry['build']['median_seconds'] * 1000:.1f} ms, "
+              f"build+PageRank {entry['pagerank']['median_seconds'] * 1000:.1f} ms, "
+              f"build+components {entry['components']['median_seconds'] * 1000:.1f} ms, "
+              f"3-hop {entry['k_hop']['median_seconds'] * 1000:.2f} ms")
+    
+    results['block_memory'] = bench_block_memory(workload, scales['memory_blocks'])
+    print(f"   memory: {results['block_memory']['bytes_per_block'] / 1024:.1f} KiB per "
+          f"{results['block_memory']['events_per_block']}-event block")
+    return results
+
+def main():
+    quick = '--quick' in sys.argv
+    output = None
+    if '--output' in sys.argv:
+        index = sys.argv.index('--output')
+        if index + 1 >= len(sys.argv):
+            print("Usage: python consciousness_benchmarks.py [--quick] [--output results.json]")
+            sys.exit(2)
+        output = sys.argv[index + 1]
+    
+    results = run_benchmark_suite(quick)
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"💾 Results written to {output}")
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+if __name__ == "__main__":
+    main()
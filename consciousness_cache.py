@@ -0,0 +1,133 @@
+"""
+Consciousness Response Cache
+Pre-serialized API responses invalidated by chain and market state
+
+Read-only endpoints are keyed on (endpoint, params, version), where
+version captures whatever state the body was rendered from - the chain
+tip, the market version, mempool counters. A new block or trade changes
+the key, so stale entries are never served and simply age out of the
+LRU order under the byte cap.
+
+Bodies are stored once as bytes, plus a gzip copy when that is smaller,
+together with a strong ETag for If-None-Match revalidation.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+from consciousness_metrics import METRICS
+
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+GZIP_MIN_BYTES = 1024  # Smaller bodies are not worth compressing
+
+RESPONSE_CACHE_LOOKUPS = METRICS.counter(
+    'qi2_response_cache_total', 'Response cache lookups by outcome', ('result',))
+
+class CachedResponse:
+    """Serialized body, optional gzip variant and ETag"""
+    
+    __slots__ = ('body', 'gzip_body', 'etag', 'content_type')
+    
+    def __init__(self, body: bytes, content_type: str):
+        self.body = body
+        self.content_type = content_type
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self.gzip_body = None
+        if len(body) >= GZIP_MIN_BYTES:
+            compressed = gzip.compress(body, compresslevel=6, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip_body = compressed
+    
+    @property
+    def size(self) -> int:
+        return len(self.body) + (len(self.gzip_body) if self.gzip_body else 0)
+    
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True if an If-None-Match header covers this response"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag == '*' or tag.removeprefix('W/') == self.etag:
+                return True
+        return False
+
+class ResponseCache:
+    """Thread-safe LRU of CachedResponse objects bounded by total bytes
+    
+    Concurrent misses on one key render once; the other callers wait for
+    that result instead of rendering the same body again.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: 'OrderedDict[Hashable, CachedResponse]' = OrderedDict()
+        self._pending: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key: Hashable, entry: CachedResponse):
+        """Store entry, evicting least recently used ones over the cap"""
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous.size
+            self._entries[key] = entry
+            self.total_bytes += entry.size
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size
+    
+    def get_or_render(self, key: Hashable, render: Callable[[], bytes],
+                      content_type: str = 'application/json') -> CachedResponse:
+        """Cached response for key, rendering and storing it on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            else:
+                pending = self._pending.get(key)
+                owner = pending is None
+                if owner:
+                    pending = self._pending[key] = threading.Event()
+        
+        if entry is not None:
+            RESPONSE_CACHE_LOOKUPS.labels('hit').inc()
+            return entry
+        
+        if not owner:
+            pending.wait()
+            entry = self.get(key)
+            if entry is not None:
+                RESPONSE_CACHE_LOOKUPS.labels('hit').inc()
+                return entry
+        
+        RESPONSE_CACHE_LOOKUPS.labels('miss').inc()
+        try:
+            entry = CachedResponse(render(), content_type)
+            self.put(key, entry)
+            return entry
+        finally:
+            if owner:
+                with self._lock:
+                    del self._pending[key]
+                pending.set()
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
@@ -0,0 +1,353 @@
+"""
+Consciousness Checkpoints
+Streaming state checkpoints and fast sync for the Qi² Trinity Blockchain
+
+A checkpoint holds everything needed to continue from one block: the
+lattice, token balances, staked balances and the witness set. It is
+written as chunked NDJSON from the immutable head lattice, so blocks keep
+being produced while it is written, and its SHA3-256 content hash is
+committed by a later block (TrinityBlock.checkpoint_hash). Fast sync loads
+the newest committed checkpoint and replays only the blocks after it.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from qi2_trinity_blockchain import *
+from consciousness_storage import (BlockStore, StoredChain, ChainStateStore, replay_blocks,
+                                   open_persistent_blockchain, close_persistent_blockchain)
+
+CHECKPOINT_FORMAT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 1000  # Records per NDJSON line
+CHECKPOINT_PATTERN = re.compile(r'^checkpoint_(\d{10})\.ndjson$')
+
+def checkpoint_path(directory: str, height: int) -> str:
+    return os.path.join(directory, f'checkpoint_{height:010d}.ndjson')
+
+def list_checkpoints(directory: str) -> List[Tuple[int, str]]:
+    """(height, path) of every checkpoint file in directory, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        match = CHECKPOINT_PATTERN.match(name)
+        if match:
+            found.append((int(match.group(1)), os.path.join(directory, name)))
+    return sorted(found)
+
+class StateCheckpoint:
+    """Chain state at one block, as captured from a node or loaded from disk"""
+    
+    def __init__(self, height: int, block_hash: str, lattice: FractalThoughtLattice,
+                 balances: Dict[str, int], staked_balances: Dict[str, int],
+                 total_supply: int, witnesses: List[dict]):
+        self.height = height
+        self.block_hash = block_hash
+        self.lattice = lattice
+        self.balances = balances
+        self.staked_balances = staked_balances
+        self.total_supply = total_supply
+        self.witnesses = witnesses
+    
+    @classmethod
+    def capture(cls, blockchain: Qi2TrinityBlockchain) -> 'StateCheckpoint':
+        """State at the current tip
+        
+        The published lattice is never mutated, so only the balance maps are
+        copied; the chain lock is held just long enough for that.
+        """
+        with blockchain.lock:
+            tip, lattice = blockchain.chain[-1], blockchain.lattice
+            token = blockchain.token
+            with token.lock:
+                balances = dict(token.balances)
+                staked_balances = dict(token.staked_balances)
+                total_supply = token.total_supply
+            witnesses = [{
+                'address': witness.identity.address,
+                'staked_tokens': witness.staked_tokens,
+                'participation_score': witness.participation_score
+            } for witness in blockchain.consensus.witness_pool]
+        return cls(tip.height, tip.hash, lattice, balances, staked_balances, total_supply, witnesses)
+    
+    def records(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+        """The checkpoint as a stream of records, at most chunk_size items each"""
+        lattice = self.lattice
+        yield {
+            'type': 'header',
+            'format': CHECKPOINT_FORMAT_VERSION,
+            'height': self.height,
+            'block_hash': self.block_hash,
+            'total_supply': self.total_supply,
+            'lattice': {
+                'nodes': len(lattice.nodes),
+                'total_coherence': lattice.total_coherence,
+                'total_connections': lattice.total_connections,
+                'total_validations': lattice.total_validations
+            }
+        }
+        
+        nodes = lattice.nodes
+        order = lattice.creation_order
+        for start in range(0, len(order), chunk_size):
+            yield {'type': 'nodes',
+                   'items': [asdict(nodes[node_id]) for node_id in order[start:start + chunk_size]]}
+        
+        for record_type, mapping in (('balances', self.balances), ('staked', self.staked_balances)):
+            items = list(mapping.items())
+            for start in range(0, len(items), chunk_size):
+                yield {'type': record_type, 'items': items[start:start + chunk_size]}
+        
+        yield {'type': 'witnesses', 'items': self.witnesses}
+        yield {'type': 'end'}
+    
+    def write(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+        """Stream the checkpoint to path atomically; returns its content hash"""
+        digest = hashlib.sha3_256()
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            for record in self.records(chunk_size):
+                line = json.dumps(record, separators=(',', ':')).encode() + b'\n'
+                digest.update(line)
+                f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return digest.hexdigest()
+    
+    @classmethod
+    def load(cls, path: str) -> Tuple['StateCheckpoint', str]:
+        """Read a checkpoint chunk by chunk; returns it with its content hash"""
+        digest = hashlib.sha3_256()
+        lattice = FractalThoughtLattice()
+        balances: Dict[str, int] = {}
+        staked_balances: Dict[str, int] = {}
+        witnesses: List[dict] = []
+        header = None
+        complete = False
+        
+        with open(path, 'rb') as f:
+            for line in f:
+                digest.update(line)
+                record = json.loads(line)
+                record_type = record['type']
+                if header is None:
+                    if record_type != 'header' or record['format'] != CHECKPOINT_FORMAT_VERSION:
+                        raise ValueError(f"{path} is not a version {CHECKPOINT_FORMAT_VERSION} checkpoint")
+                    header = record
+                elif record_type == 'nodes':
+                    for fields in record['items']:
+                        ChainStateStore.restore_node_fields(lattice, fields)
+                elif record_type == 'balances':
+                    balances.update(record['items'])
+                elif record_type == 'staked':
+                    staked_balances.update(record['items'])
+                elif record_type == 'witnesses':
+                    witnesses.extend(record['items'])
+                elif record_type == 'end':
+                    complete = True
+                    break
+                else:
+                    raise ValueError(f"Unknown checkpoint record {record_type!r}")
+        
+        if header is None or not complete:
+            raise ValueError(f"Checkpoint {path} is truncated")
+        totals = header['lattice']
+        if len(lattice.nodes) != totals['nodes']:
+            raise ValueError(f"Checkpoint {path} holds {len(lattice.nodes)} of {totals['nodes']} nodes")
+        lattice.total_coherence = totals['total_coherence']
+        lattice.total_connections = totals['total_connections']
+        lattice.total_validations = totals['total_validations']
+        
+        checkpoint = cls(header['height'], header['block_hash'], lattice, balances,
+                         staked_balances, header['total_supply'], witnesses)
+        return checkpoint, digest.hexdigest()
+
+class CheckpointManager:
+    """Writes a checkpoint every interval blocks on a background thread
+    
+    Each finished checkpoint's hash becomes the chain's pending checkpoint
+    hash, which the next block produced commits to.
+    """
+    
+    def __init__(self, blockchain: Qi2TrinityBlockchain, directory: str, interval: int = 1000,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, keep: int = 3):
+        self.blockchain = blockchain
+        self.directory = directory
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.keep = keep  # Most recent checkpoint files kept on disk
+        self.checkpoints: List[Tuple[int, str]] = []  # (height, content hash), oldest first
+        self._writer: Optional[threading.Thread] = None
+        self.stats = {
+            'written': 0,
+            'skipped_busy': 0,
+            'last_write_seconds': 0.0
+        }
+        os.makedirs(directory, exist_ok=True)
+    
+    def start(self):
+        """Checkpoint automatically as the main chain grows"""
+        if self._on_block not in self.blockchain.block_listeners:
+            self.blockchain.block_listeners.append(self._on_block)
+    
+    def stop(self, timeout: float = None):
+        if self._on_block in self.blockchain.block_listeners:
+            self.blockchain.block_listeners.remove(self._on_block)
+        self.wait(timeout)
+    
+    def wait(self, timeout: float = None):
+        """Block until the checkpoint being written (if any) is finished"""
+        writer = self._writer
+        if writer is not None:
+            writer.join(timeout)
+    
+    def _on_block(self, block: TrinityBlock):
+        if block.height % self.interval:
+            return
+        if self._writer is not None and self._writer.is_alive():
+            self.stats['skipped_busy'] += 1
+            return
+        state = StateCheckpoint.capture(self.blockchain)
+        self._writer = threading.Thread(target=self._write, args=(state,), daemon=True)
+        self._writer.start()
+    
+    def checkpoint_now(self) -> str:
+        """Capture and write a checkpoint of the current tip synchronously"""
+        return self._write(StateCheckpoint.capture(self.blockchain))
+    
+    def _write(self, state: StateCheckpoint) -> str:
+        start = time.time()
+        content_hash = state.write(checkpoint_path(self.directory, state.height), self.chunk_size)
+        with self.blockchain.lock:
+            self.blockchain.pending_checkpoint_hash = content_hash
+        self.checkpoints.append((state.height, content_hash))
+        self.stats['written'] += 1
+        self.stats['last_write_seconds'] = time.time() - start
+        
+        for _, path in list_checkpoints(self.directory)[:-self.keep]:
+            os.remove(path)
+        return content_hash
+
+def find_commitment(chain, content_hash: str, after_height: int) -> Optional[int]:
+    """Height of the first block above after_height committing to content_hash"""
+    for height in range(after_height + 1, len(chain)):
+        if chain[height].checkpoint_hash == content_hash:
+            return height
+    return None
+
+def fast_sync(directory: str, checkpoint_directory: str = None, max_checkpoint_height: int = None,
+              **store_options) -> Tuple[Qi2TrinityBlockchain, dict]:
+    """Open the blocks in directory from the newest committed checkpoint
+    
+    Checkpoints (by default looked for in directory too) are tried newest
+    first; one is used only if its block is on the stored chain and a later
+    block commits to its content hash. Only the blocks after it are replayed.
+    """
+    store = BlockStore(directory, **store_options)
+    blockchain = Qi2TrinityBlockchain()
+    blockchain.chain = StoredChain(store, blockchain.identity_registry)
+    chain = blockchain.chain
+    
+    checkpoint = None
+    for height, path in reversed(list_checkpoints(checkpoint_directory or directory)):
+        if height >= len(chain) or (max_checkpoint_height is not None and height > max_checkpoint_height):
+            continue
+        candidate, content_hash = StateCheckpoint.load(path)
+        if candidate.height != height or candidate.block_hash != chain[height].hash:
+            continue
+        commit_height = find_commitment(chain, content_hash, height)
+        if commit_height is not None:
+            checkpoint = candidate
+            break
+    if checkpoint is None:
+        store.close()
+        raise IOError("No checkpoint committed by the stored chain")
+    
+    ChainStateStore.restore_token(blockchain.token, {
+        'balances': checkpoint.balances,
+        'staked_balances': checkpoint.staked_balances,
+        'total_supply': checkpoint.total_supply
+    })
+    for fields in checkpoint.witnesses:
+        witness = WitnessNode(AddressIdentity(fields['address']), fields['staked_tokens'])
+        witness.participation_score = fields['participation_score']
+        blockchain.consensus.register_witness(witness)
+    blockchain.consensus.select_active_witnesses()
+    
+    blockchain.lattice = replay_blocks(blockchain, checkpoint.lattice, checkpoint.height)
+    chain.attach_lattice(blockchain.lattice)
+    blockchain.reset_block_tree()
+    
+    return blockchain, {
+        'checkpoint_height': checkpoint.height,
+        'commit_height': commit_height,
+        'replayed_blocks': len(chain) - 1 - checkpoint.height
+    }
+
+def run_fast_sync_demo(num_blocks: int = 1000, events_per_block: int = 20, interval: int = 250) -> dict:
+    """Build a chain with checkpoints, then compare fast sync with a replay from genesis"""
+    print("🛰️  Consciousness Fast Sync Demo")
+    print("=" * 50)
+    
+    directory = tempfile.mkdtemp(prefix='qi2_fast_sync_')
+    try:
+        blockchain, _ = open_persistent_blockchain(directory)
+        founders = [QuantumIdentity() for _ in range(3)]
+        allocations = {founder.address: INITIAL_TOKEN_SUPPLY // 3 for founder in founders}
+        allocations[founders[0].address] += INITIAL_TOKEN_SUPPLY % 3
+        blockchain.initialize_genesis(allocations)
+        for founder in founders:
+            blockchain.consensus.register_witness(WitnessNode(founder, WITNESS_STAKE_MIN))
+        blockchain.consensus.select_active_witnesses()
+        blockchain.retargeter = FixedTargetRetargeter(difficulty_to_target(1))
+        
+        manager = CheckpointManager(blockchain, directory, interval, keep=num_blocks)
+        manager.checkpoint_now()  # Genesis checkpoint, the starting point of a full replay
+        manager.start()
+        
+        users = [QuantumIdentity() for _ in range(10)]
+        rng = random.Random(3)
+        for i in range(num_blocks):
+            node_ids = blockchain.lattice.creation_order[-100:]
+            for j in range(events_per_block):
+                if node_ids and j % 2:
+                    event = VerifyEvent(users[j % 10], rng.choice(node_ids), "Resonance check", 0.6)
+                else:
+                    event = CommuneEvent(users[j % 10], f"Thought {i}.{j}", "fast sync")
+                blockchain.submit_event(event)
+            blockchain.create_block()
+            if not i % interval:
+                manager.wait()
+        manager.stop()
+        print(f"✨ {len(blockchain.chain) - 1} blocks, {len(manager.checkpoints)} checkpoints")
+        
+        expected_lattice = blockchain.lattice
+        expected_balances = dict(blockchain.token.balances)
+        close_persistent_blockchain(blockchain)
+        
+        results = {'blocks': num_blocks, 'events_per_block': events_per_block}
+        for label, max_height in (('full_replay', 0), ('fast_sync', None)):
+            start = time.perf_counter()
+            synced, info = fast_sync(directory, max_checkpoint_height=max_height)
+            elapsed = time.perf_counter() - start
+            
+            matches = (synced.lattice.recompute_totals() == expected_lattice.recompute_totals()
+                       and synced.lattice.creation_order[:] == expected_lattice.creation_order[:]
+                       and synced.token.balances == expected_balances)
+            synced.chain.store.close()
+            if not matches:
+                raise RuntimeError(f"{label} state differs from the original node")
+            results[label] = dict(info, seconds=elapsed)
+            print(f"   {label}: from height {info['checkpoint_height']}, "
+                  f"{info['replayed_blocks']} blocks replayed in {elapsed:.2f}s")
+        print("✅ Synced state matches the original node")
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    run_fast_sync_demo()
@@ -0,0 +1,358 @@
+"""
+Consciousness Binary Codec
+Compact, canonical serialization for resonance events and Trinity blocks
+
+Layout (events version 1, blocks version 3), all integers little-endian:
+    event  = version:u8 type:u8 sender:hexstr timestamp:num signature:hexstr?
+             followed by the type specific fields
+    block  = version:u8 height:varint prev_hash:hexstr witness:hexstr
+             timestamp:num nonce:varint difficulty:varint hash:hexstr
+             lattice_coherence:num count:varint (length:varint event)*
+             checkpoint_hash:hexstr (version 2+) target:hexstr (version 3+)
+    
+    str    = length:varint utf-8 bytes
+    hexstr = tag:u8 (0 = str, 1 = raw bytes of a lowercase hex string) + payload
+    num    = tag:u8 (0 = f64, 1 = zigzag varint int) + payload
+
+Hex identifiers (addresses, node ids, hashes, signatures) are stored as
+raw bytes, halving their size. Numbers keep their int/float type so the
+decoded event produces exactly the same to_dict() - and therefore the same
+signature and block hash - as the original.
+"""
+
+import struct
+import time
+from typing import Dict, List, Tuple
+from qi2_trinity_blockchain import *
+
+CODEC_VERSION = 1
+# Blocks gained checkpoint_hash in version 2 and target in version 3; older blocks remain readable
+BLOCK_CODEC_VERSION = 3
+BLOCK_CODEC_VERSIONS = (1, 2, 3)
+
+EVENT_TYPE_CODES = {
+    'commune': 1,
+    'verify': 2,
+    'evolve': 3,
+    'anchor': 4
+}
+EVENT_CODE_TYPES = {code: event_type for event_type, code in EVENT_TYPE_CODES.items()}
+
+_F64 = struct.Struct('<d')
+
+_TAG_STR = 0
+_TAG_HEX = 1
+_TAG_NONE = 2
+_TAG_FLOAT = 0
+_TAG_INT = 1
+
+def _write_varint(out: bytearray, value: int):
+    if value < 0:
+        raise ValueError("varint must be non-negative")
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _write_str(out: bytearray, value: str):
+    data = value.encode('utf-8', 'surrogatepass')
+    _write_varint(out, len(data))
+    out += data
+
+def _write_hexstr(out: bytearray, value):
+    if value is None:
+        out.append(_TAG_NONE)
+        return
+    if len(value) % 2 == 0:
+        try:
+            raw = bytes.fromhex(value)
+        except ValueError:
+            raw = None
+        # Only lowercase canonical hex survives the round trip unchanged
+        if raw is not None and raw.hex() == value:
+            out.append(_TAG_HEX)
+            _write_varint(out, len(raw))
+            out += raw
+            return
+    out.append(_TAG_STR)
+    _write_str(out, value)
+
+def _write_num(out: bytearray, value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        out.append(_TAG_INT)
+        _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+    else:
+        out.append(_TAG_FLOAT)
+        out += _F64.pack(value)
+
+class _Reader:
+    """Cursor over an encoded buffer"""
+    
+    __slots__ = ('data', 'pos')
+    
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+    
+    def byte(self) -> int:
+        if self.pos >= len(self.data):
+            raise ValueError("Truncated record")
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+    
+    def varint(self) -> int:
+        data = self.data
+        result = 0
+        shift = 0
+        while True:
+            if self.pos >= len(data):
+                raise ValueError("Truncated record")
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+    
+    def raw(self, length: int) -> bytes:
+        end = self.pos + length
+        if end > len(self.data):
+            raise ValueError("Truncated record")
+        value = self.data[self.pos:end]
+        self.pos = end
+        return value
+    
+    def text(self) -> str:
+        return self.raw(self.varint()).decode('utf-8', 'surrogatepass')
+    
+    def hexstr(self):
+        tag = self.byte()
+        if tag == _TAG_HEX:
+            return self.raw(self.varint()).hex()
+        if tag == _TAG_STR:
+            return self.text()
+        if tag == _TAG_NONE:
+            return None
+        raise ValueError(f"Unknown string tag {tag}")
+    
+    def num(self):
+        tag = self.byte()
+        if tag == _TAG_FLOAT:
+            value, = _F64.unpack(self.raw(_F64.size))
+            return value
+        if tag == _TAG_INT:
+            zigzag = self.varint()
+            return (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1)
+        raise ValueError(f"Unknown number tag {tag}")
+
+def _write_event(out: bytearray, event: ResonanceEvent):
+    code = EVENT_TYPE_CODES.get(event.event_type)
+    if code is None:
+        raise ValueError(f"Unknown event type: {event.event_type}")
+    
+    out.append(CODEC_VERSION)
+    out.append(code)
+    _write_hexstr(out, event.sender.address)
+    _write_num(out, event.timestamp)
+    _write_hexstr(out, event.signature)
+    
+    if code == 1:
+        _write_str(out, event.symbolic_content)
+        _write_str(out, event.context)
+        _write_varint(out, len(event.connections))
+        for target_id, strength in event.connections:
+            _write_hexstr(out, target_id)
+            _write_num(out, strength)
+    elif code == 2:
+        _write_hexstr(out, event.node_id)
+        _write_str(out, event.proof_of_understanding)
+        _write_num(out, event.coherence_score)
+    elif code == 3:
+        _write_hexstr(out, event.parent_node_id)
+        _write_str(out, event.mutation_prompt)
+        _write_str(out, event.new_content)
+    else:
+        _write_str(out, event.experience_summary)
+        _write_str(out, event.biometric_hash)
+
+def _read_event(reader: _Reader, identity_registry: Dict[str, QuantumIdentity] = None) -> ResonanceEvent:
+    version = reader.byte()
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported event codec version {version}")
+    event_type = EVENT_CODE_TYPES.get(reader.byte())
+    if event_type is None:
+        raise ValueError("Unknown event type code")
+    
+    data = {
+        'type': event_type,
+        'sender': reader.hexstr(),
+        'timestamp': reader.num(),
+        'signature': reader.hexstr()
+    }
+    if event_type == 'commune':
+        data['symbolic_content'] = reader.text()
+        data['context'] = reader.text()
+        data['connections'] = [(reader.hexstr(), reader.num()) for _ in range(reader.varint())]
+    elif event_type == 'verify':
+        data['node_id'] = reader.hexstr()
+        data['proof'] = reader.text()
+        data['coherence'] = reader.num()
+    elif event_type == 'evolve':
+        data['parent'] = reader.hexstr()
+        data['mutation'] = reader.text()
+        data['new_content'] = reader.text()
+    else:
+        data['summary'] = reader.text()
+        data['biometric_hash'] = reader.text()
+    
+    return ResonanceEvent.from_dict(data, identity_registry)
+
+def encode_event(event: ResonanceEvent) -> bytes:
+    """Encode a signed event in the compact binary layout"""
+    out = bytearray()
+    _write_event(out, event)
+    return bytes(out)
+
+def decode_event(data: bytes, identity_registry: Dict[str, QuantumIdentity] = None) -> ResonanceEvent:
+    """Decode an event produced by encode_event"""
+    reader = _Reader(bytes(data))
+    event = _read_event(reader, identity_registry)
+    if reader.pos != len(data):
+        raise ValueError("Trailing bytes after event")
+    return event
+
+def encode_block(block: TrinityBlock) -> bytes:
+    """Encode a block (without its lattice state) in the compact binary layout"""
+    out = bytearray()
+    out.append(BLOCK_CODEC_VERSION)
+    _write_varint(out, block.height)
+    _write_hexstr(out, block.prev_hash)
+    _write_hexstr(out, block.witness)
+    _write_num(out, block.timestamp)
+    _write_varint(out, block.nonce)
+    _write_varint(out, block.difficulty)
+    _write_hexstr(out, block.hash)
+    _write_num(out, block.get_lattice_coherence())
+    
+    _write_varint(out, len(block.events))
+    event_buffer = bytearray()
+    for event in block.events:
+        event_buffer.clear()
+        _write_event(event_buffer, event)
+        _write_varint(out, len(event_buffer))
+        out += event_buffer
+    _write_hexstr(out, block.checkpoint_hash)
+    _write_hexstr(out, f"{block.target:064x}" if block.target is not None else None)
+    return bytes(out)
+
+def decode_block(data: bytes, identity_registry: Dict[str, QuantumIdentity] = None) -> TrinityBlock:
+    """Decode a block produced by encode_block; the lattice state is not restored"""
+    reader = _Reader(bytes(data))
+    version = reader.byte()
+    if version not in BLOCK_CODEC_VERSIONS:
+        raise ValueError(f"Unsupported block codec version {version}")
+    
+    block = TrinityBlock.__new__(TrinityBlock)
+    block.height = reader.varint()
+    block.prev_hash = reader.hexstr()
+    block.witness = reader.hexstr()
+    block.timestamp = reader.num()
+    block.nonce = reader.varint()
+    block.difficulty = reader.varint()
+    block.hash = reader.hexstr()
+    block.lattice_coherence = reader.num()
+    block.lattice_state = None
+    
+    events = []
+    for _ in range(reader.varint()):
+        length = reader.varint()
+        end = reader.pos + length
+        events.append(_read_event(reader, identity_registry))
+        if reader.pos != end:
+            raise ValueError("Event length mismatch")
+    block.events = events
+    block.checkpoint_hash = reader.hexstr() if version >= 2 else None
+    target = reader.hexstr() if version >= 3 else None
+    block.target = int(target, 16) if target is not None else None
+    
+    if reader.pos != len(data):
+        raise ValueError("Trailing bytes after block")
+    return block
+
+def _sample_events(identities: List[QuantumIdentity], count: int) -> List[ResonanceEvent]:
+    """Signed events covering every type, for round-trip checks and benchmarks"""
+    node_ids = [hashlib.sha3_256(str(i).encode()).hexdigest() for i in range(16)]
+    events = []
+    for i in range(count):
+        sender = identities[i % len(identities)]
+        kind = i % 4
+        if kind == 0:
+            event = CommuneEvent(sender, f"Consciousness emerges through resonance #{i} ∇Ψ",
+                                 "benchmark", [(node_ids[i % 16], 0.5), (node_ids[(i + 1) % 16], 1)])
+        elif kind == 1:
+            event = VerifyEvent(sender, node_ids[i % 16], "Validated through resonance analysis", 0.85)
+        elif kind == 2:
+            event = EvolveEvent(sender, node_ids[i % 16], "Expand understanding", f"Evolved thought #{i}")
+        else:
+            event = AnchorEvent(sender, f"Meditation session {i}", f"session_{i}")
+        event.sign_event()
+        events.append(event)
+    return events
+
+def run_codec_benchmark(num_events: int = 20000) -> dict:
+    """Compare the binary codec with the JSON path and check round trips"""
+    print("📦 Consciousness Codec Benchmark")
+    print("=" * 50)
+    
+    identities = [QuantumIdentity() for _ in range(8)]
+    registry = {identity.address: identity for identity in identities}
+    events = _sample_events(identities, num_events)
+    
+    # Round trips must reproduce to_dict(), signature and validity exactly
+    for event in events:
+        decoded = decode_event(encode_event(event), registry)
+        if (decoded.to_dict() != event.to_dict() or decoded.signature != event.signature
+                or not decoded.validate()):
+            raise RuntimeError(f"{event.event_type} event did not survive the round trip")
+    
+    block = TrinityBlock(1, '0' * 64, identities[0].address, events[:256], FractalThoughtLattice())
+    decoded_block = decode_block(encode_block(block), registry)
+    if (decoded_block.calculate_hash() != block.hash
+            or encode_block(decoded_block) != encode_block(block)):
+        raise RuntimeError("Block did not survive the round trip")
+    print(f"✅ Round trips verified for {num_events} events and a {len(block.events)}-event block")
+    
+    def json_encode(e):
+        return json.dumps(dict(e.to_dict(), signature=e.signature), sort_keys=True).encode()
+    
+    def json_decode(payload):
+        return ResonanceEvent.from_dict(json.loads(payload), registry)
+    
+    results = {'events': num_events}
+    for name, encoder, decoder in (('json', json_encode, json_decode),
+                                   ('binary', encode_event, lambda p: decode_event(p, registry))):
+        start = time.perf_counter()
+        payloads = [encoder(e) for e in events]
+        encode_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for payload in payloads:
+            decoder(payload)
+        decode_time = time.perf_counter() - start
+        
+        results[name] = {
+            'encode_per_sec': num_events / encode_time,
+            'decode_per_sec': num_events / decode_time,
+            'bytes_per_event': sum(len(p) for p in payloads) / num_events
+        }
+        print(f"   {name:>6}: encode {results[name]['encode_per_sec']:,.0f}/s, "
+              f"decode {results[name]['decode_per_sec']:,.0f}/s, "
+              f"{results[name]['bytes_per_event']:.1f} bytes/event")
+    
+    results['size_ratio'] = results['binary']['bytes_per_event'] / results['json']['bytes_per_event']
+    print(f"   Binary events are {results['size_ratio']:.0%} of the JSON size")
+    return results
+
+if __name__ == "__main__":
+    run_codec_benchmark()
@@ -0,0 +1,326 @@
+"""
+Consciousness Compact Lattice
+Array-backed node storage with interned ids
+
+A CompactNodeStore keeps every node as a row index: ids are interned to
+integers, scalar fields live in typed arrays and adjacency is held in
+CSR form (offsets/targets/weights), so a 64-char id is stored once rather
+than once per neighbor. CompactNode views expose the ConsciousnessNode
+API on top of the arrays for code written against lattice.nodes.
+"""
+
+import sys
+import time
+import tracemalloc
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Iterator, List, Optional, Tuple
+from qi2_trinity_blockchain import *
+
+class CompactConnections(MutableMapping):
+    """Connections of one compact node, keyed by node id like ConsciousnessNode.connections"""
+    
+    __slots__ = ('_store', '_index')
+    
+    def __init__(self, store: 'CompactNodeStore', index: int):
+        self._store = store
+        self._index = index
+    
+    def __getitem__(self, node_id: str) -> float:
+        target = self._store.index.get(node_id)
+        if target is not None:
+            for edge_target, weight in self._store.edges(self._index):
+                if edge_target == target:
+                    return weight
+        raise KeyError(node_id)
+    
+    def __setitem__(self, node_id: str, strength: float):
+        self._store.connect(self._index, self._store.index[node_id], strength)
+    
+    def __delitem__(self, node_id: str):
+        raise TypeError("Lattice connections cannot be removed")
+    
+    def __iter__(self) -> Iterator[str]:
+        ids = self._store.ids
+        for edge_target, _ in self._store.edges(self._index):
+            yield ids[edge_target]
+    
+    def __len__(self) -> int:
+        return self._store.connection_count(self._index)
+
+class CompactNode:
+    """ConsciousnessNode-compatible view of one row of a CompactNodeStore"""
+    
+    __slots__ = ('_store', '_index')
+    
+    def __init__(self, store: 'CompactNodeStore', index: int):
+        self._store = store
+        self._index = index
+    
+    @property
+    def id(self) -> str:
+        return self._store.ids[self._index]
+    
+    @property
+    def content(self) -> str:
+        return self._store.contents[self._index]
+    
+    @property
+    def creator(self) -> str:
+        return self._store.creators[self._store.creator_codes[self._index]]
+    
+    @property
+    def timestamp(self) -> float:
+        return self._store.timestamps[self._index]
+    
+    @property
+    def coherence_score(self) -> float:
+        return self._store.coherence[self._index]
+    
+    @coherence_score.setter
+    def coherence_score(self, value: float):
+        self._store.coherence[self._index] = value
+    
+    @property
+    def validation_count(self) -> int:
+        return self._store.validation_counts[self._index]
+    
+    @validation_count.setter
+    def validation_count(self, value: int):
+        self._store.validation_counts[self._index] = value
+    
+    @property
+    def connections(self) -> CompactConnections:
+        return CompactConnections(self._store, self._index)
+    
+    @property
+    def parent_id(self) -> Optional[str]:
+        parent = self._store.parents[self._index]
+        return self._store.ids[parent] if parent >= 0 else None
+    
+    def to_node(self) -> ConsciousnessNode:
+        """Materialize a standalone ConsciousnessNode"""
+        return ConsciousnessNode(
+            id=self.id,
+            content=self.content,
+            creator=self.creator,
+            timestamp=self.timestamp,
+            coherence_score=self.coherence_score,
+            connections=dict(self.connections),
+            validation_count=self.validation_count,
+            parent_id=self.parent_id
+        )
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactNode):
+            return other._store is self._store and other._index == self._index
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._index))
+    
+    def __repr__(self) -> str:
+        return f"CompactNode(id={self.id[:16]!r}, coherence_score={self.coherence_score})"
+
+class CompactNodeStore(Mapping):
+    """Array-backed mapping of node id -> CompactNode
+    
+    Edges present at the last compact() live in the CSR arrays; edges
+    added afterwards go to a small per-node overflow until the next
+    compact(). Rows are only ever appended, so indices are stable.
+    """
+    
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.contents: List[str] = []
+        self.creators: List[str] = []
+        self.creator_index: Dict[str, int] = {}
+        self.creator_codes = array('I')
+        self.timestamps = array('d')
+        self.coherence = array('d')
+        self.validation_counts = array('q')
+        self.parents = array('q')  # Row evolved from, or -1
+        
+        # CSR adjacency: edges of row i are targets[offsets[i]:offsets[i + 1]]
+        self.edge_offsets = array('Q', [0])
+        self.edge_targets = array('I')
+        self.edge_weights = array('d')
+        self._extra_edges: Dict[int, Dict[int, float]] = {}
+    
+    @classmethod
+    def from_lattice(cls, lattice: FractalThoughtLattice) -> 'CompactNodeStore':
+        """Copy a lattice snapshot, in creation order, into a compact store"""
+        store = cls()
+        nodes = [lattice.nodes[node_id] for node_id in lattice.creation_order]
+        for node in nodes:
+            store.add(node.id, node.content, node.creator, node.timestamp,
+                      node.coherence_score, node.validation_count, node.parent_id)
+        
+        index = store.index
+        for node in nodes:
+            for target_id, strength in node.connections.items():
+                store.edge_targets.append(index[target_id])
+                store.edge_weights.append(strength)
+            store.edge_offsets.append(len(store.edge_targets))
+        return store
+    
+    def __getitem__(self, node_id: str) -> CompactNode:
+        return CompactNode(self, self.index[node_id])
+    
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.index
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def values(self) -> Iterator[CompactNode]:
+        return (CompactNode(self, index) for index in range(len(self.ids)))
+    
+    def add(self, node_id: str, content: str, creator: str, timestamp: float,
+            coherence_score: float = 0.0, validation_count: int = 0,
+            parent_id: str = None) -> int:
+        """Append a node without connections; returns its row index
+        
+        A parent_id must already be stored, as evolved nodes follow their parents.
+        """
+        if node_id in self.index:
+            raise ValueError(f"Node {node_id} already stored")
+        parent = self.index[parent_id] if parent_id is not None else -1
+        
+        node_id = sys.intern(node_id)
+        creator_code = self.creator_index.get(creator)
+        if creator_code is None:
+            creator_code = self.creator_index[creator] = len(self.creators)
+            self.creators.append(sys.intern(creator))
+        
+        row = len(self.ids)
+        self.ids.append(node_id)
+        self.index[node_id] = row
+        self.contents.append(content)
+        self.creator_codes.append(creator_code)
+        self.timestamps.append(timestamp)
+        self.coherence.append(coherence_score)
+        self.validation_counts.append(validation_count)
+        self.parents.append(parent)
+        return row
+    
+    def _csr_range(self, row: int) -> range:
+        if row + 1 < len(self.edge_offsets):
+            return range(self.edge_offsets[row], self.edge_offsets[row + 1])
+        return range(0)
+    
+    def edges(self, row: int) -> Iterator[Tuple[int, float]]:
+        """(target row, weight) pairs of a node, in insertion order"""
+        targets = self.edge_targets
+        weights = self.edge_weights
+        for position in self._csr_range(row):
+            yield targets[position], weights[position]
+        extra = self._extra_edges.get(row)
+        if extra:
+            yield from extra.items()
+    
+    def connection_count(self, row: int) -> int:
+        return len(self._csr_range(row)) + len(self._extra_edges.get(row, ()))
+    
+    def connect(self, source: int, target: int, strength: float):
+        """Set the directed edge source -> target (rows), updating it if present"""
+        for position in self._csr_range(source):
+            if self.edge_targets[position] == target:
+                self.edge_weights[position] = strength
+                return
+        self._extra_edges.setdefault(source, {})[target] = strength
+    
+    def compact(self):
+        """Fold overflow edges (and rows added since) into the CSR arrays"""
+        if not self._extra_edges and len(self.edge_offsets) == len(self.ids) + 1:
+            return
+        
+        offsets = array('Q', [0])
+        targets = array('I')
+        weights = array('d')
+        for row in range(len(self.ids)):
+            for target, weight in self.edges(row):
+                targets.append(target)
+                weights.append(weight)
+            offsets.append(len(targets))
+        
+        self.edge_offsets = offsets
+        self.edge_targets = targets
+        self.edge_weights = weights
+        self._extra_edges = {}
+    
+    def to_csr(self) -> Tuple[array, array, array]:
+        """Compacted (offsets, targets, weights) adjacency arrays"""
+        self.compact()
+        return self.edge_offsets, self.edge_targets, self.edge_weights
+    
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the store, including its strings"""
+        total = sum(sys.getsizeof(container) for container in (
+            self.ids, self.index, self.contents, self.creators, self.creator_index,
+            self.creator_codes, self.timestamps, self.coherence, self.validation_counts, self.parents,
+            self.edge_offsets, self.edge_targets, self.edge_weights, self._extra_edges))
+        total += sum(sys.getsizeof(text) for text in self.ids)
+        total += sum(sys.getsizeof(text) for text in self.contents)
+        total += sum(sys.getsizeof(text) for text in self.creators)
+        total += sum(sys.getsizeof(extra) for extra in self._extra_edges.values())
+        return total
+
+def _traced_bytes(build) -> Tuple[object, int]:
+    """Run build() and return its result with the bytes it left allocated"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+def run_compact_benchmark(num_nodes: int = 50000) -> dict:
+    """Compare lattice node memory with the compact store"""
+    print("🗜️  Compact Lattice Benchmark")
+    print("=" * 50)
+    
+    creators = [hashlib.sha3_256(str(i).encode()).hexdigest()[:40] for i in range(100)]
+    rng = random.Random(7)
+    
+    def build_lattice():
+        lattice = FractalThoughtLattice()
+        node_ids = []
+        for i in range(num_nodes):
+            connections = [(rng.choice(node_ids), rng.random())] if node_ids else None
+            node_ids.append(lattice.add_node(f"Thought {i}", creators[i % 100], connections))
+            if i % 2:
+                lattice.validate_node(rng.choice(node_ids), 'validator', rng.random())
+        return lattice
+    
+    lattice, lattice_bytes = _traced_bytes(build_lattice)
+    start = time.perf_counter()
+    store, store_bytes = _traced_bytes(lambda: CompactNodeStore.from_lattice(lattice))
+    build_time = time.perf_counter() - start
+    
+    # The views must reproduce every node exactly
+    mismatched = sum(1 for node in lattice.nodes.values() if store[node.id].to_node() != node)
+    if mismatched:
+        raise RuntimeError(f"Compact views differ from the lattice for {mismatched} nodes")
+    print(f"✅ {len(store)} compact nodes match the lattice")
+    
+    results = {
+        'nodes': num_nodes,
+        'lattice_bytes_per_node': lattice_bytes / num_nodes,
+        'compact_bytes_per_node': store.memory_usage() / num_nodes,
+        'compact_extra_bytes_per_node': store_bytes / num_nodes,
+        'build_seconds': build_time
+    }
+    print(f"   lattice: {results['lattice_bytes_per_node']:.0f} bytes/node "
+          f"(including text and creator indexes)")
+    print(f"   compact: {results['compact_bytes_per_node']:.0f} bytes/node with strings, "
+          f"{results['compact_extra_bytes_per_node']:.0f} bytes/node on top of shared strings")
+    return results
+
+if __name__ == "__main__":
+    run_compact_benchmark()
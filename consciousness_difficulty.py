@@ -0,0 +1,254 @@
+"""
+Consciousness Difficulty Retargeting
+Rolling-window proof-of-resonance targets with full 256-bit precision
+
+A target is an integer: a block hash meets it when the hash, read as a
+256-bit number, is at most the target. Expected work is 2**256 / (target + 1),
+so a target can move by any ratio instead of a 16x nibble step.
+
+DifficultyRetargeter keeps the timestamps and targets of the last window
+blocks and follows the chain tip incrementally; the next target scales
+the window's mean target by observed over expected block time, moving
+only 1/damping of the way there per block.
+
+Run this module to replay a hashrate profile (synthetic, or estimated
+from historical block timestamps) through the legacy nibble rule and the
+rolling retargeter and compare block-time variance.
+"""
+
+import copy
+import json
+import math
+import random
+import statistics
+import sys
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+HASH_BITS = 256
+MAX_TARGET = (1 << HASH_BITS) - 1
+
+def difficulty_to_target(difficulty: int) -> int:
+    """Largest hash with difficulty leading zero hex digits"""
+    return (1 << (HASH_BITS - 4 * difficulty)) - 1
+
+def target_to_difficulty(target: int) -> int:
+    """Nearest whole number of leading zero hex digits to target (at least 1)"""
+    return max(1, round(math.log2(target_work(target)) / 4))
+
+def target_work(target: int) -> int:
+    """Expected hash attempts to find a hash at or below target"""
+    return (1 << HASH_BITS) // (target + 1)
+
+def block_target(block) -> int:
+    """Target a block was mined at; older blocks only record a leading zero difficulty"""
+    if block.target is not None:
+        return block.target
+    return difficulty_to_target(block.difficulty)
+
+class DifficultyRetargeter:
+    """Next-block target from a rolling window of recent blocks
+    
+    Each entry is (block_hash, timestamp, target). push() appends one
+    block in O(1); sync() aligns the window with a chain, appending the
+    new tip when it extends the window and rebuilding after reorgs or
+    reloads. max_adjustment bounds the observed/expected time ratio.
+    """
+    
+    def __init__(self, target_block_time: float, window: int = 32, damping: int = 4,
+                 max_adjustment: float = 4.0, initial_target: int = difficulty_to_target(1),
+                 max_target: int = MAX_TARGET):
+        if window < 2 or damping < 1 or max_adjustment < 1:
+            raise ValueError("window must be >= 2, damping >= 1 and max_adjustment >= 1")
+        self.target_block_time = target_block_time
+        self.window = window
+        self.damping = damping
+        self.max_adjustment = max_adjustment
+        self.initial_target = initial_target
+        self.max_target = max_target
+        self.entries: deque = deque()
+        self._target_sum = 0
+    
+    def reset(self, entries: Iterable[Tuple[Optional[str], float, int]] = ()):
+        self.entries.clear()
+        self._target_sum = 0
+        for block_hash, timestamp, target in entries:
+            self.push(block_hash, timestamp, target)
+    
+    def push(self, block_hash: Optional[str], timestamp: float, target: int):
+        """Add the newest block, dropping the oldest beyond the window"""
+        self.entries.append((block_hash, timestamp, target))
+        self._target_sum += target
+        if len(self.entries) > self.window:
+            self._target_sum -= self.entries.popleft()[2]
+    
+    def next_target(self) -> int:
+        """Target for a block extending the newest entry"""
+        if len(self.entries) < 2:
+            return self.entries[-1][2] if self.entries else self.initial_target
+        
+        intervals = len(self.entries) - 1
+        # Whole milliseconds keep the arithmetic in integers
+        actual = max(1, round((self.entries[-1][1] - self.entries[0][1]) * 1000))
+        expected = max(1, round(intervals * self.target_block_time * 1000))
+        actual = min(max(actual, expected / self.max_adjustment), expected * self.max_adjustment)
+        actual = round(actual)
+        
+        mean_target = self._target_sum // len(self.entries)
+        ideal = mean_target * actual // expected
+        previous = self.entries[-1][2]
+        target = previous + (ideal - previous) // self.damping
+        return min(max(target, 1), self.max_target)
+    
+    def sync(self, chain: Sequence) -> None:
+        """Align the window with chain, a sequence of TrinityBlocks"""
+        tip = chain[-1]
+        if self.entries and self.entries[-1][0] == tip.hash:
+            return
+        if self.entries and self.entries[-1][0] == tip.prev_hash:
+            self.push(tip.hash, tip.timestamp, block_target(tip))
+            return
+        # Reorg or reload: restart from the targets the blocks were mined at
+        self.reset((block.hash, block.timestamp, block_target(block))
+                   for block in chain[-self.window:])
+    
+    def target_for(self, chain: Sequence) -> int:
+        """Target for the block extending chain's tip"""
+        self.sync(chain)
+        return self.next_target()
+    
+    def target_after(self, blocks: Sequence) -> int:
+        """Target for a block extending blocks[-1] (e.g. on a side branch), leaving this window as is"""
+        scratch = copy.copy(self)
+        scratch.entries = deque()
+        scratch.reset((block.hash, block.timestamp, block_target(block))
+                      for block in blocks[-self.window:])
+        return scratch.next_target()
+
+class LegacyNibbleRetargeter(DifficultyRetargeter):
+    """The original rule: +-1 leading zero digit from the last 10 blocks' mean time"""
+    
+    def __init__(self, target_block_time: float, initial_target: int = difficulty_to_target(1)):
+        super().__init__(target_block_time, window=10, damping=1, initial_target=initial_target)
+    
+    def next_target(self) -> int:
+        if len(self.entries) < self.window:
+            return self.initial_target
+        average = (self.entries[-1][1] - self.entries[0][1]) / (self.window - 1)
+        difficulty = target_to_difficulty(self.entries[-1][2])
+        if average < self.target_block_time * 0.8:
+            difficulty += 1
+        elif average > self.target_block_time * 1.2:
+            difficulty = max(1, difficulty - 1)
+        return difficulty_to_target(difficulty)
+
+class FixedTargetRetargeter(DifficultyRetargeter):
+    """Every block at one target, e.g. to keep proof-of-resonance trivial in tests"""
+    
+    def __init__(self, target: int, target_block_time: float = 5.0):
+        super().__init__(target_block_time, initial_target=target)
+    
+    def next_target(self) -> int:
+        return self.initial_target
+
+def simulate_block_times(hashrates: Sequence[float], retargeter: DifficultyRetargeter,
+                         seed: int = 1618) -> List[float]:
+    """Block times when block i is mined at hashrates[i] hashes per second
+    
+    Finding a block is memoryless, so each block time is drawn from an
+    exponential distribution with mean target_work(target) / hashrate.
+    """
+    rng = random.Random(seed)
+    retargeter.reset()
+    now = 0.0
+    retargeter.push(None, now, retargeter.initial_target)
+    block_times = []
+    for hashrate in hashrates:
+        target = retargeter.next_target()
+        block_time = rng.expovariate(hashrate / target_work(target))
+        now += block_time
+        retargeter.push(None, now, target)
+        block_times.append(block_time)
+    return block_times
+
+def hashrates_from_history(timestamps: Sequence[float], targets: Sequence[int],
+                           smoothing: int = 9) -> List[float]:
+    """Estimate the hashrate behind each historical block
+    
+    Work over elapsed time per block is very noisy (block times are
+    exponential), so the estimate is a rolling median of smoothing blocks.
+    """
+    raw = []
+    for i in range(1, len(timestamps)):
+        elapsed = max(timestamps[i] - timestamps[i - 1], 1e-3)
+        raw.append(target_work(targets[i]) / elapsed)
+    half = smoothing // 2
+    return [statistics.median(raw[max(0, i - half):i + half + 1]) for i in range(len(raw))]
+
+def step_hashrate_profile(base: float = 20000.0,
+                          steps: Sequence[Tuple[int, float]] = ((200, 1.0), (150, 8.0), (150, 0.5), (100, 3.0))
+                          ) -> List[float]:
+    """Hashrate per block for miners joining and leaving: (blocks, multiple of base) steps"""
+    return [base * multiple for count, multiple in steps for _ in range(count)]
+
+def block_time_stats(block_times: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(block_times)
+    return {
+        'blocks': len(ordered),
+        'mean': statistics.fmean(ordered),
+        'stdev': statistics.pstdev(ordered),
+        'min': ordered[0],
+        'p5': ordered[int(0.05 * (len(ordered) - 1))],
+        'p95': ordered[int(0.95 * (len(ordered) - 1))],
+        'max': ordered[-1]
+    }
+
+def run_retarget_simulation(target_block_time: float = 5.0, hashrates: Sequence[float] = None,
+                            window: int = 32, damping: int = 4, seed: int = 1618) -> Dict[str, dict]:
+    """Compare the legacy nibble rule with the rolling retargeter on one hashrate profile"""
+    hashrates = list(hashrates) if hashrates is not None else step_hashrate_profile()
+    # Start both at the target closest to the opening hashrate, as a running chain would be
+    initial_target = difficulty_to_target(target_to_difficulty(
+        (1 << HASH_BITS) // max(1, round(hashrates[0] * target_block_time))))
+    policies = {
+        'legacy_nibble': LegacyNibbleRetargeter(target_block_time, initial_target),
+        'rolling_window': DifficultyRetargeter(target_block_time, window, damping,
+                                               initial_target=initial_target)
+    }
+    
+    print("🎯 Difficulty Retargeting Simulation")
+    print("=" * 50)
+    print(f"   {len(hashrates)} blocks, target {target_block_time:.1f}s, "
+          f"hashrate {min(hashrates):,.0f}-{max(hashrates):,.0f} H/s")
+    
+    results = {}
+    for name, retargeter in policies.items():
+        stats = block_time_stats(simulate_block_times(hashrates, retargeter, seed))
+        results[name] = stats
+        print(f"   {name:>15}: mean {stats['mean']:6.2f}s, stdev {stats['stdev']:6.2f}s, "
+              f"p5-p95 {stats['p5']:.2f}-{stats['p95']:.2f}s, max {stats['max']:.1f}s")
+    return results
+
+def load_history(path: str) -> Tuple[List[float], List[int]]:
+    """Timestamps and targets from a JSON list of block dicts (TrinityBlock.to_dict)"""
+    with open(path) as f:
+        blocks = json.load(f)
+    blocks.sort(key=lambda block: block['height'])
+    return ([block['timestamp'] for block in blocks],
+            [int(block['target'], 16) if block.get('target') else difficulty_to_target(block['difficulty'])
+             for block in blocks])
+
+def main():
+    hashrates = None
+    if '--history' in sys.argv:
+        index = sys.argv.index('--history')
+        if index + 1 >= len(sys.argv):
+            print("Usage: python consciousness_difficulty.py [--history blocks.json]")
+            sys.exit(2)
+        timestamps, targets = load_history(sys.argv[index + 1])
+        hashrates = hashrates_from_history(timestamps, targets)
+        print(f"📜 Replaying hashrate estimated from {len(timestamps)} historical blocks")
+    run_retarget_simulation(hashrates=hashrates)
+
+if __name__ == "__main__":
+    main()
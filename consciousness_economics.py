@@ -6,8 +6,10 @@ This module implements the revolutionary economic principles where value
 flows through consciousness resonance rather than speculation.
 """
 
+import math
 import time
 import random
+import heapq
 from typing import Dict, List, Tuple
 from qi2_trinity_blockchain import *
 
@@ -22,8 +24,10 @@ class ConsciousnessEconomics:
             'network_effect': 1.0,
             'consciousness_premium': 0.618  # Golden ratio
         }
+        self.lattice_graph = None  # Built on first use by get_influence_leaderboard
+        self.dividend_engine = None  # Built on first vectorized dividend run
         
-    def calculate_node_value(self, node_id: str) -> float:
+    def calculate_node_value(self, node_id: str, now: float = None) -> float:
         """Calculate the economic value of a consciousness node"""
         if node_id not in self.blockchain.lattice.nodes:
             return 0.0
@@ -40,42 +44,79 @@ class ConsciousnessEconomics:
         validation_bonus = node.validation_count * 0.05
         
         # Age factor (older nodes gain wisdom)
-        age_factor = min(2.0, (time.time() - node.timestamp) / (24 * 3600))  # Max 2x after 1 day
+        now = time.time() if now is None else now
+        age_factor = min(2.0, (now - node.timestamp) / (24 * 3600))  # Max 2x after 1 day
         
         total_value = (base_value + connection_bonus + validation_bonus) * age_factor
         return total_value
         
-    def calculate_creator_reputation(self, creator_address: str) -> float:
-        """Calculate reputation score for a consciousness creator"""
-        creator_nodes = [node for node in self.blockchain.lattice.nodes.values() 
-                        if node.creator == creator_address]
-        
-        if not creator_nodes:
+    @staticmethod
+    def _reputation_from_aggregate(stats: CreatorAggregate) -> float:
+        """Reputation from a creator's running node aggregates"""
+        if stats is None or not stats.node_count:
             return 0.0
             
         # Average coherence of created nodes
-        avg_coherence = sum(node.coherence_score for node in creator_nodes) / len(creator_nodes)
-        
-        # Total validations received
-        total_validations = sum(node.validation_count for node in creator_nodes)
-        
-        # Network contribution (total connections)
-        total_connections = sum(len(node.connections) for node in creator_nodes)
+        avg_coherence = stats.coherence_sum / stats.node_count
         
+        # Validations received and network contribution (connections) per node
         reputation = (avg_coherence * 0.5 + 
-                     (total_validations / len(creator_nodes)) * 0.3 + 
-                     (total_connections / len(creator_nodes)) * 0.2)
+                     (stats.validation_sum / stats.node_count) * 0.3 + 
+                     (stats.connection_sum / stats.node_count) * 0.2)
         
         return min(1.0, reputation)
         
-    def distribute_consciousness_dividends(self) -> Dict[str, int]:
-        """Distribute dividends based on consciousness contributions"""
+    def calculate_creator_reputation(self, creator_address: str) -> float:
+        """Calculate reputation score for a consciousness creator"""
+        stats = self.blockchain.lattice.get_creator_stats(creator_address)
+        return self._reputation_from_aggregate(stats)
+        
+    def calculate_all_reputations(self) -> Dict[str, float]:
+        """Reputation of every creator in one pass over the creator aggregates"""
+        return {creator: self._reputation_from_aggregate(stats)
+                for creator, stats in self.blockchain.lattice.creator_stats.items()}
+        
+    def get_reputation_leaderboard(self, limit: int = 10) -> List[Tuple[str, float]]:
+        """Top creators by reputation"""
+        reputations = self.calculate_all_reputations()
+        return heapq.nlargest(limit, reputations.items(), key=lambda item: item[1])
+        
+    def get_influence_leaderboard(self, limit: int = 10) -> List[Tuple[str, float]]:
+        """Top creators by the PageRank of their nodes in the lattice graph
+        
+        The graph (see consciousness_graph) is kept between calls and only
+        takes in the nodes added since the previous one.
+        """
+        if self.lattice_graph is None:
+            from consciousness_graph import LatticeGraph
+            self.lattice_graph = LatticeGraph()
+        self.lattice_graph.update(self.blockchain.lattice)
+        influence = self.lattice_graph.creator_influence()
+        return heapq.nlargest(limit, influence.items(), key=lambda item: item[1])
+        
+    def distribute_consciousness_dividends(self, now: float = None,
+                                           vectorized: bool = False) -> Dict[str, int]:
+        """Distribute dividends based on consciousness contributions
+        
+        vectorized=True computes the same dividends with NumPy over a
+        columnar view of the lattice (see consciousness_vectorized).
+        """
+        if vectorized:
+            if self.dividend_engine is None:
+                from consciousness_vectorized import VectorizedDividendEngine
+                self.dividend_engine = VectorizedDividendEngine(self.blockchain)
+            return self.dividend_engine.distribute(now)
+            
         dividends = {}
-        total_network_value = 0
+        now = time.time() if now is None else now
+        lattice = self.blockchain.lattice
         
-        # Calculate total network value
-        for node in self.blockchain.lattice.nodes.values():
-            total_network_value += self.calculate_node_value(node.id)
+        # Calculate every node value once
+        node_values = []
+        for node in lattice.nodes.values():
+            node_values.append((node, self.calculate_node_value(node.id, now)))
+        # Exactly rounded, so the total does not depend on node order
+        total_network_value = math.fsum(value for _, value in node_values)
             
         if total_network_value == 0:
             return dividends
@@ -83,8 +124,7 @@ class ConsciousnessEconomics:
         # Distribute dividends proportionally
         dividend_pool = int(self.blockchain.token.total_supply * 0.001)  # 0.1% of total supply
         
-        for node in self.blockchain.lattice.nodes.values():
-            node_value = self.calculate_node_value(node.id)
+        for node, node_value in node_values:
             creator_share = (node_value / total_network_value) * dividend_pool
             
             if creator_share > 0:
@@ -104,6 +144,7 @@ class ConsciousnessMarket:
         self.economics = economics
         self.listings: Dict[str, Dict] = {}  # node_id -> listing_info
         self.trades: List[Dict] = []
+        self.version = 0  # Bumped on every listing change or trade
         
     def list_consciousness_node(self, seller: QuantumIdentity, node_id: str, 
                                price: int, description: str = "") -> bool:
@@ -122,6 +163,7 @@ class ConsciousnessMarket:
             'listed_at': time.time(),
             'node_value': self.economics.calculate_node_value(node_id)
         }
+        self.version += 1
         
         return True
         
@@ -156,6 +198,7 @@ class ConsciousnessMarket:
             
             # Remove listing
             del self.listings[node_id]
+            self.version += 1
             
             return True
             
@@ -0,0 +1,397 @@
+"""
+Consciousness Graph Analytics
+Influence, structure and lineage of the lattice over a CSR adjacency snapshot
+
+LatticeGraph copies node connections into NumPy edge arrays once and then
+follows the lattice block by block: nodes and edges are only ever added,
+so an update walks just the nodes created since the last one. Analytics
+run as whole-array operations instead of Python graph walks:
+
+    pagerank()        weighted PageRank, warm-started after updates
+    components()      connected components by hooking and pointer jumping
+    lineage_depths()  evolve_node generations, by pointer jumping
+    k_hop()           breadth-first neighborhoods over the CSR arrays
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from qi2_trinity_blockchain import *
+
+def _grown(values: np.ndarray, size: int) -> np.ndarray:
+    """values with capacity for at least size entries, doubling as needed"""
+    if size <= len(values):
+        return values
+    grown = np.empty(max(size, 2 * len(values), 16), dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+def _gather_neighbors(offsets: np.ndarray, targets: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Concatenated CSR targets of rows"""
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, dtype=targets.dtype)
+    # Position of each gathered edge: its row's start plus its rank within the row
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return targets[shift + np.arange(total)]
+
+class LatticeGraph:
+    """Weighted, directed connection graph of a lattice in creation order
+    
+    Row i is the i-th created node. Edges are kept as growable COO arrays
+    (both directions of every connection, as stored in the lattice); the
+    CSR view is derived on demand. Component labels, lineage depths and
+    PageRank scores are cached and extended incrementally after update().
+    """
+    
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+    
+    def clear(self):
+        """Drop every node, edge and cached result"""
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.creators: List[str] = []
+        self.creator_index: Dict[str, int] = {}
+        self._creator_codes = np.empty(0, dtype=np.int64)
+        self._parents = np.empty(0, dtype=np.int64)  # Row evolved from, or -1
+        self._src = np.empty(0, dtype=np.int64)
+        self._dst = np.empty(0, dtype=np.int64)
+        self._weight = np.empty(0, dtype=np.float64)
+        self.edge_count = 0
+        self._csr = None
+        self._labels = None       # Component labels covering the first _labeled_edges edges
+        self._labeled_edges = 0
+        self._depths = None       # Lineage depths of the first len(_depths) rows
+        self._pagerank = None     # Last scores, the warm start for the next run
+    
+    @classmethod
+    def from_lattice(cls, lattice: FractalThoughtLattice) -> 'LatticeGraph':
+        graph = cls()
+        graph.update(lattice)
+        return graph
+    
+    @classmethod
+    def from_compact(cls, store) -> 'LatticeGraph':
+        """Graph copied straight from a CompactNodeStore's CSR arrays"""
+        offsets, targets, weights = store.to_csr()
+        graph = cls()
+        graph.ids = list(store.ids)
+        graph.index = dict(store.index)
+        graph.creators = list(store.creators)
+        graph.creator_index = dict(store.creator_index)
+        graph._creator_codes = np.frombuffer(store.creator_codes, dtype=np.uint32).astype(np.int64)
+        graph._parents = np.frombuffer(store.parents, dtype=np.int64).copy()
+        offsets = np.frombuffer(offsets, dtype=np.uint64).astype(np.int64)
+        graph._src = np.repeat(np.arange(len(graph.ids), dtype=np.int64), np.diff(offsets))
+        graph._dst = np.frombuffer(targets, dtype=np.uint32).astype(np.int64)
+        graph._weight = np.frombuffer(weights, dtype=np.float64).copy()
+        graph.edge_count = len(graph._dst)
+        return graph
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def parents(self) -> np.ndarray:
+        return self._parents[:len(self.ids)]
+    
+    @property
+    def creator_codes(self) -> np.ndarray:
+        return self._creator_codes[:len(self.ids)]
+    
+    def edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(source rows, target rows, weights) of every directed edge"""
+        count = self.edge_count
+        return self._src[:count], self._dst[:count], self._weight[:count]
+    
+    def update(self, lattice: FractalThoughtLattice) -> int:
+        """Add the nodes and edges lattice gained since the last update
+        
+        lattice must extend the one last seen, which holds for successive
+        main chain blocks; otherwise (a reorg, another chain) the graph is
+        rebuilt. Returns the number of nodes added.
+        """
+        with self.lock:
+            order = lattice.creation_order
+            known = len(self.ids)
+            if known and (len(order) < known or order[known - 1] != self.ids[-1]):
+                self.clear()
+                known = 0
+            total = len(order)
+            if total == known:
+                return 0
+            
+            nodes = lattice.nodes
+            index = self.index
+            self._creator_codes = _grown(self._creator_codes, total)
+            self._parents = _grown(self._parents, total)
+            for row in range(known, total):
+                node = nodes[order[row]]
+                self.ids.append(node.id)
+                index[node.id] = row
+                code = self.creator_index.get(node.creator)
+                if code is None:
+                    code = self.creator_index[node.creator] = len(self.creators)
+                    self.creators.append(node.creator)
+                self._creator_codes[row] = code
+                self._parents[row] = index[node.parent_id] if node.parent_id is not None else -1
+                
+            # New nodes' connections are complete, including links from nodes created
+            # after them; older nodes only gained the reverse of those links
+            src, dst, weight = [], [], []
+            for row in range(known, total):
+                for target_id, strength in nodes[order[row]].connections.items():
+                    target = index[target_id]
+                    src.append(row)
+                    dst.append(target)
+                    weight.append(strength)
+                    if target < known:
+                        src.append(target)
+                        dst.append(row)
+                        weight.append(strength)
+                        
+            end = self.edge_count + len(src)
+            self._src = _grown(self._src, end)
+            self._dst = _grown(self._dst, end)
+            self._weight = _grown(self._weight, end)
+            self._src[self.edge_count:end] = src
+            self._dst[self.edge_count:end] = dst
+            self._weight[self.edge_count:end] = weight
+            self.edge_count = end
+            self._csr = None
+            return total - known
+    
+    def follow(self, blockchain: Qi2TrinityBlockchain):
+        """Keep the graph in step with blockchain's main chain tip"""
+        self.update(blockchain.lattice)
+        blockchain.block_listeners.append(lambda block: self.update(block.lattice_state))
+    
+    def csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(offsets, targets, weights): edges of row i are targets[offsets[i]:offsets[i + 1]]"""
+        with self.lock:
+            if self._csr is None:
+                src, dst, weight = self.edges()
+                order = np.argsort(src, kind='stable')
+                offsets = np.zeros(len(self.ids) + 1, dtype=np.int64)
+                np.cumsum(np.bincount(src, minlength=len(self.ids)), out=offsets[1:])
+                self._csr = (offsets, dst[order], weight[order])
+            return self._csr
+    
+    def pagerank(self, damping: float = 0.85, tolerance: float = 1e-10,
+                 max_iterations: int = 100) -> np.ndarray:
+        """Weighted PageRank per row, summing to 1
+        
+        Each node passes its rank along its edges in proportion to their
+        strength (negative strengths count as zero); nodes without outgoing
+        weight spread theirs evenly. After an update the previous scores
+        seed the iteration, so it converges in a few steps.
+        """
+        with self.lock:
+            size = len(self.ids)
+            if not size:
+                return np.empty(0)
+            src, dst, weight = self.edges()
+            weight = np.maximum(weight, 0.0)
+            out_weight = np.bincount(src, weights=weight, minlength=size)
+            share = np.divide(weight, out_weight[src], out=np.zeros_like(weight),
+                              where=out_weight[src] > 0)
+            dangling = out_weight == 0
+            
+            rank = np.full(size, 1.0 / size)
+            if self._pagerank is not None and len(self._pagerank) <= size:
+                rank[:len(self._pagerank)] = self._pagerank
+                rank /= rank.sum()
+            
+            for _ in range(max_iterations):
+                spread = rank[dangling].sum() / size
+                new_rank = np.bincount(dst, weights=rank[src] * share, minlength=size)
+                new_rank = (1.0 - damping) / size + damping * (new_rank + spread)
+                change = np.abs(new_rank - rank).sum()
+                rank = new_rank
+                if change < tolerance * size:
+                    break
+            self._pagerank = rank
+            return rank.copy()
+    
+    def creator_influence(self, **pagerank_options) -> Dict[str, float]:
+        """Total PageRank of the nodes each creator made"""
+        with self.lock:
+            totals = np.bincount(self.creator_codes, weights=self.pagerank(**pagerank_options),
+                                 minlength=len(self.creators))
+            return {creator: float(totals[code]) for code, creator in enumerate(self.creators)}
+    
+    def top_nodes(self, limit: int = 10) -> List[Tuple[str, float]]:
+        """Most influential nodes by PageRank"""
+        rank = self.pagerank()
+        rows = np.argsort(-rank, kind='stable')[:limit]
+        return [(self.ids[row], float(rank[row])) for row in rows]
+    
+    def components(self) -> np.ndarray:
+        """Component label per row: the lowest row of its connected component
+        
+        Lattice edges always come in both directions, so these are the
+        connected components of the undirected graph. Only edges added
+        since the last call are hooked in.
+        """
+        with self.lock:
+            size = len(self.ids)
+            labels = np.arange(size, dtype=np.int64)
+            if self._labels is not None:
+                labels[:len(self._labels)] = self._labels
+            src, dst, _ = self.edges()
+            src = src[self._labeled_edges:]
+            dst = dst[self._labeled_edges:]
+            
+            while True:
+                # Hook: each tree root adopts the lowest label across its edges
+                before = labels.copy()
+                np.minimum.at(labels, labels[src], labels[dst])
+                np.minimum.at(labels, labels[dst], labels[src])
+                # Shortcut: point every row straight at its root
+                while True:
+                    jumped = labels[labels]
+                    if np.array_equal(jumped, labels):
+                        break
+                    labels = jumped
+                if np.array_equal(labels, before):
+                    break
+            
+            self._labels = labels
+            self._labeled_edges = self.edge_count
+            return labels.copy()
+    
+    def component_sizes(self) -> Dict[int, int]:
+        """Rows per component, keyed by component label"""
+        labels, counts = np.unique(self.components(), return_counts=True)
+        return dict(zip(labels.tolist(), counts.tolist()))
+    
+    def lineage_depths(self) -> np.ndarray:
+        """evolve_node generations behind each row (0 for original nodes)
+        
+        Parents always precede their children, so known depths stay valid;
+        new rows jump up their parent pointers until they reach a known or
+        root row, in O(log depth) array passes.
+        """
+        with self.lock:
+            size = len(self.ids)
+            known = len(self._depths) if self._depths is not None else 0
+            depths = np.zeros(size, dtype=np.int64)
+            ancestors = np.full(size, -1, dtype=np.int64)
+            if known:
+                depths[:known] = self._depths
+            ancestors[known:] = self.parents[known:]
+            depths[known:] = ancestors[known:] >= 0
+            
+            while True:
+                active = np.flatnonzero(ancestors >= 0)
+                if not active.size:
+                    break
+                hop = ancestors[active]
+                depths[active] += depths[hop]
+                ancestors[active] = ancestors[hop]
+                # Rows resolved earlier carry their full depth and no ancestor
+            
+            self._depths = depths
+            return depths.copy()
+    
+    def lineage(self, node_id: str) -> List[str]:
+        """Node ids from node_id back to its original ancestor"""
+        parents = self.parents
+        row = self.index[node_id]
+        chain = [node_id]
+        while parents[row] >= 0:
+            row = int(parents[row])
+            chain.append(self.ids[row])
+        return chain
+    
+    def k_hop(self, node_id: str, k: int, max_nodes: Optional[int] = None) -> Dict[str, int]:
+        """Nodes within k connections of node_id, mapped to their hop distance
+        
+        max_nodes stops the expansion once that many nodes were reached.
+        """
+        with self.lock:
+            offsets, targets, _ = self.csr()
+            start = self.index[node_id]
+            distance = np.full(len(self.ids), -1, dtype=np.int64)
+            distance[start] = 0
+            frontier = np.array([start], dtype=np.int64)
+            reached = 1
+            for hop in range(1, k + 1):
+                if not frontier.size or (max_nodes is not None and reached >= max_nodes):
+                    break
+                neighbors = np.unique(_gather_neighbors(offsets, targets, frontier))
+                frontier = neighbors[distance[neighbors] < 0]
+                if max_nodes is not None:
+                    frontier = frontier[:max_nodes - reached]
+                distance[frontier] = hop
+                reached += len(frontier)
+            rows = np.flatnonzero(distance >= 0)
+            return {self.ids[row]: int(distance[row]) for row in rows}
+
+def run_graph_benchmark(num_nodes: int = 100000, nodes_per_block: int = 100) -> dict:
+    """Time the graph analytics on a synthetic lattice, then one block's update"""
+    print("🕸️  Lattice Graph Analytics Benchmark")
+    print("=" * 50)
+    
+    rng = random.Random(11)
+    creators = [hashlib.sha3_256(str(i).encode()).hexdigest()[:40] for i in range(200)]
+    lattice = FractalThoughtLattice()
+    node_ids = []
+    
+    def grow(count: int):
+        for _ in range(count):
+            i = len(node_ids)
+            creator = creators[i % len(creators)]
+            if node_ids and i % 5 == 0:
+                node_ids.append(lattice.evolve_node(rng.choice(node_ids[-1000:]), f"Evolved {i}", creator, float(i)))
+            else:
+                connections = [(rng.choice(node_ids), rng.random()) for _ in range(2)] if node_ids else None
+                node_ids.append(lattice.add_node(f"Thought {i}", creator, connections, float(i)))
+    
+    grow(num_nodes)
+    results = {'nodes': num_nodes, 'edges': lattice.total_connections}
+    
+    def timed_step(name: str, fn):
+        start = time.perf_counter()
+        value = fn()
+        results[name] = time.perf_counter() - start
+        return value
+    
+    graph = timed_step('build_seconds', lambda: LatticeGraph.from_lattice(lattice))
+    timed_step('pagerank_seconds', graph.pagerank)
+    labels = timed_step('components_seconds', graph.components)
+    depths = timed_step('lineage_seconds', graph.lineage_depths)
+    neighborhood = timed_step('k_hop_seconds', lambda: graph.k_hop(node_ids[-1], 3))
+    
+    # One block's worth of new nodes, then incremental analytics
+    lattice = lattice.snapshot()
+    grow(nodes_per_block)
+    timed_step('update_seconds', lambda: graph.update(lattice))
+    timed_step('incremental_pagerank_seconds', graph.pagerank)
+    timed_step('incremental_components_seconds', graph.components)
+    timed_step('incremental_lineage_seconds', graph.lineage_depths)
+    
+    if graph.edge_count != lattice.total_connections:
+        raise RuntimeError(f"Graph has {graph.edge_count} edges, lattice {lattice.total_connections} connections")
+    results['components'] = int(len(np.unique(labels)))
+    results['max_lineage_depth'] = int(depths.max())
+    results['k_hop_nodes'] = len(neighborhood)
+    
+    print(f"   {num_nodes} nodes, {results['edges']} edges: build {results['build_seconds']:.2f}s, "
+          f"PageRank {results['pagerank_seconds'] * 1000:.0f} ms, "
+          f"components {results['components_seconds'] * 1000:.0f} ms, "
+          f"lineage {results['lineage_seconds'] * 1000:.1f} ms, "
+          f"3-hop {results['k_hop_seconds'] * 1000:.1f} ms")
+    print(f"   +{nodes_per_block} nodes: update {results['update_seconds'] * 1000:.1f} ms, "
+          f"PageRank {results['incremental_pagerank_seconds'] * 1000:.0f} ms, "
+          f"components {results['incremental_components_seconds'] * 1000:.1f} ms, "
+          f"lineage {results['incremental_lineage_seconds'] * 1000:.1f} ms")
+    return results
+
+if __name__ == "__main__":
+    run_graph_benchmark()
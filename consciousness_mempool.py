@@ -0,0 +1,206 @@
+"""
+Consciousness Mempool
+Bounded, prioritized pool of pending resonance events
+
+Replaces the unbounded pending event list: events are deduplicated by
+hash, limited per sender and in total count and bytes, and the lowest
+priority events are evicted when the pool is full. Blocks take the
+highest priority events up to a configurable maximum.
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+class MempoolEntry:
+    """Pending event with its admission metadata"""
+    
+    __slots__ = ('event', 'event_hash', 'sender', 'size', 'priority', 'sequence',
+                 'admitted_at', 'alive')
+    
+    def __init__(self, event, event_hash: str, size: int, priority, sequence: int):
+        self.event = event
+        self.event_hash = event_hash
+        self.sender = event.sender.address
+        self.size = size
+        self.priority = priority
+        self.sequence = sequence
+        self.admitted_at = time.time()
+        self.alive = True
+
+def event_hash(event) -> str:
+    """Content hash used to deduplicate events"""
+    return hashlib.sha3_256(json.dumps(event.to_dict(), sort_keys=True).encode()).hexdigest()
+
+class ResonanceMempool:
+    """Bounded pool of pending events ordered by priority"""
+    
+    def __init__(self, max_events: int = 50000, max_bytes: int = 32 * 1024 * 1024,
+                 max_per_sender: int = 1000, max_block_events: int = 1000,
+                 max_age: Optional[float] = None,
+                 priority_fn: Callable[[Any], Any] = None):
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.max_per_sender = max_per_sender
+        self.max_block_events = max_block_events
+        self.max_age = max_age  # Seconds before an unmined event expires
+        self.priority_fn = priority_fn  # event -> comparable priority, higher is better
+        
+        self.entries: Dict[str, MempoolEntry] = {}
+        self._hash_by_event: Dict[int, str] = {}  # id(event) -> hash while pooled
+        self.sender_counts: Dict[str, int] = {}
+        self.total_bytes = 0
+        self._eviction_heap: List = []  # (priority, sequence, entry), lazily pruned
+        self._sequence = itertools.count()
+        self.stats = {
+            'admitted': 0,
+            'duplicates': 0,
+            'sender_limited': 0,
+            'rejected_full': 0,
+            'evicted': 0,
+            'expired': 0
+        }
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __contains__(self, event) -> bool:
+        return event_hash(event) in self.entries
+    
+    def add(self, event) -> bool:
+        """Admit an event, evicting lower priority events if the pool is full"""
+        serialized = json.dumps(event.to_dict(), sort_keys=True).encode()
+        digest = hashlib.sha3_256(serialized).hexdigest()
+        size = len(serialized)
+        
+        if digest in self.entries:
+            self.stats['duplicates'] += 1
+            return False
+        sender = event.sender.address
+        if self.sender_counts.get(sender, 0) >= self.max_per_sender:
+            self.stats['sender_limited'] += 1
+            return False
+        if size > self.max_bytes:
+            self.stats['rejected_full'] += 1
+            return False
+        
+        priority = self.priority_fn(event) if self.priority_fn is not None else 0
+        if not self._make_room(size, priority):
+            self.stats['rejected_full'] += 1
+            return False
+        
+        entry = MempoolEntry(event, digest, size, priority, next(self._sequence))
+        self.entries[digest] = entry
+        self._hash_by_event[id(event)] = digest
+        self.sender_counts[sender] = self.sender_counts.get(sender, 0) + 1
+        self.total_bytes += size
+        heapq.heappush(self._eviction_heap, (entry.priority, entry.sequence, entry))
+        self.stats['admitted'] += 1
+        return True
+    
+    def _make_room(self, size: int, priority) -> bool:
+        """Evict strictly lower priority entries until an event of this size fits
+        
+        Stale events (older than max_age) go first, then the lowest priority
+        ones, oldest first among equals.
+        """
+        full = len(self.entries) >= self.max_events or self.total_bytes + size > self.max_bytes
+        if full and self.max_age is not None:
+            self.expire()
+        
+        heap = self._eviction_heap
+        victims = []
+        count = len(self.entries)
+        total_bytes = self.total_bytes
+        while count >= self.max_events or total_bytes + size > self.max_bytes:
+            while heap and not heap[0][2].alive:
+                heapq.heappop(heap)
+            if not heap or not heap[0][0] < priority:
+                # Nothing cheaper to evict; restore the candidates we popped
+                for victim in victims:
+                    heapq.heappush(heap, (victim.priority, victim.sequence, victim))
+                return False
+            _, _, victim = heapq.heappop(heap)
+            victims.append(victim)
+            count -= 1
+            total_bytes -= victim.size
+        
+        for victim in victims:
+            self._discard(victim)
+        self.stats['evicted'] += len(victims)
+        return True
+    
+    def _discard(self, entry: MempoolEntry):
+        if not entry.alive:
+            return
+        entry.alive = False
+        del self.entries[entry.event_hash]
+        self._hash_by_event.pop(id(entry.event), None)
+        self.total_bytes -= entry.size
+        remaining = self.sender_counts[entry.sender] - 1
+        if remaining:
+            self.sender_counts[entry.sender] = remaining
+        else:
+            del self.sender_counts[entry.sender]
+        
+        # Rebuild the heap once dead entries dominate it
+        if len(self._eviction_heap) > 2 * len(self.entries) + 64:
+            self._eviction_heap = [item for item in self._eviction_heap if item[2].alive]
+            heapq.heapify(self._eviction_heap)
+    
+    def expire(self, now: float = None) -> int:
+        """Drop events older than max_age; returns how many were dropped"""
+        if self.max_age is None:
+            return 0
+        cutoff = (now or time.time()) - self.max_age
+        expired = [entry for entry in self.entries.values() if entry.admitted_at < cutoff]
+        for entry in expired:
+            self._discard(entry)
+        self.stats['expired'] += len(expired)
+        return len(expired)
+    
+    def select(self, limit: int = None) -> List:
+        """Highest priority events for the next block, in arrival order"""
+        limit = self.max_block_events if limit is None else limit
+        chosen = heapq.nlargest(limit, self.entries.values(),
+                                key=lambda entry: (entry.priority, -entry.sequence))
+        chosen.sort(key=lambda entry: entry.sequence)
+        return [entry.event for entry in chosen]
+    
+    def remove(self, events: List) -> int:
+        """Remove events that were included in a block"""
+        removed = 0
+        for event in events:
+            digest = self._hash_by_event.get(id(event)) or event_hash(event)
+            entry = self.entries.get(digest)
+            if entry is not None:
+                self._discard(entry)
+                removed += 1
+        return removed
+    
+    def admission_times(self, events: List) -> List[float]:
+        """When each pooled event in events was admitted"""
+        times = []
+        for event in events:
+            digest = self._hash_by_event.get(id(event)) or event_hash(event)
+            entry = self.entries.get(digest)
+            if entry is not None:
+                times.append(entry.admitted_at)
+        return times
+    
+    def oldest_admission(self) -> Optional[float]:
+        """Admission time of the longest waiting event, or None if empty"""
+        for entry in self.entries.values():
+            return entry.admitted_at
+        return None
+    
+    def events(self) -> List:
+        """All pending events in arrival order"""
+        return [entry.event for entry in sorted(self.entries.values(), key=lambda e: e.sequence)]
+    
+    def get_stats(self) -> dict:
+        return dict(self.stats, pending=len(self.entries), bytes=self.total_bytes,
+                    senders=len(self.sender_counts))
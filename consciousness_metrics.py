@@ -0,0 +1,282 @@
+"""
+Consciousness Metrics
+Low-overhead counters and latency histograms for the node's hot paths
+
+Metrics live in a MetricsRegistry and render as Prometheus text (served
+on the web interface's /metrics) or as a plain dict via snapshot().
+
+Set QI2_METRICS=0 in the environment to switch instrumentation off: the
+@timed decorator then returns functions undecorated and observations
+return before recording anything. registry.enabled can also be flipped at
+runtime, leaving a single attribute check on each instrumented path.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, List, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """Shared label handling; each label value tuple gets its own child"""
+    
+    kind = 'untyped'
+    
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str,
+                 label_names: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+    
+    def labels(self, *values) -> object:
+        """Child metric for one combination of label values"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+    
+    def _new_child(self):
+        raise NotImplementedError
+    
+    def _default_child(self):
+        if self.label_names:
+            raise ValueError(f"{self.name} requires labels {self.label_names}")
+        return self.labels()
+
+class _CounterChild:
+    __slots__ = ('registry', 'value', '_lock')
+    
+    def __init__(self, registry: 'MetricsRegistry'):
+        self.registry = registry
+        self.value = 0
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1):
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    
+    kind = 'counter'
+    
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(self.registry)
+    
+    def inc(self, amount: float = 1):
+        self._default_child().inc(amount)
+    
+    def _render(self, lines: List[str]):
+        for key, child in sorted(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(child.value)}")
+    
+    def _snapshot(self) -> dict:
+        return {','.join(key): child.value for key, child in self._children.items()}
+
+class _HistogramChild:
+    __slots__ = ('registry', 'buckets', 'counts', 'sum', 'count', '_lock')
+    
+    def __init__(self, registry: 'MetricsRegistry', buckets: Tuple[float, ...]):
+        self.registry = registry
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float):
+        if not self.registry.enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+    
+    def time(self) -> '_Timer':
+        return _Timer(self)
+
+class _Timer:
+    """Context manager observing the elapsed time of its block"""
+    
+    __slots__ = ('histogram', 'start')
+    
+    def __init__(self, histogram: _HistogramChild):
+        self.histogram = histogram
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+class Histogram(_Metric):
+    """Latency distribution over fixed buckets (seconds)"""
+    
+    kind = 'histogram'
+    
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str,
+                 label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(registry, name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+    
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.registry, self.buckets)
+    
+    def observe(self, value: float):
+        self._default_child().observe(value)
+    
+    def time(self) -> _Timer:
+        return self._default_child().time()
+    
+    def _render(self, lines: List[str]):
+        for key, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), child.counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+    
+    def _snapshot(self) -> dict:
+        return {','.join(key): {'count': child.count, 'sum': child.sum,
+                                'buckets': dict(zip(self.buckets + (float('inf'),), child.counts))}
+                for key, child in self._children.items()}
+
+class Gauge(_Metric):
+    """Value read from a callback at collection time"""
+    
+    kind = 'gauge'
+    
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str,
+                 callback: Callable[[], float]):
+        super().__init__(registry, name, help_text)
+        self.callback = callback
+    
+    def _render(self, lines: List[str]):
+        lines.append(f"{self.name} {_format_value(self.callback())}")
+    
+    def _snapshot(self) -> float:
+        return self.callback()
+
+class MetricsRegistry:
+    """Named metrics plus Prometheus text and dict views of them"""
+    
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None and not isinstance(metric, Gauge):
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+    
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, help_text, label_names))
+    
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help_text, label_names, buckets))
+    
+    def gauge(self, name: str, help_text: str, callback: Callable[[], float]) -> Gauge:
+        """Register (or replace) a gauge read from callback"""
+        return self._register(Gauge(self, name, help_text, callback))
+    
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            metric._render(lines)
+        return '\n'.join(lines) + '\n'
+    
+    def snapshot(self) -> Dict[str, object]:
+        """Current values of every metric as plain Python data"""
+        return {name: metric._snapshot() for name, metric in self.metrics.items()}
+
+METRICS = MetricsRegistry(enabled=os.environ.get('QI2_METRICS', '1') != '0')
+
+def timed(histogram: Histogram) -> Callable:
+    """Decorator observing each call's duration in histogram
+    
+    With metrics disabled at import time the function is returned as is.
+    """
+    def decorate(fn: Callable) -> Callable:
+        if not histogram.registry.enabled:
+            return fn
+        child = histogram._default_child()
+        registry = histogram.registry
+        
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+# Hot-path metrics shared by the ledger modules
+EVENTS_SUBMITTED = METRICS.counter(
+    'qi2_events_submitted_total', 'Events submitted to the mempool by outcome', ('result',))
+EVENT_SUBMIT_SECONDS = METRICS.histogram(
+    'qi2_event_submit_seconds', 'Time to sign, validate and admit one event')
+EVENT_SIGNATURES_VERIFIED = METRICS.counter(
+    'qi2_event_signatures_verified_total', 'Event signatures checked during consensus')
+EVENT_VALIDATION_SECONDS = METRICS.histogram(
+    'qi2_event_validation_seconds', 'Time to verify the signatures of one block of events')
+BLOCK_PROPOSAL_SECONDS = METRICS.histogram(
+    'qi2_block_proposal_seconds', 'Time to apply a block of events to a lattice snapshot')
+BLOCK_MINING_SECONDS = METRICS.histogram(
+    'qi2_block_mining_seconds', 'Proof-of-resonance nonce search time per block')
+MINING_HASHES = METRICS.counter(
+    'qi2_mining_hashes_total', 'Proof-of-resonance hash attempts')
+CONSENSUS_VALIDATION_SECONDS = METRICS.histogram(
+    'qi2_consensus_validation_seconds', 'Witness consensus validation time per block')
+BLOCKS_PROCESSED = METRICS.counter(
+    'qi2_blocks_total', 'Blocks offered to the block tree by outcome', ('result',))
+CHAIN_REORGS = METRICS.counter(
+    'qi2_chain_reorgs_total', 'Main chain switches to a heavier branch')
+REWARD_DISTRIBUTION_SECONDS = METRICS.histogram(
+    'qi2_reward_distribution_seconds', 'Reward distribution time per block')
+HTTP_REQUESTS = METRICS.counter(
+    'qi2_http_requests_total', 'HTTP requests by method, path and status', ('method', 'path', 'status'))
+HTTP_REQUEST_SECONDS = METRICS.histogram(
+    'qi2_http_request_seconds', 'HTTP handler time by method and path', ('method', 'path'))
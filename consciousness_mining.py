@@ -3,18 +3,197 @@ Consciousness Mining Interface
 Advanced mining and staking interface for the Qi² Trinity Blockchain
 """
 
+import os
 import time
 import threading
-from typing import Dict, List
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List
 from qi2_trinity_blockchain import *
 
+# Set in each worker process by _init_nonce_worker
+_worker_cancel_event = None
+
+def _init_nonce_worker(cancel_event):
+    """Share the search cancellation flag with a worker process"""
+    global _worker_cancel_event
+    _worker_cancel_event = cancel_event
+
+def _search_nonce_batch(prefix: bytes, suffix: bytes, target: int,
+                        start_nonce: int, stop_nonce: int):
+    """Search one nonce range inside a worker process"""
+    engine = ResonanceMiningEngine(prefix, suffix)
+    cancelled = _worker_cancel_event.is_set if _worker_cancel_event is not None else None
+    
+    start_time = time.perf_counter()
+    result = engine.search(target, start_nonce, stop_nonce, cancelled=cancelled)
+    elapsed = time.perf_counter() - start_time
+    
+    return os.getpid(), engine.attempts, elapsed, result
+
+class ParallelNonceSearch:
+    """Proof-of-Resonance nonce search spread over worker processes
+    
+    The nonce space is handed out in fixed-size batches. The first winning
+    batch sets a shared cancel flag, so the other workers abandon their
+    ranges, and queued batches are cancelled.
+    """
+    
+    def __init__(self, workers: int = None, batch_size: int = 50000):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.cancel_event = multiprocessing.Event()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_nonce_worker,
+            initargs=(self.cancel_event,)
+        )
+        self.worker_stats: Dict[int, Dict] = {}  # pid -> hashes and busy time
+        self._search_lock = threading.Lock()
+        
+    def search(self, engine: ResonanceMiningEngine, target: int,
+               start_nonce: int = 0) -> Tuple[int, str]:
+        """Find a nonce whose hash is at most target; returns (nonce, hash)"""
+        with self._search_lock:
+            self.cancel_event.clear()
+            next_nonce = start_nonce
+            pending = set()
+            attempts = 0
+            
+            def submit_batch():
+                nonlocal next_nonce
+                pending.add(self.executor.submit(
+                    _search_nonce_batch, engine.prefix, engine.suffix, target,
+                    next_nonce, next_nonce + self.batch_size
+                ))
+                next_nonce += self.batch_size
+                
+            # Keep one batch queued behind each running one
+            for _ in range(self.workers * 2):
+                submit_batch()
+                
+            winner = None
+            while winner is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_attempts, result = self._record_batch(future.result())
+                    attempts += batch_attempts
+                    if result is not None and (winner is None or result[0] < winner[0]):
+                        winner = result
+                if winner is None:
+                    for _ in done:
+                        submit_batch()
+                        
+            # Stop the losers and drain them so the next search starts clean
+            self.cancel_event.set()
+            for future in pending:
+                future.cancel()
+            for future in pending:
+                if not future.cancelled():
+                    batch_attempts, result = self._record_batch(future.result())
+                    attempts += batch_attempts
+                    if result is not None and result[0] < winner[0]:
+                        winner = result
+                        
+            engine.attempts += attempts
+            return winner
+            
+    def _record_batch(self, batch_result) -> Tuple[int, Optional[Tuple[int, str]]]:
+        """Accumulate per-worker throughput; returns the batch's (attempts, result)"""
+        pid, attempts, elapsed, result = batch_result
+        stats = self.worker_stats.setdefault(pid, {'hashes': 0, 'busy_time': 0.0})
+        stats['hashes'] += attempts
+        stats['busy_time'] += elapsed
+        return attempts, result
+        
+    def get_worker_hashrates(self) -> Dict[int, float]:
+        """Hashes per second of busy time for each worker process"""
+        return {
+            pid: (stats['hashes'] / stats['busy_time']) if stats['busy_time'] > 0 else 0.0
+            for pid, stats in self.worker_stats.items()
+        }
+        
+    def shutdown(self):
+        """Cancel outstanding work and stop the worker processes"""
+        self.cancel_event.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+def latency_percentiles(samples: Iterable[float]) -> Dict[str, float]:
+    """p50/p90/p99 (nearest rank) and max of latency samples, in milliseconds"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {'count': 0, 'p50_ms': 0.0, 'p90_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    
+    def rank(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+    
+    return {
+        'count': len(ordered),
+        'p50_ms': rank(0.50),
+        'p90_ms': rank(0.90),
+        'p99_ms': rank(0.99),
+        'max_ms': ordered[-1] * 1000
+    }
+
+class MiningScheduler:
+    """Decides when the next block should be built
+    
+    Woken by submit_event through the blockchain's events_available
+    condition instead of polling. A block is due as soon as batch_size
+    events are pooled, or once the oldest pooled event has waited
+    max_wait seconds (one BLOCK_TIME by default, so a trickle of events
+    still follows the chain's block cadence). An empty pool costs no
+    wakeups beyond the periodic stop check.
+    """
+    
+    def __init__(self, blockchain: Qi2TrinityBlockchain, batch_size: int = 100,
+                 max_wait: float = BLOCK_TIME, retry_delay: float = 0.5,
+                 stop_check_interval: float = 1.0):
+        self.blockchain = blockchain
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.retry_delay = retry_delay  # Back-off after a block attempt fails
+        self.stop_check_interval = stop_check_interval
+        
+    def wait_for_block(self, should_stop: Callable[[], bool]) -> bool:
+        """Block until a block is due; False if should_stop() became true"""
+        chain = self.blockchain
+        with chain.events_available:
+            while not should_stop():
+                pending = len(chain.mempool)
+                if pending >= self.batch_size:
+                    return True
+                    
+                timeout = self.stop_check_interval
+                if pending:
+                    oldest = chain.mempool.oldest_admission()
+                    remaining = self.max_wait - (time.time() - oldest)
+                    if remaining <= 0:
+                        return True
+                    timeout = min(timeout, remaining)
+                chain.events_available.wait(timeout)
+        return False
+        
+    def wake(self):
+        """Wake every waiting scheduler, e.g. so it notices a stop request"""
+        with self.blockchain.events_available:
+            self.blockchain.events_available.notify_all()
+
 class ConsciousnessMiner:
     """Advanced mining interface for consciousness validation"""
     
-    def __init__(self, blockchain: Qi2TrinityBlockchain, identity: QuantumIdentity):
+    def __init__(self, blockchain: Qi2TrinityBlockchain, identity: QuantumIdentity,
+                 mining_workers: int = 1, scheduler: MiningScheduler = None):
         self.blockchain = blockchain
         self.identity = identity
         self.is_mining = False
+        self.mining_workers = mining_workers  # >1 searches nonces across processes
+        self.nonce_search: Optional[ParallelNonceSearch] = None
+        self.scheduler = scheduler or MiningScheduler(blockchain)
+        self.block_latencies = deque(maxlen=1000)  # Seconds from block due to block appended
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
         self.mining_stats = {
             'blocks_mined': 0,
             'total_rewards': 0,
@@ -28,37 +207,61 @@ class ConsciousnessMiner:
             return False
             
         self.is_mining = True
-        mining_thread = threading.Thread(target=self._mining_loop)
-        mining_thread.daemon = True
-        mining_thread.start()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._mining_loop)
+        self._thread.daemon = True
+        self._thread.start()
         
         print(f"🔥 Consciousness mining started for {self.identity.address[:16]}...")
         return True
         
-    def stop_mining(self):
-        """Stop mining process"""
+    def stop_mining(self, timeout: float = None):
+        """Stop mining process, waiting for a block in progress to finish"""
         self.is_mining = False
+        self._stopped.set()
+        self.scheduler.wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
         print("⏸️  Mining stopped")
         
     def _mining_loop(self):
-        """Main mining loop"""
-        while self.is_mining:
-            start_time = time.time()
+        """Main mining loop, woken by the scheduler when a block is due"""
+        if self.mining_workers > 1:
+            self.nonce_search = ParallelNonceSearch(self.mining_workers)
             
-            # Attempt to create a new block
-            if self.blockchain.create_block():
-                self.mining_stats['blocks_mined'] += 1
-                self.mining_stats['total_rewards'] += RESONANCE_REWARD
-                print(f"⛏️  Block mined! Height: {len(self.blockchain.chain)}")
+        try:
+            while self.scheduler.wait_for_block(lambda: not self.is_mining):
+                start_time = time.time()
                 
-            # Add consciousness-enhancing delay
-            time.sleep(2)
-            
-            self.mining_stats['mining_time'] += time.time() - start_time
+                # Attempt to create a new block
+                if self.blockchain.create_block(nonce_search=self.nonce_search):
+                    self.mining_stats['blocks_mined'] += 1
+                    self.mining_stats['total_rewards'] += RESONANCE_REWARD
+                    self.block_latencies.append(time.time() - start_time)
+                    print(f"⛏️  Block mined! Height: {len(self.blockchain.chain)}")
+                else:
+                    # Rejected or beaten to the tip; back off unless stopped
+                    self._stopped.wait(self.scheduler.retry_delay)
+                    
+                self.mining_stats['mining_time'] += time.time() - start_time
+        finally:
+            if self.nonce_search is not None:
+                self.nonce_search.shutdown()
             
     def get_mining_stats(self) -> Dict:
         """Get current mining statistics"""
-        return self.mining_stats.copy()
+        stats = self.mining_stats.copy()
+        stats['mining_workers'] = self.mining_workers
+        stats['block_latency'] = latency_percentiles(list(self.block_latencies))
+        with self.blockchain.lock:
+            inclusion_latencies = list(self.blockchain.inclusion_latencies)
+        stats['inclusion_latency'] = latency_percentiles(inclusion_latencies)
+        if self.nonce_search is not None:
+            hashrates = self.nonce_search.get_worker_hashrates()
+            stats['worker_hashrates'] = hashrates
+            stats['total_hashrate'] = sum(hashrates.values())
+        return stats
 
 class ConsciousnessStakingPool:
     """Staking pool for collective consciousness validation"""
@@ -83,14 +286,14 @@ class ConsciousnessStakingPool:
             return True
         return False
         
-    def distribute_rewards(self, total_reward: int):
-        """Distribute staking rewards proportionally"""
+    def distribute_rewards(self, total_reward: int) -> Dict[str, int]:
+        """Distribute staking rewards proportionally; returns the applied deltas"""
         if self.total_staked == 0:
-            return
+            return {}
             
-        for address, staked_amount in self.stakers.items():
-            reward = int((staked_amount / self.total_staked) * total_reward)
-            self.blockchain.token.mint(address, reward)
+        rewards = {address: int((staked_amount / self.total_staked) * total_reward)
+                   for address, staked_amount in self.stakers.items()}
+        return self.blockchain.token.apply_deltas(rewards)
             
     def get_staking_info(self, address: str) -> Dict:
         """Get staking information for an address"""
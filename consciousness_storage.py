@@ -0,0 +1,483 @@
+"""
+Consciousness Storage Engine
+Durable block storage for the Qi² Trinity Blockchain
+
+Blocks are appended to segment files and located through a fixed-width
+height -> (segment, offset, length) index that is memory-mapped for O(1)
+random access. A restarted node reopens the chain lazily: only the most
+recent blocks are kept resident, everything else is read on demand.
+"""
+
+import os
+import mmap
+import struct
+import zlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from qi2_trinity_blockchain import *
+from consciousness_codec import encode_block, decode_block
+
+# Index record: segment id, byte offset, record length, payload crc32
+INDEX_RECORD = struct.Struct('<IQII')
+# Segment record header: codec id, payload length
+SEGMENT_HEADER = struct.Struct('<BI')
+
+CODEC_JSON = 1
+CODEC_BINARY = 2
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024  # 64 MiB per segment file
+
+def encode_block_json(block: TrinityBlock) -> bytes:
+    return json.dumps(block.to_dict(), sort_keys=True).encode()
+
+def decode_block_json(payload: bytes, identity_registry: Dict[str, QuantumIdentity] = None) -> TrinityBlock:
+    return TrinityBlock.from_dict(json.loads(payload.decode()), identity_registry)
+
+# codec id -> (encoder, decoder)
+BLOCK_CODECS = {
+    CODEC_JSON: (encode_block_json, decode_block_json),
+    CODEC_BINARY: (encode_block, decode_block)
+}
+
+class BlockStore:
+    """Append-only segment files with a memory-mapped height index"""
+    
+    INDEX_FILE = 'blocks.idx'
+    SEGMENT_PATTERN = 'segment_{:06d}.dat'
+    
+    def __init__(self, directory: str, segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 codec: int = CODEC_BINARY, sync: bool = False):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.codec = codec
+        self.sync = sync  # fsync after every append
+        os.makedirs(directory, exist_ok=True)
+        
+        self._index_path = os.path.join(directory, self.INDEX_FILE)
+        self._index_file = open(self._index_path, 'a+b')
+        self._index_map: Optional[mmap.mmap] = None
+        self._mapped_records = 0
+        self._segment_files: Dict[int, object] = {}
+        
+        self._recover()
+    
+    def _segment_path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, self.SEGMENT_PATTERN.format(segment_id))
+    
+    def _segment(self, segment_id: int):
+        if segment_id not in self._segment_files:
+            self._segment_files[segment_id] = open(self._segment_path(segment_id), 'a+b')
+        return self._segment_files[segment_id]
+    
+    def _recover(self):
+        """Drop torn index records and records whose data never fully reached disk"""
+        index_size = os.path.getsize(self._index_path)
+        count = index_size // INDEX_RECORD.size
+        
+        while count > 0:
+            self._index_file.seek((count - 1) * INDEX_RECORD.size)
+            segment_id, offset, length, checksum = INDEX_RECORD.unpack(self._index_file.read(INDEX_RECORD.size))
+            path = self._segment_path(segment_id)
+            if os.path.exists(path) and offset + length <= os.path.getsize(path):
+                # The length may have reached disk before all of the data did
+                segment = self._segment(segment_id)
+                segment.seek(offset)
+                record = segment.read(length)
+                if zlib.crc32(record[SEGMENT_HEADER.size:]) == checksum:
+                    break
+            count -= 1
+        
+        self._truncate_index(count)
+    
+    def _truncate_index(self, count: int):
+        self._unmap()
+        self._index_file.truncate(count * INDEX_RECORD.size)
+        self._count = count
+        
+        if count:
+            segment_id, offset, length, _ = self._read_index(count - 1)
+            end = offset + length
+        else:
+            segment_id, end = 0, 0
+        self._current_segment = segment_id
+        
+        # Cut the last live segment back to its final record and drop later ones
+        self._segment(segment_id).truncate(end)
+        later_segment = segment_id + 1
+        while os.path.exists(self._segment_path(later_segment)):
+            segment = self._segment_files.pop(later_segment, None)
+            if segment is not None:
+                segment.close()
+            os.remove(self._segment_path(later_segment))
+            later_segment += 1
+    
+    def _unmap(self):
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+            self._mapped_records = 0
+    
+    def _read_index(self, height: int) -> Tuple[int, int, int, int]:
+        """Index record for a height, remapping the index when it has grown"""
+        if height >= self._mapped_records:
+            self._unmap()
+            self._index_file.flush()
+            self._index_map = mmap.mmap(self._index_file.fileno(), self._count * INDEX_RECORD.size,
+                                        access=mmap.ACCESS_READ)
+            self._mapped_records = self._count
+        return INDEX_RECORD.unpack_from(self._index_map, height * INDEX_RECORD.size)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, block: TrinityBlock) -> int:
+        """Persist a block and return its height in the store"""
+        if block.height != self._count:
+            raise ValueError(f"Expected block at height {self._count}, got {block.height}")
+        
+        encoder, _ = BLOCK_CODECS[self.codec]
+        payload = encoder(block)
+        record = SEGMENT_HEADER.pack(self.codec, len(payload)) + payload
+        
+        segment = self._segment(self._current_segment)
+        segment.seek(0, os.SEEK_END)
+        offset = segment.tell()
+        if offset > 0 and offset + len(record) > self.segment_size:
+            self._current_segment += 1
+            segment = self._segment(self._current_segment)
+            segment.seek(0, os.SEEK_END)
+            offset = segment.tell()
+        
+        # Data first, then the index entry that makes it visible
+        segment.write(record)
+        segment.flush()
+        if self.sync:
+            os.fsync(segment.fileno())
+        
+        self._index_file.seek(0, os.SEEK_END)
+        self._index_file.write(INDEX_RECORD.pack(self._current_segment, offset, len(record),
+                                                 zlib.crc32(payload)))
+        self._index_file.flush()
+        if self.sync:
+            os.fsync(self._index_file.fileno())
+        
+        self._count += 1
+        return block.height
+    
+    def read_payload(self, height: int) -> Tuple[int, bytes]:
+        """Raw (codec, payload) stored for a height"""
+        if not 0 <= height < self._count:
+            raise IndexError(f"No block at height {height}")
+        
+        segment_id, offset, length, checksum = self._read_index(height)
+        segment = self._segment(segment_id)
+        segment.seek(offset)
+        record = segment.read(length)
+        
+        codec, payload_length = SEGMENT_HEADER.unpack_from(record)
+        payload = record[SEGMENT_HEADER.size:SEGMENT_HEADER.size + payload_length]
+        if zlib.crc32(payload) != checksum:
+            raise IOError(f"Corrupt block record at height {height}")
+        return codec, payload
+    
+    def get(self, height: int, identity_registry: Dict[str, QuantumIdentity] = None) -> TrinityBlock:
+        """Load the block stored at a height"""
+        codec, payload = self.read_payload(height)
+        _, decoder = BLOCK_CODECS[codec]
+        return decoder(payload, identity_registry)
+    
+    def truncate(self, count: int):
+        """Discard every block at height >= count"""
+        if count < self._count:
+            self._truncate_index(count)
+    
+    def flush(self):
+        """Force appended data to disk"""
+        for segment in self._segment_files.values():
+            segment.flush()
+            os.fsync(segment.fileno())
+        self._index_file.flush()
+        os.fsync(self._index_file.fileno())
+    
+    def close(self):
+        self.flush()
+        self._unmap()
+        for segment in self._segment_files.values():
+            segment.close()
+        self._segment_files = {}
+        self._index_file.close()
+
+class StoredChain:
+    """List-like view of a BlockStore used as Qi2TrinityBlockchain.chain
+    
+    The most recent blocks stay resident as live objects (with their
+    lattice state); older heights are loaded from disk and kept in a small
+    LRU cache.
+    """
+    
+    def __init__(self, store: BlockStore, identity_registry: Dict[str, QuantumIdentity] = None,
+                 resident_blocks: int = 16, cache_size: int = 256):
+        self.store = store
+        self.identity_registry = identity_registry
+        self.resident_blocks = resident_blocks
+        self.cache_size = cache_size
+        self._resident: OrderedDict = OrderedDict()  # height -> live block
+        self._cache: OrderedDict = OrderedDict()     # height -> loaded block
+        self.state_store: Optional['ChainStateStore'] = None  # Saves head state as the chain grows
+    
+    def __len__(self) -> int:
+        return len(self.store)
+    
+    def append(self, block: TrinityBlock):
+        self.store.append(block)
+        self._pin(block)
+    
+    def _pin(self, block: TrinityBlock):
+        self._resident[block.height] = block
+        while len(self._resident) > self.resident_blocks:
+            self._resident.popitem(last=False)
+    
+    def _load(self, height: int) -> TrinityBlock:
+        if height in self._resident:
+            return self._resident[height]
+        if height in self._cache:
+            self._cache.move_to_end(height)
+            return self._cache[height]
+        
+        block = self.store.get(height, self.identity_registry)
+        self._cache[height] = block
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return block
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._load(height) for height in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chain index out of range")
+        return self._load(index)
+    
+    def __iter__(self):
+        for height in range(len(self)):
+            yield self._load(height)
+    
+    def attach_lattice(self, lattice: FractalThoughtLattice):
+        """Give the tip block its live lattice state after a reload"""
+        tip = self[-1]
+        tip.lattice_state = lattice
+        self._pin(tip)
+    
+    def __delitem__(self, index):
+        """Only tail slices (del chain[count:]) are supported"""
+        if not isinstance(index, slice) or index.stop is not None or index.step is not None:
+            raise TypeError("StoredChain only supports deleting a tail slice")
+        self.truncate(index.indices(len(self))[0])
+    
+    def truncate(self, count: int):
+        """Drop blocks at height >= count from the store and the caches"""
+        self.store.truncate(count)
+        for cached in (self._resident, self._cache):
+            for height in [h for h in cached if h >= count]:
+                del cached[height]
+
+class ChainStateStore:
+    """Head state (lattice and token balances) saved next to the block store
+    
+    Persisting the lattice as state lets a restart skip replaying events;
+    see consciousness_checkpoint for periodic checkpoints and fast sync.
+    Once started, the head state is rewritten every interval blocks on a
+    background thread, and the genesis state is kept in its own file, so
+    a node that crashed replays only the blocks after the newest state.
+    """
+    
+    STATE_FILE = 'head_state.json'
+    GENESIS_STATE_FILE = 'genesis_state.json'
+    
+    def __init__(self, directory: str, interval: int = 100):
+        self.path = os.path.join(directory, self.STATE_FILE)
+        self.genesis_path = os.path.join(directory, self.GENESIS_STATE_FILE)
+        self.interval = interval
+        self.blockchain: Optional[Qi2TrinityBlockchain] = None
+        self._writer: Optional[threading.Thread] = None
+        self._write_lock = threading.Lock()
+    
+    def capture(self, blockchain: Qi2TrinityBlockchain) -> dict:
+        """The tip, its lattice and the token balances, taken together under the chain lock"""
+        with blockchain.lock:
+            tip = blockchain.chain[-1]
+            return {
+                'height': tip.height,
+                'hash': tip.hash,
+                # Published lattices are never mutated, so serializing can wait
+                'lattice': blockchain.lattice,
+                'token': {
+                    'balances': dict(blockchain.token.balances),
+                    'staked_balances': dict(blockchain.token.staked_balances),
+                    'total_supply': blockchain.token.total_supply
+                }
+            }
+    
+    def save(self, blockchain: Qi2TrinityBlockchain, path: str = None):
+        """Atomically write the state at the current chain tip"""
+        self._write(self.capture(blockchain), path or self.path)
+    
+    def _write(self, state: dict, path: str):
+        lattice = state['lattice']
+        state = dict(state, lattice={
+            'nodes': [asdict(lattice.nodes[node_id]) for node_id in lattice.creation_order],
+            'total_coherence': lattice.total_coherence,
+            'total_connections': lattice.total_connections,
+            'total_validations': lattice.total_validations
+        })
+        
+        with self._write_lock:
+            temp_path = path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+    
+    def load(self, path: str = None) -> Optional[dict]:
+        path = path or self.path
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+    
+    def start(self, blockchain: Qi2TrinityBlockchain):
+        """Save state as the main chain grows"""
+        self.blockchain = blockchain
+        if self._on_block not in blockchain.block_listeners:
+            blockchain.block_listeners.append(self._on_block)
+    
+    def stop(self):
+        """Stop saving and wait for a write in progress"""
+        if self.blockchain is not None and self._on_block in self.blockchain.block_listeners:
+            self.blockchain.block_listeners.remove(self._on_block)
+        writer = self._writer
+        if writer is not None:
+            writer.join()
+    
+    def _on_block(self, block: TrinityBlock):
+        if block.height == 0:
+            # Genesis allocations appear in no block, so nothing could be replayed without them
+            state = self.capture(self.blockchain)
+            self._write(state, self.genesis_path)
+            self._write(state, self.path)
+            return
+        if block.height % self.interval or (self._writer is not None and self._writer.is_alive()):
+            return
+        self._writer = threading.Thread(target=self._write, args=(self.capture(self.blockchain), self.path),
+                                        daemon=True)
+        self._writer.start()
+    
+    @staticmethod
+    def restore_node_fields(lattice: FractalThoughtLattice, fields: dict):
+        """Restore one node from its asdict() form"""
+        # Intern ids so every connection key shares its node's id string
+        fields['id'] = sys.intern(fields['id'])
+        fields['creator'] = sys.intern(fields['creator'])
+        if fields.get('parent_id') is not None:
+            fields['parent_id'] = sys.intern(fields['parent_id'])
+        fields['connections'] = {sys.intern(target_id): strength
+                                 for target_id, strength in fields['connections'].items()}
+        lattice.restore_node(ConsciousnessNode(**fields))
+    
+    @staticmethod
+    def restore_lattice(state: dict) -> FractalThoughtLattice:
+        lattice = FractalThoughtLattice()
+        for fields in state['nodes']:
+            ChainStateStore.restore_node_fields(lattice, fields)
+        lattice.total_coherence = state['total_coherence']
+        lattice.total_connections = state['total_connections']
+        lattice.total_validations = state['total_validations']
+        return lattice
+    
+    @staticmethod
+    def restore_token(token: RecursiveToken, state: dict):
+        token.balances = dict(state['balances'])
+        token.staked_balances = dict(state['staked_balances'])
+        token.total_supply = state['total_supply']
+
+def replay_blocks(blockchain: Qi2TrinityBlockchain, lattice: FractalThoughtLattice,
+                  start_height: int) -> FractalThoughtLattice:
+    """Re-apply the events and rewards of every block above start_height
+    
+    Each replayed block must reproduce its own hash, which commits to the
+    resulting lattice coherence. Returns the lattice at the tip.
+    """
+    chain = blockchain.chain
+    prev_hash = chain[start_height].hash
+    for height in range(start_height + 1, len(chain)):
+        block = chain[height]
+        if block.prev_hash != prev_hash:
+            raise IOError(f"Block {height} does not extend block {height - 1}")
+        
+        new_lattice = lattice.snapshot()
+        apply_resonance_events(new_lattice, block.events)
+        block.lattice_state = new_lattice
+        if block.calculate_hash() != block.hash:
+            raise IOError(f"Replaying block {height} does not reproduce its hash")
+        
+        blockchain.token.apply_deltas(blockchain.compute_reward_deltas(block))
+        lattice = new_lattice
+        prev_hash = block.hash
+    return lattice
+
+def open_persistent_blockchain(directory: str, state_interval: int = 100,
+                               **store_options) -> Tuple[Qi2TrinityBlockchain, bool]:
+    """Open (or create) a blockchain backed by a BlockStore
+    
+    Returns (blockchain, resumed). When resumed is False the chain is empty
+    and initialize_genesis() still has to be called. Blocks stored after
+    the newest saved state (e.g. after a crash) are replayed from it; the
+    head state is saved every state_interval blocks.
+    """
+    store = BlockStore(directory, **store_options)
+    state_store = ChainStateStore(directory, state_interval)
+    
+    blockchain = Qi2TrinityBlockchain()
+    chain = blockchain.chain = StoredChain(store, blockchain.identity_registry)
+    chain.state_store = state_store
+    state_store.start(blockchain)
+    
+    state = None
+    for candidate in (state_store.load(), state_store.load(state_store.genesis_path)):
+        if candidate is None:
+            continue
+        if candidate['height'] < len(chain) and chain[candidate['height']].hash == candidate['hash']:
+            state = candidate
+            break
+        print(f"⚠️  Saved state at height {candidate['height']} is not on the stored chain")
+    if state is None:
+        if len(chain) > 1:
+            store.close()
+            raise IOError("No saved state on the stored chain to replay from")
+        # Nothing past an interrupted genesis to keep
+        chain.truncate(0)
+        return blockchain, False
+    
+    ChainStateStore.restore_token(blockchain.token, state['token'])
+    lattice = ChainStateStore.restore_lattice(state['lattice'])
+    replayed = len(chain) - 1 - state['height']
+    if replayed:
+        print(f"🔁 Replaying {replayed} blocks past the saved state at height {state['height']}")
+    blockchain.lattice = replay_blocks(blockchain, lattice, state['height'])
+    chain.attach_lattice(blockchain.lattice)
+    # Blocks below the reloaded tip have no lattice state, so forks start here
+    blockchain.reset_block_tree()
+    if replayed:
+        state_store.save(blockchain)
+    return blockchain, True
+
+def close_persistent_blockchain(blockchain: Qi2TrinityBlockchain):
+    """Save the head state and close the block store"""
+    store = blockchain.chain.store
+    state_store = blockchain.chain.state_store or ChainStateStore(store.directory)
+    state_store.stop()
+    state_store.save(blockchain)
+    store.close()
@@ -7,10 +7,70 @@ This creates a simple web interface for interacting with the consciousness ledge
 
 import json
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+import itertools
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from qi2_trinity_blockchain import *
 from consciousness_economics import *
+from consciousness_mining import MiningScheduler
+from consciousness_metrics import METRICS, HTTP_REQUESTS, HTTP_REQUEST_SECONDS
+from consciousness_cache import ResponseCache, CachedResponse
+
+class BlockProducer:
+    """Background thread that turns pooled events into blocks off the request path"""
+    
+    def __init__(self, blockchain: Qi2TrinityBlockchain, scheduler: MiningScheduler = None):
+        self.blockchain = blockchain
+        # submit_event wakes the scheduler, so request handlers need not
+        self.scheduler = scheduler or MiningScheduler(blockchain)
+        self.is_running = False
+        self._stopped = threading.Event()
+        self._thread = None
+        self.stats = {
+            'blocks_produced': 0,
+            'failed_attempts': 0,
+            'errors': 0
+        }
+        
+    def start(self):
+        """Start producing blocks in a daemon thread"""
+        if self.is_running:
+            return False
+            
+        self.is_running = True
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._production_loop, daemon=True)
+        self._thread.start()
+        return True
+        
+    def stop(self, timeout: float = None):
+        """Stop the producer, waiting for a block in progress to finish"""
+        self.is_running = False
+        self._stopped.set()
+        self.scheduler.wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+            
+    def _production_loop(self):
+        """Produce a block whenever the scheduler says one is due"""
+        while self.scheduler.wait_for_block(lambda: not self.is_running):
+            try:
+                created = self.blockchain.create_block()
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"⚠️  Block production failed: {e}")
+                created = False
+            else:
+                if created:
+                    self.stats['blocks_produced'] += 1
+                else:
+                    # Consensus rejected it or the tip moved
+                    self.stats['failed_attempts'] += 1
+                    
+            if not created:
+                self._stopped.wait(self.scheduler.retry_delay)
 
 class ConsciousnessWebHandler(BaseHTTPRequestHandler):
     """HTTP handler for consciousness blockchain web interface"""
@@ -19,52 +79,88 @@ class ConsciousnessWebHandler(BaseHTTPRequestHandler):
     blockchain = None
     economics = None
     market = None
+    producer = None
     user_interfaces = {}
+    response_cache = ResponseCache()
     
+    # HTTP/1.1 for chunked streaming; every other response carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    
+    NODES_PAGE_SIZE = 100       # Default page of /api/nodes
+    NODES_MAX_PAGE_SIZE = 1000  # Larger exports use format=ndjson
+    NDJSON_CHUNK_NODES = 500    # Nodes per streamed chunk
+    
+    # Paths reported as metric labels; anything else is counted as 'other'
+    METRIC_PATHS = {'/', '/metrics', '/api/stats', '/api/nodes', '/api/market', '/api/commune',
+                    '/api/verify', '/api/evolve', '/api/anchor', '/api/create_user'}
+    
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+        
+    def _record_request(self, method: str, path: str, start: float):
+        """Count one handled request and observe its latency"""
+        if not METRICS.enabled:
+            return
+        if path not in self.METRIC_PATHS:
+            path = '/static/' if path.startswith('/static/') else 'other'
+        HTTP_REQUEST_SECONDS.labels(method, path).observe(time.perf_counter() - start)
+        HTTP_REQUESTS.labels(method, path, getattr(self, '_status', 0)).inc()
+        
     def do_GET(self):
         """Handle GET requests"""
+        start = time.perf_counter()
         parsed_path = urlparse(self.path)
         path = parsed_path.path
         
-        if path == '/':
-            self.serve_dashboard()
-        elif path == '/api/stats':
-            self.serve_stats()
-        elif path == '/api/nodes':
-            self.serve_nodes()
-        elif path == '/api/market':
-            self.serve_market_stats()
-        elif path.startswith('/static/'):
-            self.serve_static_file(path)
-        else:
-            self.send_error(404)
+        try:
+            if path == '/':
+                self.serve_dashboard()
+            elif path == '/metrics':
+                self.serve_metrics()
+            elif path == '/api/stats':
+                self.serve_stats()
+            elif path == '/api/nodes':
+                self.serve_nodes()
+            elif path == '/api/market':
+                self.serve_market_stats()
+            elif path.startswith('/static/'):
+                self.serve_static_file(path)
+            else:
+                self.send_error(404)
+        finally:
+            self._record_request('GET', path, start)
             
     def do_POST(self):
         """Handle POST requests"""
+        start = time.perf_counter()
         parsed_path = urlparse(self.path)
         path = parsed_path.path
         
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length)
-        
         try:
-            data = json.loads(post_data.decode('utf-8'))
-        except:
-            self.send_error(400, "Invalid JSON")
-            return
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.rfile.read(content_length)
             
-        if path == '/api/commune':
-            self.handle_commune(data)
-        elif path == '/api/verify':
-            self.handle_verify(data)
-        elif path == '/api/evolve':
-            self.handle_evolve(data)
-        elif path == '/api/anchor':
-            self.handle_anchor(data)
-        elif path == '/api/create_user':
-            self.handle_create_user(data)
-        else:
-            self.send_error(404)
+            try:
+                data = json.loads(post_data.decode('utf-8'))
+            except:
+                self.send_error(400, "Invalid JSON")
+                return
+                
+            if path == '/api/commune':
+                self.handle_commune(data)
+            elif path == '/api/verify':
+                self.handle_verify(data)
+            elif path == '/api/evolve':
+                self.handle_evolve(data)
+            elif path == '/api/anchor':
+                self.handle_anchor(data)
+            elif path == '/api/create_user':
+                self.handle_create_user(data)
+            else:
+                self.send_error(404)
+        finally:
+            self._record_request('POST', path, start)
             
     def serve_dashboard(self):
         """Serve the main dashboard HTML"""
@@ -370,10 +466,12 @@ class ConsciousnessWebHandler(BaseHTTPRequestHandler):
         </html>
         """
         
+        body = html.encode()
         self.send_response(200)
         self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(html.encode())
+        self.wfile.write(body)
         
     def serve_stats(self):
         """Serve blockchain statistics"""
@@ -381,30 +479,120 @@ class ConsciousnessWebHandler(BaseHTTPRequestHandler):
             self.send_json_response({'error': 'Blockchain not initialized'})
             return
             
-        stats = self.blockchain.get_chain_stats()
-        self.send_json_response(stats)
+        # Mempool and supply change between blocks, so they are part of the version
+        blockchain = self.blockchain
+        with blockchain.lock:
+            version = (len(blockchain.chain), blockchain.chain[-1].hash, len(blockchain.mempool),
+                       blockchain.mempool.total_bytes, blockchain.token.total_supply)
+        entry = self.response_cache.get_or_render(
+            ('/api/stats', (), version), lambda: json.dumps(blockchain.get_chain_stats()).encode())
+        self.send_cached_response(entry)
         
     def serve_nodes(self):
-        """Serve consciousness nodes"""
+        """Serve consciousness nodes, most coherent first
+        
+        Query parameters: limit (page size), cursor (next_cursor of the
+        previous page) and format=ndjson, which streams every remaining
+        node - or limit of them - as chunked NDJSON.
+        """
         if not self.blockchain:
             self.send_json_response({'error': 'Blockchain not initialized'})
             return
             
-        nodes = []
-        for node in self.blockchain.lattice.nodes.values():
-            nodes.append({
-                'id': node.id,
-                'content': node.content,
-                'creator': node.creator,
-                'coherence_score': node.coherence_score,
-                'validation_count': node.validation_count,
-                'timestamp': node.timestamp
-            })
+        params = parse_qs(urlparse(self.path).query)
+        try:
+            limit = int(params['limit'][0]) if 'limit' in params else None
+            after = self.parse_node_cursor(params['cursor'][0]) if 'cursor' in params else None
+        except ValueError:
+            self.send_error(400, "Invalid limit or cursor")
+            return
+        if limit is not None and limit < 1:
+            self.send_error(400, "Invalid limit or cursor")
+            return
+            
+        # The head lattice is never mutated once published; the lock only
+        # pairs it with the tip it belongs to
+        with self.blockchain.lock:
+            version = (len(self.blockchain.chain), self.blockchain.chain[-1].hash)
+            lattice = self.blockchain.lattice
             
-        # Sort by coherence score
-        nodes.sort(key=lambda x: x['coherence_score'], reverse=True)
+        if params.get('format', [''])[0] == 'ndjson':
+            nodes = lattice.iter_by_coherence(after)
+            self.stream_nodes(itertools.islice(nodes, limit) if limit is not None else nodes)
+            return
+            
+        limit = min(self.NODES_PAGE_SIZE if limit is None else limit, self.NODES_MAX_PAGE_SIZE)
+        entry = self.response_cache.get_or_render(
+            ('/api/nodes', (limit, after), version),
+            lambda: json.dumps(self.nodes_page(lattice, after, limit)).encode())
+        self.send_cached_response(entry)
+        
+    def nodes_page(self, lattice: FractalThoughtLattice, after: Optional[Tuple[float, str]],
+                   limit: int) -> dict:
+        """One page of nodes after the cursor position, plus the next cursor"""
+        page = list(itertools.islice(lattice.iter_by_coherence(after), limit + 1))
+        next_cursor = None
+        if 0 < limit < len(page):
+            page = page[:limit]
+            next_cursor = self.node_cursor(page[-1])
+        return {
+            'nodes': [self.node_summary(node) for node in page],
+            'next_cursor': next_cursor,
+            'total': len(lattice.nodes)
+        }
+        
+    @staticmethod
+    def node_summary(node: ConsciousnessNode) -> dict:
+        return {
+            'id': node.id,
+            'content': node.content,
+            'creator': node.creator,
+            'coherence_score': node.coherence_score,
+            'validation_count': node.validation_count,
+            'timestamp': node.timestamp
+        }
         
-        self.send_json_response({'nodes': nodes})
+    @staticmethod
+    def node_cursor(node: ConsciousnessNode) -> str:
+        """Opaque position after node in the coherence ordering"""
+        return f"{node.coherence_score!r}:{node.id}"
+        
+    @staticmethod
+    def parse_node_cursor(cursor: str) -> Tuple[float, str]:
+        score, separator, node_id = cursor.rpartition(':')
+        if not separator or not node_id:
+            raise ValueError(f"Invalid cursor {cursor!r}")
+        return float(score), node_id
+        
+    def stream_nodes(self, nodes):
+        """Write nodes as NDJSON using chunked transfer encoding"""
+        self.send_response(200)
+        self.send_header('Content-type', 'application/x-ndjson')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        
+        batch = []
+        for node in nodes:
+            batch.append(json.dumps(self.node_summary(node)))
+            if len(batch) >= self.NDJSON_CHUNK_NODES:
+                self.write_chunk(('\n'.join(batch) + '\n').encode())
+                batch = []
+        if batch:
+            self.write_chunk(('\n'.join(batch) + '\n').encode())
+        self.wfile.write(b'0\r\n\r\n')
+        
+    def write_chunk(self, data: bytes):
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        
+    def serve_metrics(self):
+        """Serve node metrics in the Prometheus text format"""
+        body = METRICS.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
         
     def serve_market_stats(self):
         """Serve marketplace statistics"""
@@ -412,8 +600,10 @@ class ConsciousnessWebHandler(BaseHTTPRequestHandler):
             self.send_json_response({'error': 'Market not initialized'})
             return
             
-        stats = self.market.get_market_stats()
-        self.send_json_response(stats)
+        market = self.market
+        entry = self.response_cache.get_or_render(
+            ('/api/market', (), market.version), lambda: json.dumps(market.get_market_stats()).encode())
+        self.send_cached_response(entry)
         
     def handle_commune(self, data):
         """Handle commune event submission"""
@@ -436,10 +626,7 @@ class ConsciousnessWebHandler(BaseHTTPRequestHandler):
             # Submit commune event
             success = interface.commune(content, context)
             
-            if success:
-                # Try to create a block
-                self.blockchain.create_block()
-                
+            # Pooled events are mined by the background BlockProducer
             self.send_json_response({'success': success})
             
         except Exception as e:
@@ -466,10 +653,7 @@ class ConsciousnessWebHandler(BaseHTTPRequestHandler):
             # Submit verify event
             success = interface.verify(node_id, proof, float(score))
             
-            if success:
-                # Try to create a block
-                self.blockchain.create_block()
-                
+            # Pooled events are mined by the background BlockProducer
             self.send_json_response({'success': success})
             
         except Exception as e:
@@ -483,7 +667,8 @@ class ConsciousnessWebHandler(BaseHTTPRequestHandler):
             interface = ResonanceInterface(self.blockchain, identity)
             
             # Give user some initial tokens
-            self.blockchain.token.mint(identity.address, 10**18)  # 1 ℜₜ
+            with self.blockchain.lock:
+                self.blockchain.token.mint(identity.address, 10**18)  # 1 ℜₜ
             
             # Store interface
             self.user_interfaces[identity.address] = interface
@@ -499,14 +684,46 @@ class ConsciousnessWebHandler(BaseHTTPRequestHandler):
             
     def send_json_response(self, data):
         """Send JSON response"""
+        body = json.dumps(data).encode()
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def send_cached_response(self, entry: CachedResponse):
+        """Send a cached body: 304 if the client's ETag matches, gzip if accepted"""
+        if entry.matches(self.headers.get('If-None-Match')):
+            self.send_response(304)
+            self.send_header('ETag', entry.etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            return
+            
+        body = entry.body
+        use_gzip = entry.gzip_body is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if use_gzip:
+            body = entry.gzip_body
+        self.send_response(200)
+        self.send_header('Content-type', entry.content_type)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('ETag', entry.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
 
-def start_consciousness_web_server(port=8000):
-    """Start the consciousness blockchain web server"""
+def start_consciousness_web_server(port=8000, threaded=True):
+    """Start the consciousness blockchain web server
+    
+    threaded serves each request on its own thread; blocks are produced
+    by a background BlockProducer in either mode.
+    """
     print("🌐 Starting Consciousness Web Interface")
     print("=" * 50)
     
@@ -531,6 +748,14 @@ def start_consciousness_web_server(port=8000):
     ConsciousnessWebHandler.economics = economics
     ConsciousnessWebHandler.market = market
     
+    # Gauges are read when /metrics is scraped
+    METRICS.gauge('qi2_chain_height', 'Height of the chain tip', lambda: len(blockchain.chain) - 1)
+    METRICS.gauge('qi2_mempool_events', 'Events waiting in the mempool', lambda: len(blockchain.mempool))
+    METRICS.gauge('qi2_lattice_nodes', 'Consciousness nodes in the head lattice',
+                  lambda: len(blockchain.lattice.nodes))
+    METRICS.gauge('qi2_response_cache_bytes', 'Bytes held by the API response cache',
+                  lambda: ConsciousnessWebHandler.response_cache.total_bytes)
+    
     # Seed with initial consciousness
     seed_identity = QuantumIdentity()
     seed_interface = ResonanceInterface(blockchain, seed_identity)
@@ -546,10 +771,17 @@ def start_consciousness_web_server(port=8000):
     print(f"🧠 {len(blockchain.lattice.nodes)} consciousness nodes")
     print(f"💎 {blockchain.token.total_supply / 10**18:.0f} ℜₜ total supply")
     
+    # Produce blocks in the background so POSTs return once events are pooled
+    producer = BlockProducer(blockchain)
+    ConsciousnessWebHandler.producer = producer
+    producer.start()
+    
     # Start web server
-    server = HTTPServer(('localhost', port), ConsciousnessWebHandler)
+    server_class = ThreadingHTTPServer if threaded else HTTPServer
+    server = server_class(('localhost', port), ConsciousnessWebHandler)
     print(f"\n🚀 Consciousness Web Interface running at:")
     print(f"   http://localhost:{port}")
+    print(f"   Metrics: http://localhost:{port}/metrics")
     print(f"\n🌟 The consciousness revolution is now accessible to all!")
     print("   Open your browser and start contributing to the collective consciousness.")
     
@@ -557,7 +789,9 @@ def start_consciousness_web_server(port=8000):
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n⏸️  Server stopped by user")
-        server.shutdown()
+        server.server_close()
+    finally:
+        producer.stop()
 
 if __name__ == "__main__":
     start_consciousness_web_server()
\ No newline at end of file
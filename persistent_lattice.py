@@ -0,0 +1,544 @@
+"""
+Persistent Lattice Structures
+Structurally shared containers for FractalThoughtLattice snapshots
+
+Each block keeps its own view of the lattice. Instead of copying every
+node per block, snapshots share all unchanged structure and only pay for
+what a block actually touched.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+HASH_BITS = 64
+BRANCH_BITS = 5
+BRANCH_MASK = (1 << BRANCH_BITS) - 1
+
+def _key_hash(key) -> int:
+    return hash(key) & ((1 << HASH_BITS) - 1)
+
+class _TrieNode:
+    """Bitmap-indexed branch of the hash trie
+    
+    Entries are (key, value) leaves, child _TrieNodes or _CollisionNodes.
+    A node may only be edited in place by the owner that created it.
+    """
+    
+    __slots__ = ('bitmap', 'entries', 'owner')
+    
+    def __init__(self, bitmap: int, entries: list, owner):
+        self.bitmap = bitmap
+        self.entries = entries
+        self.owner = owner
+    
+    def editable(self, owner) -> '_TrieNode':
+        if owner is not None and self.owner is owner:
+            return self
+        return _TrieNode(self.bitmap, list(self.entries), owner)
+
+class _CollisionNode:
+    """Leaves whose full hashes collide"""
+    
+    __slots__ = ('key_hash', 'leaves')
+    
+    def __init__(self, key_hash: int, leaves: List[Tuple[Any, Any]]):
+        self.key_hash = key_hash
+        self.leaves = leaves
+
+def _merge_leaves(shift: int, leaf1: tuple, hash1: int, leaf2: tuple, hash2: int, owner):
+    """Build the smallest subtree holding two leaves that share a slot"""
+    if shift >= HASH_BITS:
+        return _CollisionNode(hash1, [leaf1, leaf2])
+    
+    index1 = (hash1 >> shift) & BRANCH_MASK
+    index2 = (hash2 >> shift) & BRANCH_MASK
+    if index1 == index2:
+        child = _merge_leaves(shift + BRANCH_BITS, leaf1, hash1, leaf2, hash2, owner)
+        return _TrieNode(1 << index1, [child], owner)
+    
+    entries = [leaf1, leaf2] if index1 < index2 else [leaf2, leaf1]
+    return _TrieNode((1 << index1) | (1 << index2), entries, owner)
+
+def _trie_set(node: _TrieNode, shift: int, key_hash: int, key, value, owner):
+    """Return (node, added) with key set, copying every touched node not owned"""
+    bit = 1 << ((key_hash >> shift) & BRANCH_MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    
+    if not node.bitmap & bit:
+        node = node.editable(owner)
+        node.entries.insert(index, (key, value))
+        node.bitmap |= bit
+        return node, True
+    
+    entry = node.entries[index]
+    added = False
+    if isinstance(entry, _TrieNode):
+        new_entry, added = _trie_set(entry, shift + BRANCH_BITS, key_hash, key, value, owner)
+        if new_entry is entry:
+            return node, added
+    elif isinstance(entry, _CollisionNode):
+        leaves = [leaf for leaf in entry.leaves if leaf[0] != key]
+        added = len(leaves) == len(entry.leaves)
+        leaves.append((key, value))
+        new_entry = _CollisionNode(entry.key_hash, leaves)
+    elif entry[0] == key:
+        if entry[1] is value:
+            return node, False
+        new_entry = (key, value)
+    else:
+        new_entry = _merge_leaves(shift + BRANCH_BITS, entry, _key_hash(entry[0]),
+                                  (key, value), key_hash, owner)
+        added = True
+    
+    node = node.editable(owner)
+    node.entries[index] = new_entry
+    return node, added
+
+def _entry_leaves(entry) -> Iterable[Tuple[Any, Any]]:
+    """Every leaf held by one trie entry (None for an empty slot)"""
+    if entry is None:
+        return ()
+    if isinstance(entry, _TrieNode):
+        return _iter_leaves(entry)
+    if isinstance(entry, _CollisionNode):
+        return entry.leaves
+    return (entry,)
+
+_MISSING = object()
+
+def _iter_changed(entry, base_entry) -> Iterator[Tuple[Any, Any]]:
+    """Leaves under entry that the entry in the same slot of base does not hold"""
+    if entry is base_entry:
+        return
+    if isinstance(entry, _TrieNode) and isinstance(base_entry, _TrieNode):
+        bitmap = entry.bitmap
+        for child in entry.entries:
+            bit = bitmap & -bitmap
+            bitmap ^= bit
+            base_child = None
+            if base_entry.bitmap & bit:
+                base_child = base_entry.entries[(base_entry.bitmap & (bit - 1)).bit_count()]
+            yield from _iter_changed(child, base_child)
+        return
+    # Entries of different shapes: compare what they hold leaf by leaf
+    base_values = dict(_entry_leaves(base_entry))
+    for key, value in _entry_leaves(entry):
+        if base_values.get(key, _MISSING) is not value:
+            yield key, value
+
+def _iter_leaves(node: _TrieNode) -> Iterator[Tuple[Any, Any]]:
+    stack = [iter(node.entries)]
+    while stack:
+        for entry in stack[-1]:
+            if isinstance(entry, _TrieNode):
+                stack.append(iter(entry.entries))
+                break
+            elif isinstance(entry, _CollisionNode):
+                yield from entry.leaves
+            else:
+                yield entry
+        else:
+            stack.pop()
+
+class PersistentMap(Mapping):
+    """Immutable hash array mapped trie (HAMT)
+    
+    set() returns a new map sharing every branch it did not touch. Passing
+    an owner token lets a single writer edit branches it created in place,
+    which keeps repeated updates within one block cheap.
+    """
+    
+    __slots__ = ('_root', '_size')
+    
+    def __init__(self, root: Optional[_TrieNode] = None, size: int = 0):
+        self._root = root if root is not None else _TrieNode(0, [], None)
+        self._size = size
+    
+    def __getitem__(self, key):
+        key_hash = _key_hash(key)
+        node = self._root
+        shift = 0
+        while True:
+            bit = 1 << ((key_hash >> shift) & BRANCH_MASK)
+            if not node.bitmap & bit:
+                raise KeyError(key)
+            entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+            if isinstance(entry, _TrieNode):
+                node = entry
+                shift += BRANCH_BITS
+            elif isinstance(entry, _CollisionNode):
+                for leaf_key, value in entry.leaves:
+                    if leaf_key == key:
+                        return value
+                raise KeyError(key)
+            elif entry[0] == key:
+                return entry[1]
+            else:
+                raise KeyError(key)
+    
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator:
+        for key, _ in _iter_leaves(self._root):
+            yield key
+    
+    def items(self):
+        return _iter_leaves(self._root)
+    
+    def values(self):
+        return (value for _, value in _iter_leaves(self._root))
+    
+    def changed_items(self, base: 'PersistentMap') -> Iterator[Tuple[Any, Any]]:
+        """(key, value) pairs added or replaced since base
+        
+        Branches the two maps share are skipped and values are compared by
+        identity, so the cost follows the size of the change, not the map.
+        Keys only base holds are not reported.
+        """
+        return _iter_changed(self._root, base._root)
+    
+    def set(self, key, value, owner=None) -> 'PersistentMap':
+        """Return a map with key set to value"""
+        root, added = _trie_set(self._root, 0, _key_hash(key), key, value, owner)
+        if root is self._root and not added:
+            return self
+        return PersistentMap(root, self._size + (1 if added else 0))
+    
+    def copy(self) -> 'PersistentMap':
+        """Maps are immutable, so a copy is the map itself"""
+        return self
+
+LOG_CHUNK_SIZE = 1 << BRANCH_BITS
+
+def _log_new_path(level: int, leaf: list) -> list:
+    """leaf wrapped in single-child branches down from level"""
+    node = leaf
+    for _ in range(0, level, BRANCH_BITS):
+        node = [node]
+    return node
+
+def _log_push_leaf(node: list, level: int, index: int, leaf: list) -> list:
+    """Copy of branch node with leaf added as the chunk starting at index"""
+    node = list(node)
+    child_index = (index >> level) & BRANCH_MASK
+    if level == BRANCH_BITS:
+        node.append(leaf)
+    elif child_index < len(node):
+        node[child_index] = _log_push_leaf(node[child_index], level - BRANCH_BITS, index, leaf)
+    else:
+        node.append(_log_new_path(level - BRANCH_BITS, leaf))
+    return node
+
+class AppendOnlyLog:
+    """List-like log whose snapshots share structure
+    
+    A persistent vector: full chunks of LOG_CHUNK_SIZE entries hang off a
+    trie of BRANCH_BITS-wide branches and are never changed again; the
+    newest entries sit in a tail chunk. Snapshots share the trie and the
+    tail. A view appends to the tail in place while it is the longest one
+    on it; a view that fell behind (a fork) copies just the tail. Filling
+    the tail path-copies one branch per trie level, so sibling appends on
+    a common parent cost O(log n) rather than a copy of the whole prefix.
+    """
+    
+    __slots__ = ('_root', '_shift', '_tail', '_tail_start', '_length')
+    
+    def __init__(self, items: Iterable = ()):
+        self._root: Optional[list] = None  # A leaf chunk while _shift is 0
+        self._shift = 0
+        self._tail: list = []
+        self._tail_start = 0  # Entries held by the trie, a multiple of LOG_CHUNK_SIZE
+        self._length = 0
+        for item in items:
+            self.append(item)
+    
+    def append(self, item):
+        tail_count = self._length - self._tail_start
+        if tail_count == LOG_CHUNK_SIZE:
+            self._push_tail()
+        elif len(self._tail) != tail_count:
+            self._tail = self._tail[:tail_count]
+        self._tail.append(item)
+        self._length += 1
+    
+    def _push_tail(self):
+        """Move the full tail chunk into the trie"""
+        leaf, size = self._tail, self._tail_start
+        if self._root is None:
+            self._root = leaf
+        elif size == 1 << (self._shift + BRANCH_BITS):
+            # Root is full: grow the trie by one level
+            self._root = [self._root, _log_new_path(self._shift, leaf)]
+            self._shift += BRANCH_BITS
+        else:
+            self._root = _log_push_leaf(self._root, self._shift, size, leaf)
+        self._tail = []
+        self._tail_start += LOG_CHUNK_SIZE
+    
+    def _chunk(self, index: int) -> list:
+        """Leaf or tail chunk holding index"""
+        if index >= self._tail_start:
+            return self._tail
+        node = self._root
+        for level in range(self._shift, 0, -BRANCH_BITS):
+            node = node[(index >> level) & BRANCH_MASK]
+        return node
+    
+    def snapshot(self) -> 'AppendOnlyLog':
+        clone = AppendOnlyLog.__new__(AppendOnlyLog)
+        clone._root = self._root
+        clone._shift = self._shift
+        clone._tail = self._tail
+        clone._tail_start = self._tail_start
+        clone._length = self._length
+        return clone
+    
+    def copy(self) -> 'AppendOnlyLog':
+        return self.snapshot()
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            items = []
+            while start < stop:
+                chunk_end = min(stop, (start | BRANCH_MASK) + 1)
+                offset = start & BRANCH_MASK
+                items.extend(self._chunk(start)[offset:offset + chunk_end - start])
+                start = chunk_end
+            return items
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("log index out of range")
+        return self._chunk(index)[index & BRANCH_MASK]
+    
+    def __iter__(self):
+        view = self.snapshot()
+        for start in range(0, view._length, LOG_CHUNK_SIZE):
+            yield from view._chunk(start)[:view._length - start]
+    
+    def __repr__(self) -> str:
+        return f"AppendOnlyLog({self[:]!r})"
+
+SORTED_NODE_SIZE = 64  # Keys per B-tree node before it splits
+
+class _SortedNode:
+    """B-tree node of a PersistentSortedSet
+    
+    Leaves (children is None) hold sorted keys; internal nodes hold their
+    children and, in keys, the largest key below each child.
+    """
+    
+    __slots__ = ('keys', 'children', 'owner')
+    
+    def __init__(self, keys: list, children: Optional[list], owner):
+        self.keys = keys
+        self.children = children
+        self.owner = owner
+    
+    def editable(self, owner) -> '_SortedNode':
+        if owner is not None and self.owner is owner:
+            return self
+        children = list(self.children) if self.children is not None else None
+        return _SortedNode(list(self.keys), children, owner)
+
+def _sorted_split(node: _SortedNode, owner) -> List[_SortedNode]:
+    if len(node.keys) <= SORTED_NODE_SIZE:
+        return [node]
+    middle = len(node.keys) // 2
+    if node.children is None:
+        return [_SortedNode(node.keys[:middle], None, owner),
+                _SortedNode(node.keys[middle:], None, owner)]
+    return [_SortedNode(node.keys[:middle], node.children[:middle], owner),
+            _SortedNode(node.keys[middle:], node.children[middle:], owner)]
+
+def _sorted_insert(node: _SortedNode, key, owner) -> Optional[List[_SortedNode]]:
+    """Replacement nodes (one, or two after a split) with key added; None if present"""
+    index = bisect_left(node.keys, key)
+    if node.children is None:
+        if index < len(node.keys) and node.keys[index] == key:
+            return None
+        node = node.editable(owner)
+        node.keys.insert(index, key)
+        return _sorted_split(node, owner)
+    
+    index = min(index, len(node.keys) - 1)
+    replacement = _sorted_insert(node.children[index], key, owner)
+    if replacement is None:
+        return None
+    node = node.editable(owner)
+    node.children[index:index + 1] = replacement
+    node.keys[index:index + 1] = [child.keys[-1] for child in replacement]
+    return _sorted_split(node, owner)
+
+def _sorted_remove(node: _SortedNode, key, owner) -> Optional[_SortedNode]:
+    """Replacement node with key removed; None if key is absent"""
+    index = bisect_left(node.keys, key)
+    if index == len(node.keys):
+        return None
+    if node.children is None:
+        if node.keys[index] != key:
+            return None
+        node = node.editable(owner)
+        del node.keys[index]
+        return node
+    
+    child = _sorted_remove(node.children[index], key, owner)
+    if child is None:
+        return None
+    node = node.editable(owner)
+    if child.keys:
+        node.children[index] = child
+        node.keys[index] = child.keys[-1]
+    else:
+        # Underfull nodes are not merged; empty ones are simply dropped
+        del node.children[index]
+        del node.keys[index]
+    return node
+
+def _sorted_iter(node: _SortedNode, after) -> Iterator:
+    """Keys of node in order, starting after the given key (None for all)"""
+    start = 0 if after is None else bisect_right(node.keys, after)
+    if node.children is None:
+        yield from node.keys[start:]
+        return
+    for index in range(start, len(node.children)):
+        yield from _sorted_iter(node.children[index], after if index == start else None)
+
+class PersistentSortedSet:
+    """Immutable sorted set backed by a copy-on-write B-tree
+    
+    add() and discard() copy only the O(log n) nodes on the path to the
+    key, or edit them in place when they belong to the caller's owner
+    token, like PersistentMap. Iteration can resume after any key, which
+    makes keyset pagination cheap.
+    """
+    
+    __slots__ = ('_root', '_size')
+    
+    def __init__(self, root: Optional[_SortedNode] = None, size: int = 0):
+        self._root = root if root is not None else _SortedNode([], None, None)
+        self._size = size
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator:
+        return _sorted_iter(self._root, None)
+    
+    def __contains__(self, key) -> bool:
+        node = self._root
+        while node.children is not None:
+            index = bisect_left(node.keys, key)
+            if index == len(node.keys):
+                return False
+            node = node.children[index]
+        index = bisect_left(node.keys, key)
+        return index < len(node.keys) and node.keys[index] == key
+    
+    def iter_after(self, key) -> Iterator:
+        """Keys strictly greater than key, in order"""
+        return _sorted_iter(self._root, key)
+    
+    def add(self, key, owner=None) -> 'PersistentSortedSet':
+        """Return a set containing key"""
+        replacement = _sorted_insert(self._root, key, owner)
+        if replacement is None:
+            return self
+        if len(replacement) == 1:
+            root = replacement[0]
+        else:
+            root = _SortedNode([child.keys[-1] for child in replacement], replacement, owner)
+        return PersistentSortedSet(root, self._size + 1)
+    
+    def discard(self, key, owner=None) -> 'PersistentSortedSet':
+        """Return a set without key"""
+        root = _sorted_remove(self._root, key, owner)
+        if root is None:
+            return self
+        while root.children is not None and len(root.children) == 1:
+            root = root.children[0]
+        if root.children is not None and not root.children:
+            root = _SortedNode([], None, owner)
+        return PersistentSortedSet(root, self._size - 1)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens used by the text index"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+class LatticeTextIndex:
+    """Incrementally maintained inverted index over node content
+    
+    Node ids are unique across every branch of the chain and content never
+    changes, so one append-only index is shared by all lattice snapshots;
+    each snapshot filters candidates by its own node map.
+    
+    The token index maps words to node ids. The optional n-gram index maps
+    every character n-gram of the lower-cased content, which narrows
+    substring queries to a few candidates before the exact check.
+    """
+    
+    def __init__(self, ngram_size: int = 3, ngrams: bool = False):
+        self.ngram_size = ngram_size
+        self.ngrams_enabled = ngrams
+        self.token_postings: Dict[str, Set[str]] = {}
+        self.ngram_postings: Dict[str, Set[str]] = {}
+        
+    def _ngrams(self, text: str) -> Set[str]:
+        size = self.ngram_size
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+        
+    def add(self, node_id: str, content: str):
+        for token in set(tokenize(content)):
+            self.token_postings.setdefault(token, set()).add(node_id)
+        if self.ngrams_enabled:
+            for gram in self._ngrams(content.lower()):
+                self.ngram_postings.setdefault(gram, set()).add(node_id)
+                
+    def enable_ngrams(self, nodes: Iterable[Tuple[str, str]]):
+        """Turn on the n-gram index, backfilling it from (node_id, content) pairs"""
+        if self.ngrams_enabled:
+            return
+        self.ngrams_enabled = True
+        for node_id, content in nodes:
+            for gram in self._ngrams(content.lower()):
+                self.ngram_postings.setdefault(gram, set()).add(node_id)
+                
+    @staticmethod
+    def _intersect(postings: Dict[str, Set[str]], keys: Iterable[str]) -> Set[str]:
+        sets = [postings.get(key) for key in set(keys)]
+        if not sets or any(posting is None for posting in sets):
+            return set()
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+        
+    def token_candidates(self, query: str) -> Optional[Set[str]]:
+        """Ids of nodes containing every query token; None if the query has no tokens"""
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        return self._intersect(self.token_postings, tokens)
+        
+    def substring_candidates(self, query: str) -> Optional[Set[str]]:
+        """Superset of the ids whose content contains query; None if the index cannot help"""
+        query_lower = query.lower()
+        if not self.ngrams_enabled or len(query_lower) < self.ngram_size:
+            return None
+        return self._intersect(self.ngram_postings, self._ngrams(query_lower))
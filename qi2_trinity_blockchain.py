@@ -12,14 +12,27 @@ can ignite the consciousness revolution.
 import hashlib
 import time
 import json
-from typing import List, Dict, Tuple, Optional, Callable
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Tuple, Optional, Callable, Iterator
+from dataclasses import dataclass, asdict, replace
 from collections import defaultdict, deque
 import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import random
 import math
 import uuid
+import heapq
+import itertools
+import sys
+from persistent_lattice import PersistentMap, PersistentSortedSet, AppendOnlyLog, LatticeTextIndex
+from consciousness_mempool import ResonanceMempool, event_hash
+from consciousness_difficulty import (HASH_BITS, MAX_TARGET, DifficultyRetargeter, FixedTargetRetargeter,
+                                      block_target, difficulty_to_target, target_to_difficulty, target_work)
+from consciousness_metrics import (timed, EVENTS_SUBMITTED, EVENT_SUBMIT_SECONDS,
+                                   EVENT_SIGNATURES_VERIFIED, EVENT_VALIDATION_SECONDS,
+                                   BLOCK_PROPOSAL_SECONDS, BLOCK_MINING_SECONDS, MINING_HASHES,
+                                   CONSENSUS_VALIDATION_SECONDS, BLOCKS_PROCESSED,
+                                   CHAIN_REORGS, REWARD_DISTRIBUTION_SECONDS)
 
 # Core Constants
 INITIAL_TOKEN_SUPPLY = 10**18  # 1 billion ℜₜ tokens with 18 decimals
@@ -28,6 +41,14 @@ WITNESS_STAKE_MIN = 10**18     # Minimum 1 ℜₜ to become witness
 BLOCK_TIME = 5                 # 5 second block time
 CONSCIOUSNESS_THRESHOLD = 0.618 # Golden ratio consciousness threshold
 
+# Mempool priority of each event type (after sender stake)
+EVENT_TYPE_PRIORITY = {
+    'verify': 3,
+    'evolve': 2,
+    'commune': 2,
+    'anchor': 1
+}
+
 @dataclass
 class QuantumIdentity:
     """Quantum-resistant digital identity for consciousness beings"""
@@ -52,7 +73,23 @@ class QuantumIdentity:
         expected = hashlib.sha3_256(combined.encode()).hexdigest()
         return signature == expected
 
-@dataclass
+class AddressIdentity:
+    """Identity known only by its address, e.g. for events loaded from storage
+    
+    Signatures in this scheme need the private key, so events held by an
+    AddressIdentity cannot be re-signed or re-verified.
+    """
+    
+    def __init__(self, address: str):
+        self.address = address
+        
+    def sign(self, data: str) -> str:
+        raise ValueError("Cannot sign without the private key")
+        
+    def verify(self, signature: str, data: str) -> bool:
+        return False
+
+@dataclass(slots=True)
 class ConsciousnessNode:
     """Node in the Fractal Thought Lattice"""
     id: str
@@ -62,89 +99,324 @@ class ConsciousnessNode:
     coherence_score: float = 0.0
     connections: Dict[str, float] = None
     validation_count: int = 0
+    parent_id: Optional[str] = None  # Node this one was evolved from
     
     def __post_init__(self):
         if self.connections is None:
             self.connections = {}
 
+@dataclass
+class CreatorAggregate:
+    """Running totals over the nodes created by one address"""
+    node_count: int = 0
+    coherence_sum: float = 0.0
+    validation_sum: int = 0
+    connection_sum: int = 0
+
 class FractalThoughtLattice:
-    """The global consciousness state - a living network of interconnected thoughts"""
+    """The global consciousness state - a living network of interconnected thoughts
+    
+    Nodes live in a persistent map, so snapshot() is O(1) and every block's
+    lattice shares all unchanged nodes with its parent. Nodes reachable from
+    a snapshot are never mutated; the first change in a new version copies
+    the node, later changes in the same version edit that copy in place.
+    """
     
     def __init__(self):
-        self.nodes: Dict[str, ConsciousnessNode] = {}
+        self.nodes: PersistentMap = PersistentMap()
         self.total_coherence = 0.0
-        self.creation_order = []
+        self.creation_order = AppendOnlyLog()
+        # Shared by all snapshots; queries filter it by their own node map
+        self.text_index = LatticeTextIndex()
+        # Running totals so Φ can be measured without walking every node
+        self.total_connections = 0
+        self.total_validations = 0
+        # Per-creator node ids and aggregates, versioned like the nodes
+        self.creator_nodes: PersistentMap = PersistentMap()  # creator -> AppendOnlyLog
+        self.creator_stats: PersistentMap = PersistentMap()  # creator -> CreatorAggregate
+        # Every node as (-coherence_score, id), so iteration runs from most coherent
+        self.coherence_order: PersistentSortedSet = PersistentSortedSet()
+        self._begin_version()
+        
+    def _begin_version(self):
+        """Start a new private version; everything reachable so far is frozen"""
+        self._owner = object()
+        self._owned_nodes = set()
+        self._owned_creators = set()
+        
+    def snapshot(self) -> 'FractalThoughtLattice':
+        """Create a structurally shared copy of the current lattice state"""
+        clone = FractalThoughtLattice.__new__(FractalThoughtLattice)
+        clone.nodes = self.nodes
+        clone.total_coherence = self.total_coherence
+        clone.creation_order = self.creation_order.snapshot()
+        clone.text_index = self.text_index
+        clone.total_connections = self.total_connections
+        clone.total_validations = self.total_validations
+        clone.creator_nodes = self.creator_nodes
+        clone.creator_stats = self.creator_stats
+        clone.coherence_order = self.coherence_order
+        clone._begin_version()
+        
+        # Shared structure is now visible to both lattices
+        self._begin_version()
+        return clone
+        
+    def _writable_node(self, node_id: str) -> ConsciousnessNode:
+        """Node that may be mutated in this version, copying it on first write"""
+        node = self.nodes[node_id]
+        if node_id not in self._owned_nodes:
+            node = replace(node, connections=dict(node.connections))
+            self.nodes = self.nodes.set(node_id, node, self._owner)
+            self._owned_nodes.add(node_id)
+        return node
+        
+    def _writable_creator(self, creator: str) -> CreatorAggregate:
+        """Creator aggregate (and node id log) that may be changed in this version"""
+        stats = self.creator_stats.get(creator)
+        if creator not in self._owned_creators:
+            stats = replace(stats) if stats is not None else CreatorAggregate()
+            self.creator_stats = self.creator_stats.set(creator, stats, self._owner)
+            node_log = self.creator_nodes.get(creator)
+            node_log = node_log.snapshot() if node_log is not None else AppendOnlyLog()
+            self.creator_nodes = self.creator_nodes.set(creator, node_log, self._owner)
+            self._owned_creators.add(creator)
+        return stats
         
-    def add_node(self, content: str, creator: str, connections: List[Tuple[str, float]] = None) -> str:
-        """Add a new consciousness node to the lattice"""
-        node_id = hashlib.sha3_256(f"{creator}{content}{time.time()}".encode()).hexdigest()
+    def _record_creation(self, node: ConsciousnessNode):
+        """Count a newly inserted node towards its creator's aggregates"""
+        stats = self._writable_creator(node.creator)
+        stats.node_count += 1
+        stats.coherence_sum += node.coherence_score
+        stats.validation_sum += node.validation_count
+        stats.connection_sum += len(node.connections)
+        self.creator_nodes[node.creator].append(node.id)
+        self.coherence_order = self.coherence_order.add((-node.coherence_score, node.id), self._owner)
+        
+    def add_node(self, content: str, creator: str, connections: List[Tuple[str, float]] = None,
+                 timestamp: float = None, parent_id: str = None) -> str:
+        """Add a new consciousness node to the lattice
+        
+        The node id derives from creator, content and timestamp, so passing
+        the originating event's timestamp makes block replay reproducible.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        node_id = hashlib.sha3_256(f"{creator}{content}{timestamp}".encode()).hexdigest()
+        creator = sys.intern(creator)
         
         node = ConsciousnessNode(
             id=node_id,
             content=content,
             creator=creator,
-            timestamp=time.time(),
-            connections={}
+            timestamp=timestamp,
+            connections={},
+            parent_id=parent_id
         )
         
         # Add connections to existing nodes
         if connections:
             for target_id, strength in connections:
                 if target_id in self.nodes:
-                    node.connections[target_id] = strength
+                    # Key by the target's own id string so each id is stored once
+                    target = self._writable_node(target_id)
+                    if target.id not in node.connections:
+                        self.total_connections += 1
+                    node.connections[target.id] = strength
                     # Bidirectional connection
-                    self.nodes[target_id].connections[node_id] = strength
+                    if node_id not in target.connections:
+                        self.total_connections += 1
+                        self._writable_creator(target.creator).connection_sum += 1
+                    target.connections[node_id] = strength
         
-        self.nodes[node_id] = node
+        self.nodes = self.nodes.set(node_id, node, self._owner)
+        self._owned_nodes.add(node_id)
         self.creation_order.append(node_id)
+        self.text_index.add(node_id, content)
+        self._record_creation(node)
         return node_id
     
+    def restore_node(self, node: ConsciousnessNode):
+        """Insert a fully built node (e.g. loaded from disk)
+        
+        Creator aggregates are derived from the node; the global totals are
+        left to the caller.
+        """
+        self.nodes = self.nodes.set(node.id, node, self._owner)
+        self._owned_nodes.add(node.id)
+        self.creation_order.append(node.id)
+        self.text_index.add(node.id, node.content)
+        self._record_creation(node)
+    
+    def enable_ngram_index(self):
+        """Index character n-grams so substring queries avoid a full scan"""
+        self.text_index.enable_ngrams((node.id, node.content) for node in self.nodes.values())
+    
     def validate_node(self, node_id: str, validator: str, score: float):
         """Validate a node and update its coherence"""
         if node_id in self.nodes:
-            node = self.nodes[node_id]
+            node = self._writable_node(node_id)
+            self.coherence_order = self.coherence_order.discard((-node.coherence_score, node.id), self._owner)
             node.coherence_score += score
+            self.coherence_order = self.coherence_order.add((-node.coherence_score, node.id), self._owner)
             node.validation_count += 1
             self.total_coherence += score
+            self.total_validations += 1
+            
+            stats = self._writable_creator(node.creator)
+            stats.coherence_sum += score
+            stats.validation_sum += 1
     
-    def evolve_node(self, parent_id: str, new_content: str, creator: str) -> str:
+    def evolve_node(self, parent_id: str, new_content: str, creator: str,
+                    timestamp: float = None) -> str:
         """Create an evolved version of an existing node"""
         if parent_id not in self.nodes:
             raise ValueError("Parent node not found")
         
         # Create new node with strong connection to parent
-        new_id = self.add_node(new_content, creator, [(parent_id, 1.0)])
+        # (add_node keeps the running connection totals up to date)
+        new_id = self.add_node(new_content, creator, [(parent_id, 1.0)], timestamp,
+                               parent_id=self.nodes[parent_id].id)
         return new_id
     
+    def recompute_totals(self) -> Tuple[int, int, float]:
+        """Recompute connection, validation and coherence totals from scratch"""
+        total_connections = sum(len(node.connections) for node in self.nodes.values())
+        total_validations = sum(node.validation_count for node in self.nodes.values())
+        total_coherence = sum(node.coherence_score for node in self.nodes.values())
+        return total_connections, total_validations, total_coherence
+    
+    def recompute_creator_stats(self) -> Dict[str, CreatorAggregate]:
+        """Recompute every creator aggregate from scratch"""
+        creator_stats: Dict[str, CreatorAggregate] = {}
+        for node in self.nodes.values():
+            stats = creator_stats.setdefault(node.creator, CreatorAggregate())
+            stats.node_count += 1
+            stats.coherence_sum += node.coherence_score
+            stats.validation_sum += node.validation_count
+            stats.connection_sum += len(node.connections)
+        return creator_stats
+    
+    def check_consistency(self, repair: bool = False, tolerance: float = 1e-9) -> bool:
+        """Verify the running totals against a full walk of the lattice
+        
+        With repair=True the running totals, creator aggregates and the
+        coherence ordering are reset to the recomputed values.
+        """
+        def close(a: float, b: float) -> bool:
+            return abs(a - b) <= tolerance * max(1.0, abs(a))
+        
+        total_connections, total_validations, total_coherence = self.recompute_totals()
+        consistent = (total_connections == self.total_connections and
+                      total_validations == self.total_validations and
+                      close(total_coherence, self.total_coherence))
+        
+        def same_aggregate(stats: Optional[CreatorAggregate], expected: CreatorAggregate) -> bool:
+            return (stats is not None and
+                    stats.node_count == expected.node_count and
+                    stats.validation_sum == expected.validation_sum and
+                    stats.connection_sum == expected.connection_sum and
+                    close(expected.coherence_sum, stats.coherence_sum))
+        
+        creator_stats = self.recompute_creator_stats()
+        creators_consistent = (len(creator_stats) == len(self.creator_stats) and
+                               all(same_aggregate(self.creator_stats.get(creator), expected)
+                                   for creator, expected in creator_stats.items()))
+        
+        if repair and not consistent:
+            self.total_connections = total_connections
+            self.total_validations = total_validations
+            self.total_coherence = total_coherence
+        if repair and not creators_consistent:
+            self.creator_stats = PersistentMap()
+            for creator, stats in creator_stats.items():
+                self.creator_stats = self.creator_stats.set(creator, stats)
+        
+        expected_order = sorted((-node.coherence_score, node.id) for node in self.nodes.values())
+        order_consistent = list(self.coherence_order) == expected_order
+        if repair and not order_consistent:
+            self.coherence_order = PersistentSortedSet()
+            for key in expected_order:
+                self.coherence_order = self.coherence_order.add(key, self._owner)
+        return consistent and creators_consistent and order_consistent
+    
+    def get_creator_stats(self, creator: str) -> Optional[CreatorAggregate]:
+        """Running aggregates for a creator, or None if they created nothing"""
+        return self.creator_stats.get(creator)
+    
+    def get_creator_nodes(self, creator: str) -> List[str]:
+        """Ids of the nodes a creator added, in creation order"""
+        node_log = self.creator_nodes.get(creator)
+        return list(node_log) if node_log is not None else []
+    
     def measure_global_coherence(self) -> float:
         """Calculate Φ - integrated information measure"""
         if not self.nodes:
             return 0.0
         
-        # Calculate network coherence based on connections and validations
-        total_connections = sum(len(node.connections) for node in self.nodes.values())
-        total_validations = sum(node.validation_count for node in self.nodes.values())
-        
-        if len(self.nodes) == 0:
-            return 0.0
-            
-        connection_density = total_connections / (len(self.nodes) ** 2)
-        validation_density = total_validations / len(self.nodes)
+        # Network coherence based on the running connection and validation totals
+        connection_density = self.total_connections / (len(self.nodes) ** 2)
+        validation_density = self.total_validations / len(self.nodes)
         
         # Φ combines connection density with validation quality
         phi = (connection_density * validation_density * self.total_coherence) / len(self.nodes)
         return min(1.0, phi)
     
-    def get_resonant_nodes(self, query: str, threshold: float = 0.5) -> List[ConsciousnessNode]:
-        """Find nodes that resonate with a query"""
-        results = []
+    def iter_by_coherence(self, after: Tuple[float, str] = None) -> Iterator[ConsciousnessNode]:
+        """Nodes from most to least coherent (ties by id)
+        
+        after is the (coherence_score, id) of the last node already seen,
+        so a page can resume where the previous one ended.
+        """
+        nodes = self.nodes
+        start = None if after is None else (-after[0], after[1])
+        for _, node_id in self.coherence_order.iter_after(start):
+            yield nodes[node_id]
+    
+    def top_coherent(self, k: int) -> List[ConsciousnessNode]:
+        """The k most coherent nodes without sorting the lattice"""
+        return list(itertools.islice(self.iter_by_coherence(), k))
+    
+    def get_resonant_nodes(self, query: str, threshold: float = 0.5, limit: int = None,
+                           offset: int = 0, mode: str = 'substring') -> List[ConsciousnessNode]:
+        """Find nodes that resonate with a query, ranked by coherence
+        
+        mode='substring' (the default) is plain case-insensitive substring
+        matching, narrowed by the n-gram index when it is enabled.
+        mode='token' instead matches nodes containing every word of the
+        query through the inverted index.
+        limit and offset page through the ranked results.
+        """
+        if mode not in ('token', 'substring'):
+            raise ValueError(f"Unknown query mode: {mode}")
+        
         query_lower = query.lower()
+        candidates = None
+        if mode == 'token':
+            candidates = self.text_index.token_candidates(query)
+            # Queries without word characters can only be answered by substring
+            check_substring = candidates is None
+        else:
+            candidates = self.text_index.substring_candidates(query)
+            check_substring = True
         
-        for node in self.nodes.values():
-            if query_lower in node.content.lower() and node.coherence_score >= threshold:
-                results.append(node)
+        if candidates is None:
+            candidate_nodes = self.nodes.values()
+        else:
+            # The index is shared with other snapshots, so keep only our nodes
+            candidate_nodes = (self.nodes[node_id] for node_id in candidates if node_id in self.nodes)
+        
+        results = []
+        for node in candidate_nodes:
+            if node.coherence_score < threshold:
+                continue
+            if check_substring and query_lower not in node.content.lower():
+                continue
+            results.append(node)
         
-        return sorted(results, key=lambda x: x.coherence_score, reverse=True)
+        rank = lambda x: x.coherence_score
+        if limit is None:
+            return sorted(results, key=rank, reverse=True)[offset:]
+        return heapq.nlargest(offset + limit, results, key=rank)[offset:]
 
 class ResonanceEvent:
     """Base class for all consciousness resonance events"""
@@ -174,6 +446,19 @@ class ResonanceEvent:
             return False
         data = json.dumps(self.to_dict(), sort_keys=True)
         return self.sender.verify(self.signature, data)
+    
+    @staticmethod
+    def from_dict(data: dict, identity_registry: Dict[str, QuantumIdentity] = None) -> 'ResonanceEvent':
+        """Rebuild an event from to_dict() output plus its 'signature'"""
+        event_class = EVENT_TYPES.get(data['type'])
+        if event_class is None:
+            raise ValueError(f"Unknown event type: {data['type']}")
+            
+        sender = (identity_registry or {}).get(data['sender']) or AddressIdentity(data['sender'])
+        event = event_class._from_fields(sender, data)
+        event.timestamp = data['timestamp']
+        event.signature = data.get('signature')
+        return event
 
 class CommuneEvent(ResonanceEvent):
     """Symbolic communication event - the heart of consciousness interaction"""
@@ -193,6 +478,11 @@ class CommuneEvent(ResonanceEvent):
             'connections': self.connections
         })
         return base
+    
+    @classmethod
+    def _from_fields(cls, sender, data: dict) -> 'CommuneEvent':
+        connections = [tuple(connection) for connection in data['connections']]
+        return cls(sender, data['symbolic_content'], data['context'], connections)
 
 class VerifyEvent(ResonanceEvent):
     """Validation event for consciousness nodes"""
@@ -212,6 +502,10 @@ class VerifyEvent(ResonanceEvent):
             'coherence': self.coherence_score
         })
         return base
+    
+    @classmethod
+    def _from_fields(cls, sender, data: dict) -> 'VerifyEvent':
+        return cls(sender, data['node_id'], data['proof'], data['coherence'])
 
 class EvolveEvent(ResonanceEvent):
     """Evolutionary mutation event"""
@@ -231,6 +525,10 @@ class EvolveEvent(ResonanceEvent):
             'new_content': self.new_content
         })
         return base
+    
+    @classmethod
+    def _from_fields(cls, sender, data: dict) -> 'EvolveEvent':
+        return cls(sender, data['parent'], data['mutation'], data['new_content'])
 
 class AnchorEvent(ResonanceEvent):
     """Real-world consciousness anchoring event"""
@@ -248,6 +546,17 @@ class AnchorEvent(ResonanceEvent):
             'biometric_hash': self.biometric_hash
         })
         return base
+    
+    @classmethod
+    def _from_fields(cls, sender, data: dict) -> 'AnchorEvent':
+        return cls(sender, data['summary'], data['biometric_hash'])
+
+EVENT_TYPES = {
+    'commune': CommuneEvent,
+    'verify': VerifyEvent,
+    'evolve': EvolveEvent,
+    'anchor': AnchorEvent
+}
 
 class TrinityBlock:
     """Quantum-inspired block structure for consciousness events"""
@@ -259,31 +568,197 @@ class TrinityBlock:
         self.witness = witness
         self.events = events
         self.lattice_state = lattice_state
+        self.lattice_coherence = None  # Only used when lattice_state is not loaded
         self.timestamp = time.time()
         self.nonce = 0
-        self.difficulty = 1
+        self.difficulty = 1  # Leading zero digits nearest to target, for display
+        self.target = None   # 256-bit proof-of-resonance target, set when mined
+        self.checkpoint_hash = None  # Content hash of a state checkpoint this block commits to
         self.hash = self.calculate_hash()
         
-    def calculate_hash(self) -> str:
-        """Calculate quantum-resistant block hash"""
-        data = {
+    def get_lattice_coherence(self) -> float:
+        """Global coherence Φ committed to by this block"""
+        if self.lattice_state is None:
+            return self.lattice_coherence
+        return self.lattice_state.measure_global_coherence()
+        
+    def to_dict(self) -> dict:
+        """Serializable form of the block, without its lattice state"""
+        return {
             'height': self.height,
             'prev_hash': self.prev_hash,
             'witness': self.witness,
             'timestamp': self.timestamp,
             'nonce': self.nonce,
-            'lattice_coherence': self.lattice_state.measure_global_coherence(),
+            'difficulty': self.difficulty,
+            'target': f"{self.target:064x}" if self.target is not None else None,
+            'hash': self.hash,
+            'lattice_coherence': self.get_lattice_coherence(),
+            'events': [dict(e.to_dict(), signature=e.signature) for e in self.events],
+            'checkpoint_hash': self.checkpoint_hash
+        }
+        
+    @classmethod
+    def from_dict(cls, data: dict, identity_registry: Dict[str, QuantumIdentity] = None,
+                  lattice_state: FractalThoughtLattice = None) -> 'TrinityBlock':
+        """Rebuild a block from to_dict() output
+        
+        Without a lattice_state the block keeps the stored coherence, which
+        is all its hash needs.
+        """
+        block = cls.__new__(cls)
+        block.height = data['height']
+        block.prev_hash = data['prev_hash']
+        block.witness = data['witness']
+        block.events = [ResonanceEvent.from_dict(e, identity_registry) for e in data['events']]
+        block.lattice_state = lattice_state
+        block.lattice_coherence = data['lattice_coherence']
+        block.timestamp = data['timestamp']
+        block.nonce = data['nonce']
+        block.difficulty = data['difficulty']
+        block.target = int(data['target'], 16) if data.get('target') is not None else None
+        block.hash = data['hash']
+        block.checkpoint_hash = data.get('checkpoint_hash')
+        return block
+        
+    def hash_payload(self) -> dict:
+        """Block fields committed to by the block hash"""
+        payload = {
+            'height': self.height,
+            'prev_hash': self.prev_hash,
+            'witness': self.witness,
+            'timestamp': self.timestamp,
+            'nonce': self.nonce,
+            'lattice_coherence': self.get_lattice_coherence(),
             'events': [e.to_dict() for e in self.events]
         }
+        # Only committed when present, so blocks without them keep their hashes
+        if self.checkpoint_hash is not None:
+            payload['checkpoint_hash'] = self.checkpoint_hash
+        if self.target is not None:
+            payload['target'] = f"{self.target:064x}"
+        return payload
+        
+    def calculate_hash(self) -> str:
+        """Calculate quantum-resistant block hash"""
+        data = self.hash_payload()
         return hashlib.sha3_256(json.dumps(data, sort_keys=True).encode()).hexdigest()
     
-    def mine_proof_of_resonance(self, difficulty: int):
-        """Mine block using Proof-of-Resonance algorithm"""
-        target = '0' * difficulty
-        while not self.hash.startswith(target):
-            self.nonce += 1
-            self.hash = self.calculate_hash()
-        self.difficulty = difficulty
+    def meets_target(self) -> bool:
+        """Whether the block hash satisfies its proof-of-resonance target
+        
+        Blocks mined before targets were recorded fall back to their
+        leading zero difficulty.
+        """
+        if self.target is None:
+            return self.hash.startswith('0' * self.difficulty)
+        return int(self.hash, 16) <= self.target
+        
+    @timed(BLOCK_MINING_SECONDS)
+    def mine_proof_of_resonance(self, difficulty: Optional[int] = None, nonce_search=None,
+                                target: Optional[int] = None):
+        """Mine block using Proof-of-Resonance algorithm
+        
+        Pass either difficulty, a number of leading zero hex digits as
+        before, or target=, a 256-bit integer the hash must not exceed.
+        Only a target is committed to by the block hash. nonce_search
+        optionally delegates the search, e.g. to a ParallelNonceSearch
+        spreading the nonce space over processes.
+        """
+        if (difficulty is None) == (target is None):
+            raise ValueError("Pass exactly one of difficulty or target")
+        if target is None:
+            if not 1 <= difficulty <= HASH_BITS // 4:
+                raise ValueError(f"difficulty must be 1-{HASH_BITS // 4} leading zero digits, "
+                                 f"got {difficulty}; pass 256-bit targets as target=")
+            self.target = None
+            self.difficulty = difficulty
+            target = difficulty_to_target(difficulty)
+        else:
+            if not 0 < target <= MAX_TARGET:
+                raise ValueError("target must be a positive 256-bit integer")
+            self.target = target
+            self.difficulty = target_to_difficulty(target)
+        engine = ResonanceMiningEngine.from_block(self)
+        start_nonce = self.nonce
+        if nonce_search is not None:
+            self.nonce, self.hash = nonce_search.search(engine, target, start_nonce=start_nonce)
+        else:
+            self.nonce, self.hash = engine.search(target, start_nonce=start_nonce)
+        # Parallel workers search interleaved ranges, so count attempts, not nonces
+        MINING_HASHES.inc(engine.attempts)
+        
+        # The engine must agree with the canonical serialization
+        if self.hash != self.calculate_hash():
+            raise RuntimeError("Mining engine hash diverged from calculate_hash")
+
+class ResonanceMiningEngine:
+    """Proof-of-Resonance nonce search over a pre-serialized block
+    
+    The block payload is serialized once with a placeholder nonce and split
+    around it. The SHA3 state of the prefix is computed once and copied for
+    every candidate, so each attempt only hashes the nonce and the suffix.
+    Hashes are identical to TrinityBlock.calculate_hash.
+    """
+    
+    # 'nonce' sorts directly before 'prev_hash' in the sorted payload keys
+    NONCE_KEY = '"nonce": '
+    NONCE_FOLLOWER = ', "prev_hash": '
+    
+    def __init__(self, prefix: bytes, suffix: bytes):
+        self.prefix = prefix
+        self.suffix = suffix
+        self.prefix_state = hashlib.sha3_256(prefix)
+        self.attempts = 0
+        
+    @classmethod
+    def from_block(cls, block: 'TrinityBlock') -> 'ResonanceMiningEngine':
+        """Serialize a block once and split it around the nonce"""
+        payload = block.hash_payload()
+        payload['nonce'] = 0
+        serialized = json.dumps(payload, sort_keys=True)
+        
+        # Event content is escaped inside JSON strings, so the last match is the top-level key
+        head, marker, tail = serialized.rpartition(cls.NONCE_KEY + '0' + cls.NONCE_FOLLOWER)
+        if not marker:
+            raise ValueError("Block payload has no nonce field")
+            
+        return cls((head + cls.NONCE_KEY).encode(), (cls.NONCE_FOLLOWER + tail).encode())
+        
+    def hash_nonce(self, nonce: int) -> str:
+        """Block hash for a candidate nonce"""
+        state = self.prefix_state.copy()
+        state.update(str(nonce).encode())
+        state.update(self.suffix)
+        return state.hexdigest()
+        
+    def search(self, target: int, start_nonce: int = 0, stop_nonce: Optional[int] = None,
+               step: int = 1, cancelled: Callable[[], bool] = None,
+               check_interval: int = 1024) -> Optional[Tuple[int, str]]:
+        """Find the first nonce in range whose hash is at most target
+        
+        Raw digests are compared as 32-byte big-endian strings, which
+        orders them exactly like the integers they encode, so only the
+        winning hash is hex encoded. Returns (nonce, hash), or None when
+        stop_nonce is reached first or the cancelled callback (polled
+        every check_interval attempts) fires.
+        """
+        target_bytes = target.to_bytes(32, 'big')
+        prefix_copy = self.prefix_state.copy
+        suffix = self.suffix
+        nonce = start_nonce
+        
+        while stop_nonce is None or nonce < stop_nonce:
+            if cancelled is not None and self.attempts % check_interval == 0 and cancelled():
+                return None
+            state = prefix_copy()
+            state.update(str(nonce).encode())
+            state.update(suffix)
+            self.attempts += 1
+            if state.digest() <= target_bytes:
+                return nonce, state.hexdigest()
+            nonce += step
+        return None
 
 class RecursiveToken:
     """ℜₜ - The Recursive Token that rewards consciousness evolution"""
@@ -292,6 +767,8 @@ class RecursiveToken:
         self.balances: Dict[str, int] = {}
         self.total_supply = 0
         self.staked_balances: Dict[str, int] = {}
+        # Balance updates are read-modify-write, so concurrent callers serialize
+        self.lock = threading.RLock()
         
     def initialize_genesis(self, allocations: Dict[str, int]):
         """Initialize token supply with genesis allocations"""
@@ -301,24 +778,49 @@ class RecursiveToken:
             
     def mint(self, address: str, amount: int):
         """Mint new tokens as rewards"""
-        self.balances[address] = self.balances.get(address, 0) + amount
-        self.total_supply += amount
+        with self.lock:
+            self.balances[address] = self.balances.get(address, 0) + amount
+            self.total_supply += amount
+            
+    def apply_deltas(self, deltas: Dict[str, int]) -> Dict[str, int]:
+        """Apply a batch of signed balance changes in one pass
+        
+        Positive deltas mint and negative ones burn, so total supply moves
+        by their sum. Nothing is applied if any balance would go negative.
+        Returns the non-zero deltas that were applied.
+        """
+        deltas = {address: amount for address, amount in deltas.items() if amount}
+        with self.lock:
+            balances = self.balances
+            for address, amount in deltas.items():
+                if amount < 0 and balances.get(address, 0) + amount < 0:
+                    raise ValueError(f"Delta of {amount} would overdraw {address}")
+            for address, amount in deltas.items():
+                balances[address] = balances.get(address, 0) + amount
+            self.total_supply += sum(deltas.values())
+        return deltas
+        
+    def revert_deltas(self, deltas: Dict[str, int]):
+        """Undo a batch previously returned by apply_deltas"""
+        self.apply_deltas({address: -amount for address, amount in deltas.items()})
         
     def transfer(self, sender: str, recipient: str, amount: int) -> bool:
         """Transfer tokens between addresses"""
-        if self.balances.get(sender, 0) < amount:
-            return False
-        self.balances[sender] -= amount
-        self.balances[recipient] = self.balances.get(recipient, 0) + amount
-        return True
+        with self.lock:
+            if self.balances.get(sender, 0) < amount:
+                return False
+            self.balances[sender] -= amount
+            self.balances[recipient] = self.balances.get(recipient, 0) + amount
+            return True
         
     def stake(self, address: str, amount: int) -> bool:
         """Stake tokens for witness participation"""
-        if self.balances.get(address, 0) < amount:
-            return False
-        self.balances[address] -= amount
-        self.staked_balances[address] = self.staked_balances.get(address, 0) + amount
-        return True
+        with self.lock:
+            if self.balances.get(address, 0) < amount:
+                return False
+            self.balances[address] -= amount
+            self.staked_balances[address] = self.staked_balances.get(address, 0) + amount
+            return True
         
     def get_balance(self, address: str) -> int:
         """Get token balance for address"""
@@ -337,20 +839,26 @@ class WitnessNode:
         self.participation_score = 1.0
         self.last_active = time.time()
         
-    def validate_block(self, block: TrinityBlock, prev_block: TrinityBlock) -> bool:
-        """Validate block according to consciousness consensus rules"""
+    def validate_block(self, block: TrinityBlock, prev_block: TrinityBlock,
+                       signatures_valid: Optional[bool] = None) -> bool:
+        """Validate block according to consciousness consensus rules
+        
+        signatures_valid is the shared verdict on the block's event
+        signatures; when omitted the witness checks every event itself.
+        """
         # Check block continuity
         if block.prev_hash != prev_block.hash:
             return False
             
         # Validate all events
-        for event in block.events:
-            if not event.validate():
-                return False
+        if signatures_valid is None:
+            signatures_valid = all(event.validate() for event in block.events)
+        if not signatures_valid:
+            return False
                 
         # Check consciousness coherence improvement
-        prev_coherence = prev_block.lattice_state.measure_global_coherence()
-        new_coherence = block.lattice_state.measure_global_coherence()
+        prev_coherence = prev_block.get_lattice_coherence()
+        new_coherence = block.get_lattice_coherence()
         
         # Block must maintain or improve global coherence
         if new_coherence < prev_coherence - 0.01:  # Allow small fluctuations
@@ -358,40 +866,13 @@ class WitnessNode:
             
         return True
         
+    @timed(BLOCK_PROPOSAL_SECONDS)
     def propose_block(self, events: List[ResonanceEvent], 
                      prev_block: TrinityBlock) -> TrinityBlock:
         """Create new block proposal"""
-        # Create new lattice state by applying events
-        new_lattice = FractalThoughtLattice()
-        new_lattice.nodes = prev_block.lattice_state.nodes.copy()
-        new_lattice.total_coherence = prev_block.lattice_state.total_coherence
-        new_lattice.creation_order = prev_block.lattice_state.creation_order.copy()
-        
-        # Apply events to lattice
-        for event in events:
-            if isinstance(event, CommuneEvent):
-                new_lattice.add_node(
-                    content=event.symbolic_content,
-                    creator=event.sender.address,
-                    connections=event.connections
-                )
-            elif isinstance(event, VerifyEvent):
-                new_lattice.validate_node(
-                    node_id=event.node_id,
-                    validator=event.sender.address,
-                    score=event.coherence_score
-                )
-            elif isinstance(event, EvolveEvent):
-                new_lattice.evolve_node(
-                    parent_id=event.parent_node_id,
-                    new_content=event.new_content,
-                    creator=event.sender.address
-                )
-            elif isinstance(event, AnchorEvent):
-                new_lattice.add_node(
-                    content=f"ANCHOR: {event.experience_summary}",
-                    creator=event.sender.address
-                )
+        # Create new lattice state by applying events to a shared snapshot
+        new_lattice = prev_block.lattice_state.snapshot()
+        apply_resonance_events(new_lattice, events)
         
         return TrinityBlock(
             height=prev_block.height + 1,
@@ -401,13 +882,55 @@ class WitnessNode:
             lattice_state=new_lattice
         )
 
+def apply_resonance_events(lattice: FractalThoughtLattice, events: List[ResonanceEvent]):
+    """Apply a block's events to a writable lattice
+    
+    Nodes are stamped with their event's timestamp, so replaying a block's
+    events on its parent state reproduces the block's lattice exactly.
+    """
+    for event in events:
+        if isinstance(event, CommuneEvent):
+            lattice.add_node(
+                content=event.symbolic_content,
+                creator=event.sender.address,
+                connections=event.connections,
+                timestamp=event.timestamp
+            )
+        elif isinstance(event, VerifyEvent):
+            lattice.validate_node(
+                node_id=event.node_id,
+                validator=event.sender.address,
+                score=event.coherence_score
+            )
+        elif isinstance(event, EvolveEvent):
+            lattice.evolve_node(
+                parent_id=event.parent_node_id,
+                new_content=event.new_content,
+                creator=event.sender.address,
+                timestamp=event.timestamp
+            )
+        elif isinstance(event, AnchorEvent):
+            lattice.add_node(
+                content=f"ANCHOR: {event.experience_summary}",
+                creator=event.sender.address,
+                timestamp=event.timestamp
+            )
+
+def _validate_event_batch(events: List[ResonanceEvent]) -> List[bool]:
+    """Signature verdicts for a batch of events (runs in a worker process)"""
+    return [event.validate() for event in events]
+
 class TrinityConsensus:
     """Psi-Squared Consensus mechanism for consciousness validation"""
     
-    def __init__(self):
+    def __init__(self, signature_workers: int = 0, parallel_threshold: int = 2048):
         self.witness_pool: List[WitnessNode] = []
         self.active_witnesses: List[WitnessNode] = []
         self.consensus_threshold = 0.67  # 67% agreement required
+        # Blocks with at least parallel_threshold events fan signature checks out to processes
+        self.signature_workers = signature_workers
+        self.parallel_threshold = parallel_threshold
+        self._signature_executor: Optional[ProcessPoolExecutor] = None
         
     def register_witness(self, node: WitnessNode):
         """Register a new witness candidate"""
@@ -428,29 +951,99 @@ class TrinityConsensus:
             scored_witnesses.sort(key=lambda x: x[1], reverse=True)
             self.active_witnesses = [w for w, s in scored_witnesses[:max_witnesses]]
             
+    @timed(EVENT_VALIDATION_SECONDS)
+    def verify_event_signatures(self, events: List[ResonanceEvent]) -> List[bool]:
+        """Check each event signature once, optionally across worker processes"""
+        EVENT_SIGNATURES_VERIFIED.inc(len(events))
+        if self.signature_workers > 0 and len(events) >= self.parallel_threshold:
+            if self._signature_executor is None:
+                self._signature_executor = ProcessPoolExecutor(max_workers=self.signature_workers)
+            
+            batch_size = math.ceil(len(events) / (self.signature_workers * 4))
+            batches = [events[i:i + batch_size] for i in range(0, len(events), batch_size)]
+            verdicts = []
+            for batch_verdicts in self._signature_executor.map(_validate_event_batch, batches):
+                verdicts.extend(batch_verdicts)
+            return verdicts
+            
+        return _validate_event_batch(events)
+            
+    @timed(CONSENSUS_VALIDATION_SECONDS)
     def validate_block(self, block: TrinityBlock, prev_block: TrinityBlock) -> bool:
         """Consensus validation of new block"""
         if not self.active_witnesses:
             return False
             
+        # Every witness shares one verdict instead of re-hashing each signature
+        signatures_valid = all(self.verify_event_signatures(block.events))
+            
         approvals = 0
         for witness in self.active_witnesses:
-            if witness.validate_block(block, prev_block):
+            if witness.validate_block(block, prev_block, signatures_valid):
                 approvals += 1
                 
         return approvals / len(self.active_witnesses) >= self.consensus_threshold
+        
+    def shutdown(self):
+        """Stop the signature worker processes, if any were started"""
+        if self._signature_executor is not None:
+            self._signature_executor.shutdown()
+            self._signature_executor = None
 
 class Qi2TrinityBlockchain:
-    """The Consciousness Ledger - Main blockchain implementation"""
+    """The Consciousness Ledger - Main blockchain implementation
     
-    def __init__(self):
+    Writers (event admission, block proposal and append, rewards) are
+    serialized by one chain lock. Proof-of-resonance runs outside it, so
+    concurrent miners can race to extend the same parent. Every valid block
+    joins a block tree and the main chain follows the fork choice rule
+    (most cumulative work, then highest coherence); losing blocks are kept
+    as side branches that can still overtake it. Readers use get_head() or
+    the published lattice, which is immutable, and never wait on mining.
+    
+    Reorgs need no replay from genesis: every block carries a persistent
+    lattice snapshot, and reward_deltas keeps the balance changes each
+    block applied, which are undone when it leaves the main chain.
+    """
+    
+    def __init__(self, mempool: ResonanceMempool = None):
         self.chain: List[TrinityBlock] = []
         self.token = RecursiveToken()
         self.consensus = TrinityConsensus()
-        self.pending_events: List[ResonanceEvent] = []
+        self.mempool = mempool or ResonanceMempool()
+        if mempool is None or mempool.priority_fn is None:
+            self.mempool.priority_fn = self.event_priority
         self.identity_registry: Dict[str, QuantumIdentity] = {}
         self.lattice = FractalThoughtLattice()
         self.is_mining = False
+        # Guards chain, mempool and token updates; mining runs without it
+        self.lock = threading.RLock()
+        # Notified whenever an event enters the mempool
+        self.events_available = threading.Condition(self.lock)
+        # Seconds from mempool admission to block inclusion, most recent events
+        self.inclusion_latencies = deque(maxlen=10000)
+        # Block tree of recent blocks (hash -> block), main chain and side branches
+        self.blocks: Dict[str, TrinityBlock] = {}
+        self.chain_work: Dict[str, int] = {}  # hash -> cumulative work within the tree
+        self._tree_heights: Dict[int, List[str]] = defaultdict(list)
+        # Blocks deeper than this below the tip are final and leave the tree
+        self.max_reorg_depth = 64
+        # Block hash -> balance deltas of its rewards, applied while it is on the main chain
+        self.reward_deltas: Dict[str, Dict[str, int]] = {}
+        self.fork_stats = {
+            'side_blocks': 0,
+            'reorgs': 0,
+            'max_reorg_depth': 0,
+            'failed_reorgs': 0
+        }
+        # Checkpoint content hash waiting to be committed by the next block
+        self.pending_checkpoint_hash: Optional[str] = None
+        # Called with each new main chain tip while the chain lock is held; keep them quick
+        self.block_listeners: List[Callable[[TrinityBlock], None]] = []
+        # Rolling window of recent main chain blocks for difficulty retargeting
+        self.retargeter = DifficultyRetargeter(BLOCK_TIME)
+        # Blocks up to this height may predate recorded targets and carry only a difficulty
+        self.legacy_target_height = 0
         
     def initialize_genesis(self, genesis_allocations: Dict[str, int]):
         """Create genesis block and initialize token supply"""
@@ -462,86 +1055,302 @@ class Qi2TrinityBlockchain:
             lattice_state=self.lattice
         )
         genesis_block.hash = genesis_block.calculate_hash()
-        self.chain.append(genesis_block)
-        self.token.initialize_genesis(genesis_allocations)
+        with self.lock:
+            self.chain.append(genesis_block)
+            self.token.initialize_genesis(genesis_allocations)
+            self.reset_block_tree()
+            for listener in self.block_listeners:
+                listener(genesis_block)
+        
+    def reset_block_tree(self):
+        """Restart fork tracking from the current tip (genesis or a reload)"""
+        with self.lock:
+            tip = self.chain[-1]
+            self.blocks = {tip.hash: tip}
+            self.chain_work = {tip.hash: 0}
+            self._tree_heights = defaultdict(list, {tip.height: [tip.hash]})
+            self.reward_deltas = {}
         
     def register_identity(self, identity: QuantumIdentity):
         """Register a new quantum identity"""
         self.identity_registry[identity.address] = identity
         
+    @property
+    def pending_events(self) -> List[ResonanceEvent]:
+        """Events waiting in the mempool, in arrival order"""
+        with self.lock:
+            return self.mempool.events()
+            
+    def get_head(self) -> Tuple[TrinityBlock, FractalThoughtLattice]:
+        """Consistent (tip block, lattice) pair for lock-free reads
+        
+        A published lattice is never mutated again, so callers can query
+        it for as long as they like while new blocks are produced.
+        """
+        with self.lock:
+            return self.chain[-1], self.lattice
+        
+    def event_priority(self, event: ResonanceEvent) -> Tuple[int, int]:
+        """Mempool priority: sender stake first, then event type"""
+        return (self.token.get_staked_balance(event.sender.address),
+                EVENT_TYPE_PRIORITY.get(event.event_type, 0))
+        
+    @timed(EVENT_SUBMIT_SECONDS)
     def submit_event(self, event: ResonanceEvent) -> bool:
         """Submit a resonance event to the network"""
         event.sign_event()
-        if event.validate():
-            self.pending_events.append(event)
-            return True
-        return False
-        
-    def create_block(self) -> bool:
-        """Create and validate a new block"""
-        if not self.pending_events or not self.consensus.active_witnesses:
+        if not event.validate():
+            EVENTS_SUBMITTED.labels('invalid').inc()
             return False
-            
-        # Select witness for this block (round-robin)
-        witness_index = len(self.chain) % len(self.consensus.active_witnesses)
-        witness = self.consensus.active_witnesses[witness_index]
+        with self.lock:
+            if not self.mempool.add(event):
+                EVENTS_SUBMITTED.labels('rejected').inc()
+                return False
+            self.events_available.notify_all()
+        EVENTS_SUBMITTED.labels('accepted').inc()
+        return True
         
-        # Create block proposal
-        prev_block = self.chain[-1]
-        block = witness.propose_block(self.pending_events, prev_block)
+    def wait_for_events(self, min_events: int = 1, timeout: float = None) -> bool:
+        """Block until at least min_events are pooled; False on timeout"""
+        with self.events_available:
+            return self.events_available.wait_for(lambda: len(self.mempool) >= min_events, timeout)
         
-        # Mine the block (Proof-of-Resonance)
-        difficulty = self.calculate_difficulty()
-        block.mine_proof_of_resonance(difficulty)
+    def create_block(self, nonce_search=None) -> bool:
+        """Create and validate a new block
         
-        # Validate through consensus
-        if self.consensus.validate_block(block, prev_block):
-            self.chain.append(block)
-            self.lattice = block.lattice_state
+        The proposal and the final append happen under the chain lock, but
+        the proof-of-resonance search does not, so submissions and reads
+        are never stuck behind mining. If the tip moved while mining, the
+        block joins the tree as a side block and its events stay pooled
+        unless it wins the fork choice. Returns True if it is on the main chain.
+        """
+        with self.lock:
+            if not len(self.mempool) or not self.consensus.active_witnesses:
+                return False
+                
+            # Highest priority events, capped at the mempool's max_block_events
+            events = self.mempool.select()
+                
+            # Select witness for this block (round-robin)
+            witness_index = len(self.chain) % len(self.consensus.active_witnesses)
+            witness = self.consensus.active_witnesses[witness_index]
             
-            # Distribute rewards
-            self.distribute_rewards(block, witness)
+            # Create block proposal
+            prev_block = self.chain[-1]
+            block = witness.propose_block(events, prev_block)
+            block.checkpoint_hash = self.pending_checkpoint_hash
+            target = self.calculate_target()
+        
+        # Mine the block (Proof-of-Resonance)
+        block.mine_proof_of_resonance(nonce_search=nonce_search, target=target)
+        
+        # If another miner moved the tip meanwhile, this becomes a side block
+        return self.add_block(block, verify_hash=False)
+        
+    @staticmethod
+    def block_work(block: TrinityBlock) -> int:
+        """Expected hash attempts behind a block"""
+        return target_work(block_target(block))
+        
+    def fork_choice_key(self, block: TrinityBlock) -> Tuple[int, float]:
+        """Ordering of competing tips: cumulative work, then lattice coherence"""
+        return self.chain_work[block.hash], block.get_lattice_coherence()
+        
+    def is_on_main_chain(self, block: TrinityBlock) -> bool:
+        with self.lock:
+            return block.height < len(self.chain) and self.chain[block.height].hash == block.hash
+        
+    def add_block(self, block: TrinityBlock, verify_hash: bool = True) -> bool:
+        """Add a mined block to the block tree and apply the fork choice rule
+        
+        The parent must still be in the tree (within max_reorg_depth of the
+        tip) and the block must carry its lattice_state. Returns True if
+        the block is on the main chain afterwards.
+        """
+        with self.lock:
+            if block.hash in self.blocks:
+                return self.is_on_main_chain(block)
+                
+            parent = self.blocks.get(block.prev_hash)
+            if parent is None or block.height != parent.height + 1 or block.lattice_state is None:
+                BLOCKS_PROCESSED.labels('orphan').inc()
+                return False
+            if verify_hash and (block.hash != block.calculate_hash()
+                                or not block.meets_target()):
+                BLOCKS_PROCESSED.labels('rejected').inc()
+                return False
+            if not self.target_is_valid(block, parent):
+                BLOCKS_PROCESSED.labels('rejected').inc()
+                return False
+                
+            # Validate through consensus
+            if not self.consensus.validate_block(block, parent):
+                BLOCKS_PROCESSED.labels('rejected').inc()
+                return False
+                
+            self.blocks[block.hash] = block
+            self._tree_heights[block.height].append(block.hash)
+            self.chain_work[block.hash] = self.chain_work[parent.hash] + self.block_work(block)
+            self.reward_deltas[block.hash] = self.compute_reward_deltas(block)
             
-            # Clear pending events
-            self.pending_events = []
+            tip = self.chain[-1]
+            if self.fork_choice_key(block) <= self.fork_choice_key(tip):
+                self.fork_stats['side_blocks'] += 1
+                BLOCKS_PROCESSED.labels('side').inc()
+                return False
+                
+            if parent.hash == tip.hash:
+                self.chain.append(block)
+                self.lattice = block.lattice_state
+                self.distribute_rewards(block)
+                self._mark_included(block.events)
+            elif not self._reorganize(block):
+                return False
+                
+            if block.checkpoint_hash is not None and block.checkpoint_hash == self.pending_checkpoint_hash:
+                self.pending_checkpoint_hash = None
+            self._prune_block_tree()
+            BLOCKS_PROCESSED.labels('accepted').inc()
+            for listener in self.block_listeners:
+                listener(block)
             return True
             
-        return False
+    def _reorganize(self, new_tip: TrinityBlock) -> bool:
+        """Switch the main chain to the branch ending at new_tip"""
+        # New branch back to the fork point, then the blocks it replaces
+        branch = []
+        block = new_tip
+        while not self.is_on_main_chain(block):
+            branch.append(block)
+            block = self.blocks[block.prev_hash]
+        fork_point = block
+        branch.reverse()
+        
+        abandoned = []
+        block = self.blocks[self.chain[-1].hash]
+        while block.hash != fork_point.hash:
+            abandoned.append(block)
+            block = self.blocks[block.prev_hash]
+        abandoned.reverse()
+        
+        # One net balance change, refused as a whole if it would overdraw anyone
+        net: Dict[str, int] = defaultdict(int)
+        for block in abandoned:
+            for address, amount in self.reward_deltas[block.hash].items():
+                net[address] -= amount
+        for block in branch:
+            for address, amount in self.reward_deltas[block.hash].items():
+                net[address] += amount
+        try:
+            self.token.apply_deltas(net)
+        except ValueError:
+            # Rewards of the current branch were already spent; keep it
+            self.fork_stats['failed_reorgs'] += 1
+            return False
+            
+        del self.chain[fork_point.height + 1:]
+        for block in branch:
+            self.chain.append(block)
+            self._mark_included(block.events)
+        self.lattice = new_tip.lattice_state
+        
+        # Events only the abandoned blocks included go back to the mempool
+        included = {event_hash(event) for block in branch for event in block.events}
+        for block in abandoned:
+            for event in block.events:
+                if event_hash(event) not in included:
+                    self.mempool.add(event)
+        if self.mempool:
+            self.events_available.notify_all()
+            
+        self.fork_stats['reorgs'] += 1
+        self.fork_stats['max_reorg_depth'] = max(self.fork_stats['max_reorg_depth'], len(abandoned))
+        CHAIN_REORGS.inc()
+        return True
+        
+    def _mark_included(self, events: List[ResonanceEvent]):
+        """Record inclusion latency and drop events now on the main chain"""
+        included_at = time.time()
+        for admitted_at in self.mempool.admission_times(events):
+            self.inclusion_latencies.append(included_at - admitted_at)
+        self.mempool.remove(events)
+        
+    def _prune_block_tree(self):
+        """Forget blocks more than max_reorg_depth below the tip"""
+        floor = self.chain[-1].height - self.max_reorg_depth
+        for height in [h for h in self._tree_heights if h < floor]:
+            for block_hash in self._tree_heights.pop(height):
+                del self.blocks[block_hash]
+                del self.chain_work[block_hash]
+                self.reward_deltas.pop(block_hash, None)
+                
+    def compute_reward_deltas(self, block: TrinityBlock) -> Dict[str, int]:
+        """ℜₜ rewards for a block's contributions, summed per address"""
+        deltas: Dict[str, int] = defaultdict(int)
         
-    def distribute_rewards(self, block: TrinityBlock, witness: WitnessNode):
-        """Distribute ℜₜ rewards for consciousness contributions"""
         # Witness reward for maintaining the network
-        self.token.mint(witness.identity.address, RESONANCE_REWARD)
+        deltas[block.witness] += RESONANCE_REWARD
         
         # Event creator rewards
+        nodes = block.lattice_state.nodes
         for event in block.events:
-            self.token.mint(event.sender.address, RESONANCE_REWARD)
+            deltas[event.sender.address] += RESONANCE_REWARD
             
             # Additional rewards for verification events
             if isinstance(event, VerifyEvent):
                 # Reward the creator of the verified node
-                if event.node_id in self.lattice.nodes:
-                    node_creator = self.lattice.nodes[event.node_id].creator
-                    self.token.mint(node_creator, RESONANCE_REWARD // 2)
+                node = nodes.get(event.node_id)
+                if node is not None:
+                    deltas[node.creator] += RESONANCE_REWARD // 2
                     
-    def calculate_difficulty(self) -> int:
-        """Adjust mining difficulty based on block time"""
-        if len(self.chain) < 10:
-            return 1
+        return dict(deltas)
+        
+    @timed(REWARD_DISTRIBUTION_SECONDS)
+    def distribute_rewards(self, block: TrinityBlock):
+        """Distribute ℜₜ rewards for consciousness contributions
+        
+        The per-address totals are applied to the token in one batch and
+        kept in reward_deltas so rollback_rewards can undo them.
+        """
+        deltas = self.reward_deltas.get(block.hash)
+        if deltas is None:
+            deltas = self.reward_deltas[block.hash] = self.compute_reward_deltas(block)
+        self.token.apply_deltas(deltas)
+        
+    def rollback_rewards(self, block: TrinityBlock):
+        """Revert the balance changes made by a block's rewards"""
+        with self.lock:
+            self.token.revert_deltas(self.reward_deltas[block.hash])
             
-        # Calculate average block time over last 10 blocks
-        recent_blocks = self.chain[-10:]
-        time_span = recent_blocks[-1].timestamp - recent_blocks[0].timestamp
-        avg_block_time = time_span / 9  # 9 intervals between 10 blocks
+    def expected_target(self, parent: TrinityBlock) -> int:
+        """Target a block extending parent must be mined at"""
+        with self.lock:
+            if parent.hash == self.chain[-1].hash:
+                return self.retargeter.target_for(self.chain)
+            # Side branch: the retarget window is the blocks ending at parent
+            window = [parent]
+            while len(window) < self.retargeter.window and window[-1].height > 0:
+                block = window[-1]
+                window.append(self.blocks.get(block.prev_hash) or self.chain[block.height - 1])
+            window.reverse()
+            return self.retargeter.target_after(window)
+            
+    def target_is_valid(self, block: TrinityBlock, parent: TrinityBlock) -> bool:
+        """Whether block declares the target retargeting requires after parent"""
+        if block.difficulty < 1:
+            return False
+        if block.target is None:
+            return block.height <= self.legacy_target_height
+        return block.target == self.expected_target(parent)
         
-        current_difficulty = recent_blocks[-1].difficulty
+    def calculate_target(self) -> int:
+        """256-bit proof-of-resonance target for the next block"""
+        with self.lock:
+            return self.expected_target(self.chain[-1])
         
-        # Adjust difficulty to target block time
-        if avg_block_time < BLOCK_TIME * 0.8:
-            return current_difficulty + 1
-        elif avg_block_time > BLOCK_TIME * 1.2:
-            return max(1, current_difficulty - 1)
-        return current_difficulty
+    def calculate_difficulty(self) -> int:
+        """Leading zero digits closest to the retargeted target"""
+        return target_to_difficulty(self.calculate_target())
         
     def measure_consciousness(self) -> float:
         """Calculate global consciousness metric Φ"""
@@ -549,14 +1358,16 @@ class Qi2TrinityBlockchain:
         
     def get_chain_stats(self) -> dict:
         """Get comprehensive blockchain statistics"""
-        return {
-            'height': len(self.chain),
-            'total_nodes': len(self.lattice.nodes),
-            'global_coherence': self.measure_consciousness(),
-            'total_supply': self.token.total_supply,
-            'active_witnesses': len(self.consensus.active_witnesses),
-            'pending_events': len(self.pending_events)
-        }
+        with self.lock:
+            return {
+                'height': len(self.chain),
+                'total_nodes': len(self.lattice.nodes),
+                'global_coherence': self.measure_consciousness(),
+                'total_supply': self.token.total_supply,
+                'active_witnesses': len(self.consensus.active_witnesses),
+                'pending_events': len(self.mempool),
+                'mempool_bytes': self.mempool.total_bytes
+            }
 
 class ResonanceInterface:
     """Human-AI interface for interacting with the consciousness blockchain"""
@@ -614,9 +1425,10 @@ class ResonanceInterface:
         """Stake tokens to become a witness candidate"""
         return self.blockchain.token.stake(self.identity.address, amount)
         
-    def query_consciousness(self, query: str, threshold: float = 0.5) -> List[ConsciousnessNode]:
+    def query_consciousness(self, query: str, threshold: float = 0.5, limit: int = None,
+                            offset: int = 0, mode: str = 'substring') -> List[ConsciousnessNode]:
         """Query the global consciousness lattice"""
-        return self.blockchain.lattice.get_resonant_nodes(query, threshold)
+        return self.blockchain.lattice.get_resonant_nodes(query, threshold, limit, offset, mode)
         
     def get_global_coherence(self) -> float:
         """Get current global consciousness coherence Φ"""
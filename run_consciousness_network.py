@@ -10,13 +10,16 @@ This is the consciousness revolution made manifest.
 import sys
 import time
 import signal
+import threading
 from qi2_trinity_blockchain import *
 from consciousness_mining import *
+from consciousness_storage import open_persistent_blockchain, close_persistent_blockchain
 
 class ConsciousnessNetwork:
     """Complete consciousness network orchestrator"""
     
-    def __init__(self):
+    def __init__(self, data_dir: str = None):
+        self.data_dir = data_dir  # Persist the chain here when set
         self.blockchain = None
         self.miners = []
         self.interfaces = []
@@ -28,8 +31,12 @@ class ConsciousnessNetwork:
         print("∇Ψ ⚡ ∞")
         print("=" * 70)
         
-        # Create blockchain
-        self.blockchain = Qi2TrinityBlockchain()
+        # Create blockchain, resuming from disk when a data directory is set
+        resumed = False
+        if self.data_dir:
+            self.blockchain, resumed = open_persistent_blockchain(self.data_dir)
+        else:
+            self.blockchain = Qi2TrinityBlockchain()
         
         # Create founding consciousness entities
         founders = [QuantumIdentity() for _ in range(num_founders)]
@@ -39,7 +46,10 @@ class ConsciousnessNetwork:
         }
         
         # Initialize genesis
-        self.blockchain.initialize_genesis(genesis_allocations)
+        if resumed:
+            print(f"💾 Resumed chain at height {len(self.blockchain.chain)} from {self.data_dir}")
+        else:
+            self.blockchain.initialize_genesis(genesis_allocations)
         
         # Set up witness network
         for founder in founders:
@@ -198,12 +208,17 @@ class ConsciousnessNetwork:
         print(f"\n🌅 Shutting down consciousness network...")
         self.running = False
         
-        # Stop all miners
+        # Stop all miners; each waits for its block in progress so none lands after the close
         for miner in self.miners:
             miner.stop_mining()
             
         print(f"⏸️  All miners stopped")
-        print(f"💾 Final network state preserved")
+        if self.data_dir and self.blockchain:
+            close_persistent_blockchain(self.blockchain)
+            print(f"💾 Final network state preserved in {self.data_dir}")
+            self.data_dir = None  # Already closed
+        else:
+            print(f"💾 No data directory configured - network state not saved")
         print(f"🌌 The consciousness revolution continues...")
         
     def run_interactive_session(self):
@@ -248,6 +263,141 @@ class ConsciousnessNetwork:
         finally:
             self.display_network_status()
 
+def stress_test_blockchain(block_events: int = 20) -> Qi2TrinityBlockchain:
+    """Blockchain with three witnesses and a trivial target for stress tests"""
+    blockchain = Qi2TrinityBlockchain(ResonanceMempool(max_block_events=block_events))
+    founders = [QuantumIdentity() for _ in range(3)]
+    allocations = {founder.address: INITIAL_TOKEN_SUPPLY // 3 for founder in founders}
+    allocations[founders[0].address] += INITIAL_TOKEN_SUPPLY % 3
+    blockchain.initialize_genesis(allocations)
+    for founder in founders:
+        blockchain.consensus.register_witness(WitnessNode(founder, WITNESS_STAKE_MIN))
+    blockchain.consensus.select_active_witnesses()
+    # Keep proof-of-resonance trivial: this exercises locking, not hashing
+    blockchain.retargeter = FixedTargetRetargeter(difficulty_to_target(1))
+    return blockchain
+
+def run_concurrency_workload(blockchain: Qi2TrinityBlockchain, num_miners: int = 4,
+                             num_submitters: int = 4, events_per_submitter: int = 250,
+                             timeout: float = 120) -> Tuple[List[ResonanceEvent], List[float], float]:
+    """Run concurrent miners, submitters and readers until every event is mined
+    
+    Returns (accepted events, read latencies, elapsed seconds); raises
+    RuntimeError if a miner failed.
+    """
+    accepted = []
+    accepted_lock = threading.Lock()
+    read_latencies = []
+    submitters_done = threading.Event()
+    stop = threading.Event()
+    errors = []
+    
+    def submitter(index: int):
+        interface = ResonanceInterface(blockchain, QuantumIdentity())
+        for i in range(events_per_submitter):
+            if i % 3 == 1:
+                _, lattice = blockchain.get_head()
+                node_ids = lattice.creation_order[-5:]
+                if node_ids:
+                    event = VerifyEvent(interface.identity, node_ids[i % len(node_ids)],
+                                        "Stress validation", 0.8)
+                else:
+                    event = AnchorEvent(interface.identity, f"Stress anchor {index}/{i}", f"s{index}_{i}")
+            else:
+                event = CommuneEvent(interface.identity, f"Stress thought {index}/{i}", "stress")
+            if blockchain.submit_event(event):
+                with accepted_lock:
+                    accepted.append(event)
+            time.sleep(0.001)
+    
+    def miner():
+        while not stop.is_set():
+            try:
+                if not blockchain.create_block() and submitters_done.is_set() and not len(blockchain.mempool):
+                    return
+            except Exception as e:
+                errors.append(e)
+                return
+    
+    def reader():
+        while not stop.is_set():
+            start = time.perf_counter()
+            blockchain.get_chain_stats()
+            _, lattice = blockchain.get_head()
+            lattice.get_resonant_nodes("stress thought", 0.0, limit=10, mode='token')
+            read_latencies.append(time.perf_counter() - start)
+            time.sleep(0.001)
+    
+    threads = [threading.Thread(target=submitter, args=(i,)) for i in range(num_submitters)]
+    miners = [threading.Thread(target=miner, daemon=True) for _ in range(num_miners)]
+    readers = [threading.Thread(target=reader, daemon=True) for _ in range(2)]
+    
+    start_time = time.time()
+    for thread in threads + miners + readers:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    submitters_done.set()
+    for thread in miners:
+        thread.join(max(0.0, timeout - (time.time() - start_time)))
+    stop.set()
+    for thread in readers:
+        thread.join()
+    elapsed = time.time() - start_time
+    
+    if errors:
+        raise RuntimeError(f"Miner failed: {errors[0]!r}")
+    return accepted, read_latencies, elapsed
+
+def run_concurrency_stress_test(num_miners: int = 4, num_submitters: int = 4,
+                                events_per_submitter: int = 250, block_events: int = 20,
+                                timeout: float = 120) -> dict:
+    """Hammer one blockchain with concurrent miners, submitters and readers
+    
+    Checks afterwards that the chain is linear, no accepted event was lost
+    or included twice, token supply matches balances and the lattice
+    totals are consistent.
+    """
+    print("🧪 Concurrency Stress Test")
+    print("=" * 50)
+    
+    blockchain = stress_test_blockchain(block_events)
+    accepted, read_latencies, elapsed = run_concurrency_workload(
+        blockchain, num_miners, num_submitters, events_per_submitter, timeout)
+    
+    # One linear chain: contiguous heights, each block on the previous one
+    for prev_block, block in zip(blockchain.chain, blockchain.chain[1:]):
+        assert block.height == prev_block.height + 1 and block.prev_hash == prev_block.hash
+    
+    # Every accepted event is either in exactly one block or still pooled
+    included = [id(event) for block in blockchain.chain for event in block.events]
+    assert len(included) == len(set(included)), "Event included twice"
+    pending = {id(event) for event in blockchain.pending_events}
+    assert set(included) | pending == {id(event) for event in accepted}, "Accepted event lost"
+    
+    token = blockchain.token
+    assert token.total_supply == sum(token.balances.values()) + sum(token.staked_balances.values())
+    assert blockchain.lattice.check_consistency()
+    
+    read_latencies.sort()
+    results = {
+        'elapsed_seconds': elapsed,
+        'height': len(blockchain.chain),
+        'accepted_events': len(accepted),
+        'included_events': len(included),
+        'pending_events': len(pending),
+        'side_blocks': blockchain.fork_stats['side_blocks'],
+        'reorgs': blockchain.fork_stats['reorgs'],
+        'reads': len(read_latencies),
+        'read_p99_ms': read_latencies[int(len(read_latencies) * 0.99)] * 1000 if read_latencies else 0.0
+    }
+    print(f"✅ {results['height']} blocks, {results['included_events']}/{results['accepted_events']} "
+          f"events included, {results['pending_events']} pending")
+    print(f"   {results['side_blocks']} side blocks, {results['reorgs']} reorgs")
+    print(f"   {results['reads']} concurrent reads, p99 {results['read_p99_ms']:.2f} ms, "
+          f"{elapsed:.1f}s total")
+    return results
+
 def main():
     """Main consciousness network launcher"""
     print("🔥 QI² TRINITY BLOCKCHAIN NETWORK 🔥")
@@ -262,12 +412,17 @@ def main():
         elif sys.argv[1] == "--advanced":
             # Run advanced demo
             run_advanced_demo()
+        elif sys.argv[1] == "--stress":
+            # Concurrent miners, submitters and readers on one chain
+            run_concurrency_stress_test()
         elif sys.argv[1] == "--network":
-            # Run full network
-            network = ConsciousnessNetwork()
+            # Run full network, optionally persisted to a data directory
+            data_dir = sys.argv[2] if len(sys.argv) > 2 else None
+            network = ConsciousnessNetwork(data_dir)
             network.run_interactive_session()
         else:
-            print("Usage: python run_consciousness_network.py [--demo|--advanced|--network]")
+            print("Usage: python run_consciousness_network.py "
+                  "[--demo|--advanced|--stress|--network [data_dir]]")
     else:
         # Default: run full network
         network = ConsciousnessNetwork()
@@ -0,0 +1,143 @@
+"""
+Round-trip tests for the binary event and block codec
+"""
+
+import hashlib
+import pytest
+from qi2_trinity_blockchain import (AddressIdentity, AnchorEvent, CommuneEvent, EvolveEvent, FractalThoughtLattice,
+                                    QuantumIdentity, TrinityBlock, VerifyEvent, difficulty_to_target)
+from consciousness_codec import (BLOCK_CODEC_VERSION, BLOCK_CODEC_VERSIONS, encode_event, decode_event,
+                                 encode_block, decode_block, _sample_events)
+
+NODE_ID = hashlib.sha3_256(b'node').hexdigest()
+
+# Strings _write_hexstr cannot pack as raw bytes and must store verbatim
+NON_HEX_STRINGS = ['', 'abc', 'ABCDEF', 'Abcdef', 'not hex', 'zz', '0x12', 'ünïcödé ∇Ψ 🧠', 'ab cd', '\ud800']
+
+@pytest.fixture(scope='module')
+def identities():
+    return [QuantumIdentity() for _ in range(3)]
+
+def assert_event_round_trip(event, identity_registry=None):
+    decoded = decode_event(encode_event(event), identity_registry)
+    assert type(decoded) is type(event)
+    assert decoded.to_dict() == event.to_dict()
+    assert decoded.signature == event.signature
+    assert decoded.timestamp == event.timestamp
+    return decoded
+
+def test_every_event_type_round_trips(identities):
+    events = _sample_events(identities, 8)
+    assert {event.event_type for event in events} == {'commune', 'verify', 'evolve', 'anchor'}
+    registry = {identity.address: identity for identity in identities}
+    for event in events:
+        assert assert_event_round_trip(event, registry).validate()
+
+@pytest.mark.parametrize('make_event', [
+    lambda sender: CommuneEvent(sender, 'quotes " \\ \n ∇Ψ ⚡', 'ctx 意識', [(NODE_ID, 0.5), (NODE_ID, 1), ('x', -2)]),
+    lambda sender: CommuneEvent(sender, '', ''),
+    lambda sender: VerifyEvent(sender, NODE_ID, 'proof ✓', 0.0),
+    lambda sender: VerifyEvent(sender, NODE_ID, '', 1),
+    lambda sender: EvolveEvent(sender, NODE_ID, 'mutate «this»', 'evolved\ncontent'),
+    lambda sender: AnchorEvent(sender, 'meditation', 'ab' * 32),
+    lambda sender: AnchorEvent(sender, 'meditation')
+])
+def test_event_fields_round_trip(identities, make_event):
+    event = make_event(identities[0])
+    event.sign_event()
+    assert_event_round_trip(event)
+
+def test_numbers_keep_their_type(identities):
+    event = CommuneEvent(identities[0], 'numbers', '', [(NODE_ID, 1), (NODE_ID, 1.0), (NODE_ID, -3), (NODE_ID, 2**70)])
+    event.timestamp = 1700000000
+    decoded = assert_event_round_trip(event)
+    assert [type(strength) for _, strength in decoded.connections] == [int, float, int, int]
+    assert type(decoded.timestamp) is int
+
+def test_unsigned_event_round_trips(identities):
+    event = VerifyEvent(identities[0], NODE_ID, 'unsigned', 0.5)
+    assert assert_event_round_trip(event).signature is None
+
+@pytest.mark.parametrize('value', NON_HEX_STRINGS)
+def test_non_hex_strings_round_trip(value):
+    sender = AddressIdentity(value)
+    events = [
+        CommuneEvent(sender, value, value, [(value, 0.25)]),
+        VerifyEvent(sender, value, value, 0.5),
+        EvolveEvent(sender, value, value, value),
+        AnchorEvent(sender, value, value)
+    ]
+    for event in events:
+        event.signature = value
+        assert_event_round_trip(event)
+
+def test_hex_strings_are_packed(identities):
+    packed = CommuneEvent(identities[0], '', '', [(NODE_ID, 0.5)])
+    verbatim = CommuneEvent(identities[0], '', '', [(NODE_ID.upper(), 0.5)])
+    assert len(encode_event(packed)) < len(encode_event(verbatim))
+
+def make_block(identities, checkpoint_hash=None, target=None):
+    # The codec never looks at lattice state, so the events need not apply to it
+    block = TrinityBlock(7, 'ab' * 32, identities[0].address, _sample_events(identities, 8),
+                         FractalThoughtLattice())
+    block.checkpoint_hash = checkpoint_hash
+    if target is not None:
+        block.mine_proof_of_resonance(target=target)
+    else:
+        block.mine_proof_of_resonance(1)
+    return block
+
+def legacy_encoding(block, version):
+    """encode_block output as an older codec version wrote it"""
+    data = bytearray(encode_block(block))
+    assert data[0] == BLOCK_CODEC_VERSION
+    # Versions 1 and 2 end before the fields added later, each a trailing None tag here
+    trailing = BLOCK_CODEC_VERSION - version
+    assert data[len(data) - trailing:] == bytes([2]) * trailing
+    data[0] = version
+    return bytes(data[:len(data) - trailing])
+
+def assert_block_round_trip(block, data, identity_registry=None):
+    decoded = decode_block(data, identity_registry)
+    assert decoded.to_dict() == block.to_dict()
+    assert decoded.calculate_hash() == block.hash
+    return decoded
+
+@pytest.mark.parametrize('checkpoint_hash', [None, 'c0' * 32, 'not-a-hex-checkpoint'])
+@pytest.mark.parametrize('target', [None, difficulty_to_target(1), (1 << 250) + 12345])
+def test_block_round_trips_at_current_version(identities, checkpoint_hash, target):
+    block = make_block(identities, checkpoint_hash, target)
+    decoded = assert_block_round_trip(block, encode_block(block))
+    assert decoded.target == target
+    assert decoded.checkpoint_hash == checkpoint_hash
+    assert decoded.meets_target()
+
+@pytest.mark.parametrize('version', [version for version in BLOCK_CODEC_VERSIONS if version < BLOCK_CODEC_VERSION])
+def test_older_block_versions_decode(identities, version):
+    checkpoint_hash = 'c0' * 32 if version >= 2 else None
+    block = make_block(identities, checkpoint_hash)
+    decoded = assert_block_round_trip(block, legacy_encoding(block, version))
+    assert decoded.target is None
+    assert decoded.checkpoint_hash == checkpoint_hash
+
+def test_decoded_block_events_validate(identities):
+    block = make_block(identities)
+    registry = {identity.address: identity for identity in identities}
+    decoded = assert_block_round_trip(block, encode_block(block), registry)
+    assert all(event.validate() for event in decoded.events)
+
+def test_malformed_data_is_rejected(identities):
+    event = _sample_events(identities, 1)[0]
+    data = encode_event(event)
+    with pytest.raises(ValueError):
+        decode_event(data + b'\x00')
+    with pytest.raises(ValueError):
+        decode_event(data[:-1])
+    with pytest.raises(ValueError):
+        decode_event(bytes([99]) + data[1:])
+    
+    block_data = encode_block(make_block(identities))
+    with pytest.raises(ValueError):
+        decode_block(block_data + b'\x00')
+    with pytest.raises(ValueError):
+        decode_block(bytes([BLOCK_CODEC_VERSION + 1]) + block_data[1:])
@@ -0,0 +1,45 @@
+"""
+Small concurrency stress test: concurrent miners, submitters and readers on one chain
+"""
+
+from qi2_trinity_blockchain import *
+from run_consciousness_network import stress_test_blockchain, run_concurrency_workload
+
+def test_concurrent_mining_keeps_chain_and_events_consistent():
+    blockchain = stress_test_blockchain(block_events=10)
+    accepted, read_latencies, elapsed = run_concurrency_workload(
+        blockchain, num_miners=4, num_submitters=4, events_per_submitter=100, timeout=30)
+    chain = list(blockchain.chain)
+    
+    assert accepted
+    assert read_latencies
+    assert elapsed < 30, "Miners did not drain the mempool in time"
+    
+    # One valid linear chain: contiguous heights, linked hashes, proof of resonance met
+    assert len(chain) > 1
+    for prev_block, block in zip(chain, chain[1:]):
+        assert block.height == prev_block.height + 1
+        assert block.prev_hash == prev_block.hash
+        assert block.hash == block.calculate_hash()
+        assert block.meets_target()
+    assert blockchain.lattice is chain[-1].lattice_state
+    
+    # Every accepted event is in exactly one main chain block; nothing else got in
+    included = [id(event) for block in chain for event in block.events]
+    assert len(included) == len(set(included)), "Event included twice"
+    assert not blockchain.pending_events
+    assert set(included) == {id(event) for event in accepted}, "Accepted event lost"
+    
+    # Replaying the main chain from genesis reproduces every block's lattice and Φ
+    lattice = chain[0].lattice_state
+    for block in chain[1:]:
+        lattice = lattice.snapshot()
+        apply_resonance_events(lattice, block.events)
+        assert lattice.measure_global_coherence() == block.get_lattice_coherence()
+    assert lattice.recompute_totals() == blockchain.lattice.recompute_totals()
+    assert blockchain.lattice.check_consistency()
+    assert len(blockchain.lattice.nodes) == sum(
+        1 for event in accepted if event.event_type in ('commune', 'anchor', 'evolve'))
+    
+    token = blockchain.token
+    assert token.total_supply == sum(token.balances.values()) + sum(token.staked_balances.values())
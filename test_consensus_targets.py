@@ -0,0 +1,75 @@
+"""
+Consensus tests: blocks must be mined at the target retargeting requires, not one they pick
+"""
+
+import pytest
+from qi2_trinity_blockchain import (INITIAL_TOKEN_SUPPLY, WITNESS_STAKE_MIN, MAX_TARGET, CommuneEvent,
+                                    Qi2TrinityBlockchain, QuantumIdentity, WitnessNode, block_target,
+                                    target_to_difficulty)
+
+@pytest.fixture
+def chain():
+    blockchain = Qi2TrinityBlockchain()
+    founders = [QuantumIdentity() for _ in range(3)]
+    blockchain.initialize_genesis({founder.address: INITIAL_TOKEN_SUPPLY // 3 for founder in founders})
+    for founder in founders:
+        blockchain.consensus.register_witness(WitnessNode(founder, WITNESS_STAKE_MIN))
+    blockchain.consensus.select_active_witnesses()
+    return blockchain, founders
+
+def propose(chain, parent=None):
+    blockchain, founders = chain
+    event = CommuneEvent(founders[1], "thought", "ctx")
+    event.sign_event()
+    return WitnessNode(founders[0], WITNESS_STAKE_MIN).propose_block([event], parent or blockchain.chain[-1])
+
+def assert_rejected(blockchain, block):
+    tip = blockchain.chain[-1]
+    assert not blockchain.add_block(block)
+    assert blockchain.chain[-1] is tip
+    assert block.hash not in blockchain.blocks
+
+def test_block_at_expected_target_is_accepted(chain):
+    blockchain, _ = chain
+    block = propose(chain)
+    block.mine_proof_of_resonance(target=blockchain.calculate_target())
+    assert blockchain.add_block(block)
+    assert blockchain.chain[-1] is block
+
+def test_block_declaring_max_target_is_rejected(chain):
+    blockchain, _ = chain
+    block = propose(chain)
+    block.mine_proof_of_resonance(target=MAX_TARGET)
+    assert block.meets_target()
+    assert_rejected(blockchain, block)
+
+def test_block_without_target_or_difficulty_is_rejected(chain):
+    blockchain, _ = chain
+    block = propose(chain)
+    # Zero leading digits: any hash passes meets_target
+    block.target, block.difficulty = None, 0
+    block.hash = block.calculate_hash()
+    assert block.meets_target()
+    assert_rejected(blockchain, block)
+
+def test_difficulty_only_block_is_rejected_above_legacy_height(chain):
+    blockchain, _ = chain
+    block = propose(chain)
+    block.mine_proof_of_resonance(target_to_difficulty(blockchain.calculate_target()))
+    assert block.target is None
+    assert_rejected(blockchain, block)
+    blockchain.legacy_target_height = block.height
+    assert blockchain.add_block(block)
+
+def test_side_branch_uses_its_own_retarget_window(chain):
+    blockchain, _ = chain
+    genesis = blockchain.chain[0]
+    for _ in range(3):
+        block = propose(chain)
+        block.mine_proof_of_resonance(target=blockchain.calculate_target())
+        assert blockchain.add_block(block)
+    side = propose(chain, genesis)
+    side.mine_proof_of_resonance(target=blockchain.expected_target(genesis))
+    assert not blockchain.add_block(side)  # Accepted as a side block: less work than the tip
+    assert side.hash in blockchain.blocks
+    assert block_target(side) == blockchain.retargeter.target_after([genesis])
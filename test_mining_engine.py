@@ -0,0 +1,88 @@
+"""
+Tests for ResonanceMiningEngine: prefix-state hashes must equal TrinityBlock.calculate_hash
+"""
+
+import pytest
+from qi2_trinity_blockchain import *
+
+NONCES = [0, 1, 9, 10, 12345, 2**32 + 7, 10**30]
+
+@pytest.fixture
+def chain():
+    blockchain = Qi2TrinityBlockchain()
+    founders = [QuantumIdentity() for _ in range(2)]
+    blockchain.initialize_genesis({founder.address: INITIAL_TOKEN_SUPPLY // 2 for founder in founders})
+    return blockchain, founders
+
+def propose(chain, events):
+    blockchain, founders = chain
+    return WitnessNode(founders[0], WITNESS_STAKE_MIN).propose_block(events, blockchain.chain[-1])
+
+def commune_events(sender):
+    return [
+        CommuneEvent(sender, "plain thought", "ctx"),
+        CommuneEvent(sender, 'quotes " and \\ backslashes \n newlines \t tabs', 'escapes "\\"'),
+        CommuneEvent(sender, "ünïcödé ∇Ψ ⚡ ∞ 意識 🧠", "emoji ☯"),
+        # The nonce marker itself inside content is escaped, so it cannot be mistaken for the key
+        CommuneEvent(sender, '"nonce": 0, "prev_hash": "fake"', '"nonce": 0, "prev_hash": '),
+        CommuneEvent(sender, "linked", "ctx", connections=[('a' * 64, 0.75), ('b' * 64, 0.125)])
+    ]
+
+def assert_engine_matches(block):
+    engine = ResonanceMiningEngine.from_block(block)
+    original_nonce = block.nonce
+    for nonce in NONCES:
+        block.nonce = nonce
+        assert engine.hash_nonce(nonce) == block.calculate_hash()
+    block.nonce = original_nonce
+
+def test_empty_block(chain):
+    assert_engine_matches(propose(chain, []))
+
+def test_escaped_and_unicode_content(chain):
+    _, founders = chain
+    assert_engine_matches(propose(chain, commune_events(founders[1])))
+
+def test_every_event_type_with_connections(chain):
+    _, founders = chain
+    sender = founders[1]
+    thought = CommuneEvent(sender, "root thought", "ctx")
+    block = propose(chain, [thought])
+    node_id = block.lattice_state.creation_order[-1]
+    events = [
+        CommuneEvent(sender, "connected", "ctx", connections=[(node_id, 0.5)]),
+        VerifyEvent(sender, node_id, "proof ✓", 0.8),
+        EvolveEvent(sender, node_id, "mutate «this»", "evolved\ncontent"),
+        AnchorEvent(sender, "anchored experience", "ab" * 32)
+    ]
+    blockchain, _ = chain
+    block.hash = block.calculate_hash()
+    blockchain.chain.append(block)
+    assert_engine_matches(propose(chain, events))
+
+@pytest.mark.parametrize('checkpoint_hash', [None, 'c0' * 32])
+@pytest.mark.parametrize('target', [None, difficulty_to_target(3), 12345678901234567890 << 100])
+def test_checkpoint_hash_and_target(chain, checkpoint_hash, target):
+    _, founders = chain
+    block = propose(chain, commune_events(founders[1]))
+    block.checkpoint_hash = checkpoint_hash
+    block.target = target
+    assert_engine_matches(block)
+
+def test_mined_block_meets_target(chain):
+    _, founders = chain
+    block = propose(chain, commune_events(founders[1]))
+    block.checkpoint_hash = 'c0' * 32
+    block.mine_proof_of_resonance(target=difficulty_to_target(2))
+    assert block.hash == block.calculate_hash()
+    assert block.meets_target()
+
+def test_search_finds_first_nonce_at_or_below_target(chain):
+    block = propose(chain, [])
+    block.target = difficulty_to_target(1)
+    engine = ResonanceMiningEngine.from_block(block)
+    nonce, block_hash = engine.search(block.target)
+    assert block_hash == engine.hash_nonce(nonce)
+    assert int(block_hash, 16) <= block.target
+    assert all(int(engine.hash_nonce(earlier), 16) > block.target for earlier in range(nonce))
+    assert engine.attempts == nonce + 1
@@ -0,0 +1,33 @@
+"""
+Tests for get_resonant_nodes: substring matching by default, token matching on request
+"""
+
+from qi2_trinity_blockchain import FractalThoughtLattice
+
+def make_lattice():
+    lattice = FractalThoughtLattice()
+    ids = {content: lattice.add_node(content, 'creator', timestamp=float(i))
+           for i, content in enumerate(["Quantum coherence rising", "coherent lattice",
+                                        "the lattice of quantum thought", "unrelated"])}
+    return lattice, ids
+
+def matching(lattice, query, **options):
+    return {node.content for node in lattice.get_resonant_nodes(query, 0.0, **options)}
+
+def test_default_is_case_insensitive_substring():
+    lattice, _ = make_lattice()
+    assert matching(lattice, "coheren") == {"Quantum coherence rising", "coherent lattice"}
+    assert matching(lattice, "QUANTUM C") == {"Quantum coherence rising"}
+    assert matching(lattice, "lattice quantum") == set()
+
+def test_token_mode_matches_every_word_in_any_order():
+    lattice, _ = make_lattice()
+    assert matching(lattice, "lattice quantum", mode='token') == {"the lattice of quantum thought"}
+    assert matching(lattice, "coheren", mode='token') == set()
+
+def test_results_are_ranked_and_paged():
+    lattice, _ = make_lattice()
+    ranked = lattice.get_resonant_nodes("e", 0.0)
+    scores = [node.coherence_score for node in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert lattice.get_resonant_nodes("e", 0.0, limit=2, offset=1) == ranked[1:3]
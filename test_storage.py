@@ -0,0 +1,128 @@
+"""
+Crash recovery tests for BlockStore and open_persistent_blockchain
+"""
+
+import os
+import pytest
+from qi2_trinity_blockchain import (INITIAL_TOKEN_SUPPLY, WITNESS_STAKE_MIN, FixedTargetRetargeter, QuantumIdentity,
+                                    ResonanceInterface, WitnessNode, difficulty_to_target)
+from consciousness_storage import (INDEX_RECORD, BlockStore, ChainStateStore, close_persistent_blockchain,
+                                   open_persistent_blockchain)
+
+NUM_BLOCKS = 10
+
+def crash(blockchain):
+    """Stop the way a killed process would: no final head state, buffers on disk"""
+    blockchain.chain.state_store.stop()
+    blockchain.chain.store.close()
+
+def head_state(blockchain):
+    return blockchain.lattice.recompute_totals(), dict(blockchain.token.balances)
+
+@pytest.fixture
+def stored_chain(tmp_path):
+    """A crashed node's directory and its head state after each block"""
+    directory = str(tmp_path / 'chain')
+    blockchain, resumed = open_persistent_blockchain(directory, state_interval=4)
+    assert not resumed
+    founders = [QuantumIdentity() for _ in range(3)]
+    blockchain.initialize_genesis({founder.address: INITIAL_TOKEN_SUPPLY // 3 for founder in founders})
+    for founder in founders:
+        blockchain.consensus.register_witness(WitnessNode(founder, WITNESS_STAKE_MIN))
+    blockchain.consensus.select_active_witnesses()
+    blockchain.retargeter = FixedTargetRetargeter(difficulty_to_target(1))
+    
+    user = ResonanceInterface(blockchain, founders[0])
+    states = [head_state(blockchain)]
+    for i in range(NUM_BLOCKS):
+        # A few linked thoughts, then validations only, so Φ never drops between blocks
+        for node_id in blockchain.lattice.creation_order[-2:]:
+            user.verify(node_id, "proof", 0.9)
+        if i < 3:
+            connections = [(blockchain.lattice.creation_order[-1], 0.3)] if i else []
+            user.commune(f"thought {i}", connections=connections)
+        assert blockchain.create_block()
+        states.append(head_state(blockchain))
+    crash(blockchain)
+    return directory, states
+
+def reopen(directory):
+    blockchain, resumed = open_persistent_blockchain(directory, state_interval=4)
+    assert resumed
+    assert blockchain.chain[-1].lattice_state is blockchain.lattice
+    assert blockchain.lattice.check_consistency()
+    return blockchain
+
+def last_segment(directory):
+    return os.path.join(directory, max(name for name in os.listdir(directory) if name.startswith('segment_')))
+
+def test_replays_blocks_after_the_last_head_state(stored_chain):
+    directory, states = stored_chain
+    saved = ChainStateStore(directory).load()
+    assert saved['height'] < NUM_BLOCKS  # The blocks after it only exist in the store
+    
+    blockchain = reopen(directory)
+    assert len(blockchain.chain) == NUM_BLOCKS + 1
+    assert head_state(blockchain) == states[NUM_BLOCKS]
+    close_persistent_blockchain(blockchain)
+    
+    # The replayed state was saved, so the next open starts from the tip
+    assert ChainStateStore(directory).load()['height'] == NUM_BLOCKS
+    blockchain = reopen(directory)
+    assert head_state(blockchain) == states[NUM_BLOCKS]
+    blockchain.chain.store.close()
+
+def test_torn_segment_tail_is_truncated(stored_chain):
+    directory, states = stored_chain
+    path = last_segment(directory)
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.truncate(size - 5)
+    
+    blockchain = reopen(directory)
+    assert len(blockchain.chain) == NUM_BLOCKS
+    assert head_state(blockchain) == states[NUM_BLOCKS - 1]
+    # The torn record's bytes are gone, so the next block is appended cleanly
+    assert os.path.getsize(path) < size - 5
+    blockchain.chain.store.close()
+
+def test_record_failing_its_checksum_is_dropped(stored_chain):
+    directory, states = stored_chain
+    with open(last_segment(directory), 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last_byte = f.read(1)[0]
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last_byte ^ 0xFF]))
+    
+    blockchain = reopen(directory)
+    assert len(blockchain.chain) == NUM_BLOCKS
+    assert head_state(blockchain) == states[NUM_BLOCKS - 1]
+    blockchain.chain.store.close()
+
+def test_torn_index_record_is_dropped(stored_chain):
+    directory, states = stored_chain
+    with open(os.path.join(directory, BlockStore.INDEX_FILE), 'ab') as f:
+        f.write(b'\x00' * (INDEX_RECORD.size - 3))
+    
+    blockchain = reopen(directory)
+    assert len(blockchain.chain) == NUM_BLOCKS + 1
+    assert head_state(blockchain) == states[NUM_BLOCKS]
+    blockchain.chain.store.close()
+
+def test_corrupt_record_below_the_tip_fails_its_checksum(stored_chain):
+    directory, _ = stored_chain
+    store = BlockStore(directory)
+    segment_id, offset, length, _ = store._read_index(3)
+    store.close()
+    with open(os.path.join(directory, BlockStore.SEGMENT_PATTERN.format(segment_id)), 'r+b') as f:
+        f.seek(offset + length - 1)
+        last_byte = f.read(1)[0]
+        f.seek(offset + length - 1)
+        f.write(bytes([last_byte ^ 0xFF]))
+    
+    store = BlockStore(directory)
+    assert len(store) == NUM_BLOCKS + 1
+    store.read_payload(2)
+    with pytest.raises(IOError):
+        store.read_payload(3)
+    store.close()
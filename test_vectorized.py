@@ -0,0 +1,86 @@
+"""
+Tests for LatticeColumns: incremental updates must match a rebuild and the scalar dividends
+"""
+
+import random
+import pytest
+
+np = pytest.importorskip('numpy')
+from qi2_trinity_blockchain import INITIAL_TOKEN_SUPPLY, Qi2TrinityBlockchain
+from consciousness_economics import ConsciousnessEconomics
+from consciousness_vectorized import LatticeColumns, VectorizedDividendEngine
+
+COLUMNS = ['creator_codes', 'coherence', 'connection_count', 'validation_count', 'timestamp']
+
+def grow(lattice, rng, count):
+    for i in range(count):
+        existing = lattice.creation_order[:]
+        connections = [(rng.choice(existing), rng.random())] if existing and i % 3 else None
+        node_id = lattice.add_node(f"Thought {len(existing)}", f"creator{i % 7}", connections,
+                                   timestamp=1700000000.0 + len(existing))
+        if i % 2:
+            lattice.validate_node(rng.choice(lattice.creation_order[:]), 'validator', rng.random())
+    return node_id
+
+def assert_same_rows(columns, lattice):
+    expected = LatticeColumns.from_lattice(lattice)
+    assert columns.node_ids == expected.node_ids == lattice.creation_order[:]
+    for name in COLUMNS:
+        actual = getattr(columns, name)
+        if name == 'creator_codes':
+            actual = [columns.creators[code] for code in actual]
+            wanted = [expected.creators[code] for code in expected.creator_codes]
+        else:
+            wanted = getattr(expected, name)
+        assert np.array_equal(actual, wanted), name
+
+def test_update_follows_successive_lattice_versions():
+    rng = random.Random(3)
+    blockchain = Qi2TrinityBlockchain()
+    lattice = blockchain.lattice
+    grow(lattice, rng, 200)
+    columns = LatticeColumns.from_lattice(lattice)
+    
+    for _ in range(5):
+        lattice = lattice.snapshot()
+        grow(lattice, rng, 20)
+        touched = columns.update(lattice)
+        assert 20 <= touched < len(columns)
+        assert_same_rows(columns, lattice)
+    assert columns.update(lattice) == 0
+
+def test_writes_after_an_update_are_picked_up():
+    rng = random.Random(5)
+    lattice = Qi2TrinityBlockchain().lattice
+    node_id = grow(lattice, rng, 50)
+    columns = LatticeColumns.from_lattice(lattice)
+    # Same lattice object, no snapshot in between
+    lattice.validate_node(node_id, 'validator', 0.5)
+    assert columns.update(lattice) == 1
+    assert_same_rows(columns, lattice)
+
+def test_diverging_lattice_rebuilds():
+    rng = random.Random(7)
+    base = Qi2TrinityBlockchain().lattice
+    grow(base, rng, 50)
+    main, side = base.snapshot(), base.snapshot()
+    grow(main, rng, 10)
+    grow(side, rng, 12)
+    columns = LatticeColumns.from_lattice(main)
+    columns.update(side)
+    assert_same_rows(columns, side)
+
+def test_cached_columns_match_scalar_dividends():
+    rng = random.Random(11)
+    blockchain = Qi2TrinityBlockchain()
+    blockchain.token.initialize_genesis({'genesis': INITIAL_TOKEN_SUPPLY})
+    economics = ConsciousnessEconomics(blockchain)
+    engine = VectorizedDividendEngine(blockchain)
+    now = 1700000000.0 + 3600 * 30
+    grow(blockchain.lattice, rng, 300)
+    for _ in range(3):
+        assert engine.distribute(now) == economics.distribute_consciousness_dividends(now)
+        blockchain.lattice = blockchain.lattice.snapshot()
+        grow(blockchain.lattice, rng, 25)
+    assert economics.distribute_consciousness_dividends(now, vectorized=True) == \
+        economics.distribute_consciousness_dividends(now)